@@ -1,17 +1,32 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Header, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-import asyncio
 import pandas as pd
 from datetime import datetime
+import base64
+import hashlib
+import json
 import os
 from dotenv import load_dotenv
 load_dotenv()
+from llm_utils.clients import client_registry
 from llm_utils.ollama_utils import llama_params_from_dict
-from translator_utils import translate_text, show_multiple_translations
-from word_test_runner import sample_word, filter_word_list_by_description, sample_words_with_optional_sentences_batch
-from file_utils import add_word_pair_to_word_list, add_tag_list_to_word_pair, get_word_list_file_name
-from word_comparisons import check_equality
+from llm_utils.embeddings import embedding_model_from_env
+from translator_utils import translate_many, translate_text, show_multiple_translations_async
+from word_test_runner import sample_word_async, sentence_model_name, filter_word_list_by_description_async, iter_filter_word_list_by_description_async, rank_word_list_by_description_async, sample_words_with_optional_sentences_batch_async
+from file_utils import add_word_pair_to_word_list, add_tag_list_to_word_pair, find_words, get_word_list_file_name, resolve_word_list_file_name
+from word_comparisons import check_equality_async
+from word_list_store import VersionConflictError, word_list_store
+from word_list_index import word_list_index
+from tag_index import get_tag_index
+from sentence_pool import sentence_pool
+from review_scheduler import review_scheduler
+from practice_session import PracticeSession, practice_sessions
+from vector_index import suggest_tags_from_neighbours, vector_indexes
+from create_text_and_voice import create_sentence_from_word_async
 
 # Pydantic models for request bodies
 class CreateWordRequest(BaseModel):
@@ -25,23 +40,77 @@ class CreateWordRequest(BaseModel):
     original_indices: list[int] | None = None
     remark: str | None = None
     cloud_models_only: bool = False
+    sampling_mode: str = "random"      # random | due
 
 
 class CreateWordBatchRequest(CreateWordRequest):
     batch_size: int = 20
 
+class CreateSessionRequest(BaseModel):
+    language_1: str
+    language_2: str
+    probability_for_sentence_creation: float
+    max_num_words_in_created_sentence: int = 10
+    language_level_for_created_sentence: str = "C1"
+    remark: str | None = None
+    cloud_models_only: bool = False
+    tags: list[str] = []
+    tag_filter_mode: str = "include"   # include | exclude
+    tag_match_mode: str = "any"        # any | all
+    description: str = ""
+    use_filter_cache: bool = True      # False asks the model about every word again
+    start_date: str = ""
+    end_date: str = ""
+    prefetch_size: int = 3
+    hide_used_word_for_n_words: int = 4
+    sampling_mode: str = "random"      # random | due
+
+class TranslateBatchRequest(BaseModel):
+    texts: list[str]
+    src_language: str
+    dest_language: str
+
 class WordPair(BaseModel):
     word_language_1: str
     word_language_2: str
     date_added: str | None = None
     tags: str | None = None
 
+class WordListChange(BaseModel):
+    op: str                               # insert | update | delete
+    row_id: int | None = None             # required for update and delete
+    word_language_1: str | None = None
+    word_language_2: str | None = None
+    date_added: str | None = None
+    tags: str | None = None
+
+class PatchWordListRequest(BaseModel):
+    language_1: str
+    language_2: str
+    changes: list[WordListChange]
+    expected_version: str | None = None   # "version" of the /word_list response the changes are based on
+
 class SaveWordListRequest(BaseModel):
     language_1: str
     language_2: str
     words: list[WordPair]
     
-app = FastAPI(docs_url="/swagger")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # replay journals left over from a previous run, then keep compacting them in the background
+    word_list_store.recover("word_lists")
+    word_list_store.start_compaction("word_lists")
+    await client_registry.startup()
+    sentence_pool.start_worker(_generate_pooled_sentence)
+    yield
+    practice_sessions.clear()
+    await sentence_pool.stop_worker()
+    await client_registry.aclose()
+    word_list_store.stop_compaction("word_lists")
+
+
+app = FastAPI(docs_url="/swagger", lifespan=lifespan)
 
 # Add CORS middleware
 app.add_middleware(
@@ -130,14 +199,23 @@ def switch_model(model_id: str):
     return {"status": "success", "model_id": model_id, "display": model_id}
 
 @app.post("/translate")
-def translate(text: str, src_language: str, dest_language: str, speak_translated: bool):
+async def translate(text: str, src_language: str, dest_language: str, speak_translated: bool):
     
-    translated_text = asyncio.run(translate_text(text, src_language, dest_language, speak_translated=speak_translated))
+    translated_text = await translate_text(text, src_language, dest_language, speak_translated=speak_translated)
     return {"translated_text": translated_text}
 
 
+@app.post("/translate_batch")
+async def translate_batch(request: TranslateBatchRequest):
+    """Translate several texts at once. Failed translations are returned as "Translation failed."."""
+    translations = await translate_many(request.texts, request.src_language, request.dest_language)
+    return {
+        "translated_texts": [t if t is not None else "Translation failed." for t in translations]
+    }
+
+
 @app.post("/show_alternatives")
-def show_alternatives(
+async def show_alternatives(
     word: str,
     src_language: str,
     dest_language: str,
@@ -147,7 +225,7 @@ def show_alternatives(
     """Get multiple alternative translations for a word using the LLM."""
     if llama_params is None and not cloud_models_only:
         return {"alternatives": [], "error": "No LLM configured"}
-    alternatives = show_multiple_translations(
+    alternatives = await show_multiple_translations_async(
         word, src_language, dest_language, llama_params,
         google_translation=google_translation,
         cloud_models_only=cloud_models_only,
@@ -155,9 +233,7 @@ def show_alternatives(
     return {"alternatives": alternatives}
 
 
-@app.post("/create_word")
-def create_word(request: CreateWordRequest):
-    
+def _words_from_request(request: CreateWordRequest) -> pd.DataFrame:
     words = pd.DataFrame({
         request.language_1.capitalize(): request.words_language_1, 
         request.language_2.capitalize(): request.words_language_2
@@ -166,18 +242,72 @@ def create_word(request: CreateWordRequest):
     # If caller provided original indices (mapping to the full word list), set them as the DataFrame index
     if request.original_indices is not None and len(request.original_indices) == len(words):
         words.index = request.original_indices
-    word_language_1, word_language_2, word_index, original_word_language_1 = sample_word(
-        words,
-        request.language_1,
-        request.language_2,
-        request.probability_for_sentence_creation,
-        llama_params,
-        request.max_num_words_in_created_sentence,
-        request.language_level_for_created_sentence,
-        remark=request.remark,
-        cloud_models_only=request.cloud_models_only,
+    return words
+
+
+def _want_pooled_sentences(words: pd.DataFrame, request: CreateWordRequest | CreateSessionRequest) -> None:
+    # let the sentence pool prepare sentences for the words of this list while the learner practices
+    if request.probability_for_sentence_creation <= 0 or request.remark:
+        return
+    model = sentence_model_name(llama_params, request.cloud_models_only)
+    if model is None or (request.cloud_models_only and not os.environ.get("GEMINI_API_KEY")):
+        return
+    sentence_pool.want([
+        sentence_pool.make_key(
+            request.language_1,
+            request.language_2,
+            word,
+            request.language_level_for_created_sentence,
+            request.max_num_words_in_created_sentence,
+            model,
+        )
+        for word in words[request.language_1.capitalize()].astype(str)
+        if len(word.split()) < 3
+    ])
+
+
+async def _generate_pooled_sentence(key) -> tuple[str, str] | None:
+    language_1, language_2, word, language_level, max_num_words, model = key
+    # only create sentences with the model the learner asked for; the local model may have been switched since
+    cloud_models_only = model == sentence_model_name(None, True)
+    if cloud_models_only and not os.environ.get("GEMINI_API_KEY"):
+        return None
+    if not cloud_models_only and model != sentence_model_name(llama_params, False):
+        return None
+    return await create_sentence_from_word_async(
+        word,
+        language_1,
+        language_2,
+        llama_params=llama_params,
+        max_num_words=max_num_words,
+        language_level=language_level,
+        cloud_models_only=cloud_models_only,
     )
 
+
+@app.post("/create_word")
+async def create_word(request: CreateWordRequest):
+    
+    words = await run_in_threadpool(_words_from_request, request)
+    await run_in_threadpool(_want_pooled_sentences, words, request)
+    try:
+        word_language_1, word_language_2, word_index, original_word_language_1 = await sample_word_async(
+            words,
+            request.language_1,
+            request.language_2,
+            request.probability_for_sentence_creation,
+            llama_params,
+            request.max_num_words_in_created_sentence,
+            request.language_level_for_created_sentence,
+            remark=request.remark,
+            cloud_models_only=request.cloud_models_only,
+            sentence_pool=sentence_pool,
+            sampling_mode=request.sampling_mode,
+            review_scheduler=review_scheduler,
+        )
+    except ValueError as e:
+        return {"word": None, "error": str(e)}
+
     # Ensure the returned index is a plain Python int for JSON serialization
     if word_index is not None:
         try:
@@ -196,61 +326,156 @@ def create_word(request: CreateWordRequest):
 
 
 @app.post("/create_word_batch")
-def create_word_batch(request: CreateWordBatchRequest):
+async def create_word_batch(request: CreateWordBatchRequest):
     """Sample up to N words and optionally pre-generate sentence pairs in one cloud call."""
-    words = pd.DataFrame({
-        request.language_1.capitalize(): request.words_language_1,
-        request.language_2.capitalize(): request.words_language_2
-    })
+    words = await run_in_threadpool(_words_from_request, request)
+    await run_in_threadpool(_want_pooled_sentences, words, request)
 
-    if request.original_indices is not None and len(request.original_indices) == len(words):
-        words.index = request.original_indices
+    try:
+        batch_words = await sample_words_with_optional_sentences_batch_async(
+            words=words,
+            language_1=request.language_1,
+            language_2=request.language_2,
+            probability_for_sentence_creation=request.probability_for_sentence_creation,
+            llama_params=llama_params,
+            max_num_words_in_created_sentence=request.max_num_words_in_created_sentence,
+            language_level_for_created_sentence=request.language_level_for_created_sentence,
+            remark=request.remark,
+            cloud_models_only=request.cloud_models_only,
+            batch_size=request.batch_size,
+            sentence_pool=sentence_pool,
+            sampling_mode=request.sampling_mode,
+            review_scheduler=review_scheduler,
+        )
+    except ValueError as e:
+        return {"words": [], "error": str(e)}
 
-    batch_words = sample_words_with_optional_sentences_batch(
-        words=words,
-        language_1=request.language_1,
-        language_2=request.language_2,
-        probability_for_sentence_creation=request.probability_for_sentence_creation,
-        llama_params=llama_params,
-        max_num_words_in_created_sentence=request.max_num_words_in_created_sentence,
-        language_level_for_created_sentence=request.language_level_for_created_sentence,
-        remark=request.remark,
-        cloud_models_only=request.cloud_models_only,
-        batch_size=request.batch_size,
+    return {"words": batch_words}
+
+
+def _load_words_for_session(request: CreateSessionRequest) -> pd.DataFrame:
+    word_list_path = resolve_word_list_file_name(request.language_1, request.language_2)
+    return _filter_stored_words(
+        word_list_path,
+        request.tags,
+        request.tag_filter_mode,
+        request.tag_match_mode,
+        request.start_date,
+        request.end_date,
     )
 
-    return {"words": batch_words}
+
+@app.post("/session")
+async def create_session(request: CreateSessionRequest):
+    """Start a practice session over the stored word list of the language pair.
+
+    The word list is filtered once by date, tags and description, and the session keeps the
+    remaining rows on the server, so /session/next only needs the session id. The session
+    prepares the next words in the background.
+    """
+    try:
+        words = await run_in_threadpool(_load_words_for_session, request)
+    except ValueError as e:
+        return {"session_id": None, "num_words": 0, "error": str(e)}
+    if words is None or len(words) == 0:
+        return {"session_id": None, "num_words": 0, "error": "No words match the filters."}
+
+    # Description filter
+    if request.description.strip() and (llama_params is not None or request.cloud_models_only):
+        filtered = await filter_word_list_by_description_async(
+            words,
+            request.language_1,
+            request.description,
+            llama_params,
+            cloud_models_only=request.cloud_models_only,
+            use_cache=request.use_filter_cache,
+        )
+        if filtered is not None and len(filtered) > 0:
+            words = filtered
+
+    await run_in_threadpool(_want_pooled_sentences, words, request)
+    try:
+        session = await run_in_threadpool(
+            PracticeSession,
+            words,
+            request.language_1,
+            request.language_2,
+            request.probability_for_sentence_creation,
+            llama_params=llama_params,
+            max_num_words_in_created_sentence=request.max_num_words_in_created_sentence,
+            language_level_for_created_sentence=request.language_level_for_created_sentence,
+            remark=request.remark,
+            cloud_models_only=request.cloud_models_only,
+            prefetch_size=request.prefetch_size,
+            hide_used_word_for_n_words=request.hide_used_word_for_n_words,
+            sentence_pool=sentence_pool,
+            sampling_mode=request.sampling_mode,
+            review_scheduler=review_scheduler,
+        )
+    except ValueError as e:
+        return {"session_id": None, "num_words": 0, "error": str(e)}
+    session.prefetch()
+    return {"session_id": practice_sessions.add(session), "num_words": len(words)}
+
+
+@app.post("/session/next")
+async def session_next(session_id: str, remove_word_index: int | None = None):
+    """Return the next word of a practice session, usually straight from the prefetched buffer.
+
+    Args:
+        session_id: The id returned by /session
+        remove_word_index: Optional row id of a word to stop practicing (e.g. the last word, if it was translated correctly)
+    """
+    session = practice_sessions.get(session_id)
+    if session is None:
+        return {"word": None, "error": "Unknown or expired session."}
+    if remove_word_index is not None:
+        await session.remove_word(remove_word_index)
+    entry = await session.next()
+    if entry is None:
+        return {"word": None, "error": "No more words available."}
+    return {
+        "word": {
+            "word_language_1": entry["word_language_1"],
+            "word_language_2": entry["word_language_2"],
+            "word_index": entry["index"],
+            "original_word_language_1": entry["original_word_language_1"],
+        }
+    }
+
+
+@app.delete("/session")
+def delete_session(session_id: str):
+    """End a practice session."""
+    return {"status": "success" if practice_sessions.remove(session_id) else "not_found"}
+
+
+@app.get("/sentence_pool/stats")
+def sentence_pool_stats():
+    """Return hit rate and depth of the pool of pre-generated sentences."""
+    return sentence_pool.stats()
 
 
 @app.get("/tags")
 def get_all_tags(language_1: str = None, language_2: str = None):
     """Return all unique tags. If language_1 and language_2 are given, only from that word list."""
-    import os
-    word_lists_dir = "word_lists"
     all_tags = set()
 
     def _extract_tags_from_file(filepath):
         try:
-            df = pd.read_csv(filepath)
-            if "tags" in df.columns:
-                for cell in df["tags"].dropna():
-                    for tag in str(cell).split(";"):
-                        tag = tag.strip()
-                        if tag:
-                            all_tags.add(tag)
+            all_tags.update(get_tag_index(filepath).tags())
         except Exception:
             pass
 
     if language_1 and language_2:
         try:
-            filepath = get_word_list_file_name(language_1, language_2)
+            filepath = resolve_word_list_file_name(language_1, language_2)
             _extract_tags_from_file(filepath)
         except Exception:
             pass
     else:
-        for filename in sorted(os.listdir(word_lists_dir)):
-            if filename.endswith(".csv"):
-                _extract_tags_from_file(os.path.join(word_lists_dir, filename))
+        for filepath in word_list_index.paths():
+            _extract_tags_from_file(filepath)
 
     return {"tags": sorted(all_tags)}
 
@@ -263,17 +488,61 @@ def add_word_pair(
     language_2: str,
     tags: str = ""
 ):
-    """Add a word pair to the word list, optionally with semicolon-separated tags."""
+    """Add a word pair to the word list, optionally with semicolon-separated tags.
+
+    With an embedding model, the response lists existing word pairs whose word in language_1
+    is nearly the same as the new one (possible_duplicates).
+    """
+    possible_duplicates = _find_possible_duplicates(word_language_1, language_1, language_2)
     add_word_pair_to_word_list(word_language_1, word_language_2, language_1, language_2)
     if tags:
         tag_list = [t.strip() for t in tags.split(";") if t.strip()]
         if tag_list:
             add_tag_list_to_word_pair(word_language_1, word_language_2, language_1, language_2, tag_list)
-    return {"status": "success", "message": "Word pair added to list"}
+    return {"status": "success", "message": "Word pair added to list", "possible_duplicates": possible_duplicates}
+
+
+# similarity from which an existing word counts as a possible duplicate of a new one
+DUPLICATE_SIMILARITY = 0.95
+
+
+def _find_possible_duplicates(word: str, language_1: str, language_2: str) -> list[dict]:
+    embedding_model = embedding_model_from_env()
+    if embedding_model is None:
+        return []
+    try:
+        word_list_path = resolve_word_list_file_name(language_1, language_2)
+        similar = vector_indexes.similar_words(word_list_path, language_1.capitalize(), word.strip(), embedding_model, k=5)
+    except Exception as e:
+        print(f"Warning: Looking for duplicates failed: {e}")
+        return []
+    return similar[similar["similarity"] >= DUPLICATE_SIMILARITY].fillna('').to_dict('records')
+
+
+@app.get("/similar_words")
+def similar_words(language_1: str, language_2: str, word: str, language: str | None = None, k: int = 10):
+    """Find the words of a word list that are most similar to a word, using the embedding model.
+
+    Args:
+        language_1, language_2: The language pair of the word list
+        word: The word to search for
+        language: The column to search in (default: language_1)
+        k: The number of words to return
+    Returns the similar word pairs and the tags that are most common among them (suggested_tags).
+    """
+    embedding_model = embedding_model_from_env()
+    if embedding_model is None:
+        return {"similar_words": [], "suggested_tags": [], "error": "No embedding model configured (set EMBEDDING_MODEL)."}
+    try:
+        word_list_path = resolve_word_list_file_name(language_1, language_2)
+        similar = vector_indexes.similar_words(word_list_path, (language or language_1).capitalize(), word.strip(), embedding_model, k=k)
+    except Exception as e:
+        return {"similar_words": [], "suggested_tags": [], "error": str(e)}
+    return {"similar_words": similar.fillna('').to_dict('records'), "suggested_tags": suggest_tags_from_neighbours(similar)}
 
 
 @app.post("/suggest_tags")
-def suggest_tags_endpoint(
+async def suggest_tags_endpoint(
     word_1: str,
     word_2: str,
     language_1: str,
@@ -284,8 +553,8 @@ def suggest_tags_endpoint(
     if llama_params is None and not cloud_models_only:
         return {"tags": [], "error": "No LLM configured"}
     try:
-        from file_utils import suggest_tag_list_for_word_pair_with_llm
-        tags = suggest_tag_list_for_word_pair_with_llm(
+        from file_utils import suggest_tag_list_for_word_pair_with_llm_async
+        tags = await suggest_tag_list_for_word_pair_with_llm_async(
             word_1,
             word_2,
             language_1,
@@ -301,41 +570,166 @@ def suggest_tags_endpoint(
 @app.get("/word_lists")
 def get_available_word_lists():
     """Return all available word list language pairs derived from CSV filenames."""
-    import os
-    word_lists_dir = "word_lists"
-    pairs = []
-    for filename in sorted(os.listdir(word_lists_dir)):
-        if filename.endswith(".csv"):
-            name = filename[:-4]  # strip .csv
-            parts = name.split("_")
-            if len(parts) == 2:
-                pairs.append({
-                    "key": name,
-                    "language_1": parts[0],
-                    "language_2": parts[1],
-                    "label": f"{parts[0].capitalize()} \u2194 {parts[1].capitalize()}"
-                })
-    return {"word_lists": pairs}
+    return {"word_lists": word_list_index.language_pairs()}
+
+
+def _encode_cursor(sort: str | None, words: pd.DataFrame) -> str:
+    # the cursor names the last word of a page by its sort value and row id, so it stays valid while the list changes
+    row_id = int(words.index[-1])
+    value = None
+    if sort:
+        value = _sort_key(words[sort.lstrip("-")]).iloc[-1]
+        value = None if pd.isna(value) else value.item() if hasattr(value, "item") else value
+    cursor = {"sort": sort or "", "after": [value, row_id]}
+    return base64.urlsafe_b64encode(json.dumps(cursor).encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str, sort: str | None) -> tuple:
+    try:
+        decoded = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        value, row_id = decoded["after"]
+        row_id = int(row_id)
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    if decoded.get("sort") != (sort or ""):
+        raise ValueError("The cursor belongs to another sort order.")
+    return value, row_id
+
+
+def _sort_key(values: pd.Series) -> pd.Series:
+    return values.str.lower() if pd.api.types.is_string_dtype(values) else values
+
+
+def _sort_words(words: pd.DataFrame, sort: str) -> pd.DataFrame:
+    """Sort by a column (prefixed with "-" for descending order), ignoring case, then by row id; missing values come last."""
+    descending = sort.startswith("-")
+    column = sort.lstrip("-")
+    if column not in words.columns:
+        raise ValueError(f"Cannot sort by unknown column: {column}")
+    words = words.sort_index(kind="stable")
+    return words.sort_values(column, ascending=not descending, kind="stable", key=_sort_key, na_position="last")
+
+
+def _words_after(words: pd.DataFrame, sort: str | None, after: tuple) -> pd.DataFrame:
+    """Return the words that come after a (sort value, row id) position in the order of `_sort_words`."""
+    value, row_id = after
+    later_row = words.index.to_numpy() > row_id
+    if not sort:
+        return words[later_row]
+    keys = _sort_key(words[sort.lstrip("-")])
+    missing = keys.isna().to_numpy()
+    if value is None:
+        return words[missing & later_row]
+    present = keys[~missing]
+    try:
+        beyond = (present < value) if sort.startswith("-") else (present > value)
+        after_value = beyond.to_numpy(dtype=bool) | ((present == value).to_numpy(dtype=bool) & later_row[~missing])
+    except TypeError as e:
+        raise ValueError(f"Invalid cursor for sorting by {sort}.") from e
+    mask = missing.copy()
+    mask[~missing] = after_value
+    return words[mask]
+
+
+def _project_words(words: pd.DataFrame, fields: str | None) -> pd.DataFrame:
+    if not fields:
+        return words
+    columns = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [column for column in columns if column not in words.columns]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return words[columns]
+
+
+def _stream_word_records(words: pd.DataFrame, chunk_size: int = 5000):
+    for start in range(0, len(words), chunk_size):
+        lines = words.iloc[start:start + chunk_size].fillna('').to_json(orient="records", lines=True, force_ascii=False)
+        yield lines if lines.endswith("\n") else lines + "\n"
 
 
 @app.get("/word_list")
-def get_word_list_endpoint(language_1: str, language_2: str, start_date_added: str = None, end_date_added: str = None):
-    """Get the word list for a given language pair."""
+def get_word_list_endpoint(
+    language_1: str,
+    language_2: str,
+    start_date_added: str = None,
+    end_date_added: str = None,
+    tags: str = None,
+    match_all_tags: bool = False,
+    search: str = None,
+    sort: str = None,
+    fields: str = None,
+    limit: int = None,
+    cursor: str = None,
+    stream: bool = False,
+    row_ids: bool = False,
+    if_none_match: str = Header(None),
+):
+    """Get the word list for a given language pair.
+
+    Args:
+        start_date_added, end_date_added: Optional inclusive bounds of the date the words were added
+        tags: Optional tags separated by ";"; keeps words with any of them (all of them with match_all_tags)
+        search: Optional text that one of the two words must contain (ignoring case)
+        sort: Optional column to sort by, e.g. "German" or "-date_added" for descending order
+        fields: Optional comma-separated columns to return, e.g. "German,English"
+        limit: If given, return at most this many words and a "next_cursor" to pass as cursor for the next page
+            (null on the last page) and the "total" number of matching words. Pages are ordered by the sort
+            column and then by row id (only by row id without sort); the cursor points after the last word of
+            its page, so words added or removed in the meantime do not shift the next page
+        stream: If True, return newline-delimited JSON with one word per line instead (the next cursor is in X-Next-Cursor)
+        row_ids: If True, add the "row_id" of every word, which /patch_word_list takes
+    The response contains the "version" of the list (the X-Word-List-Version header when streaming) and carries
+    an ETag; a request with a matching If-None-Match header gets 304 Not Modified.
+    """
     try:
-        word_list_path = get_word_list_file_name(language_1, language_2)
-        words = pd.read_csv(word_list_path)
-
-        if start_date_added is not None:
-            start_date_added = pd.to_datetime(start_date_added)
-            words = words[pd.to_datetime(words["date_added"]) >= start_date_added]
-        if end_date_added is not None:
-            end_date_added = pd.to_datetime(end_date_added)
-            words = words[pd.to_datetime(words["date_added"]) <= end_date_added]
-
-        # Replace NaN with empty string so JSON serialization produces valid output
-        words = words.fillna('')
-        words = words.to_dict('records')
-        return {"words": words}
+        word_list_path = resolve_word_list_file_name(language_1, language_2)
+        version = word_list_store.version(word_list_path)
+        request_key = json.dumps(
+            [version, start_date_added, end_date_added, tags, match_all_tags, search, sort, fields, limit, cursor, stream, row_ids]
+        )
+        etag = f'W/"{hashlib.sha1(request_key.encode("utf-8")).hexdigest()}"'
+        if if_none_match is not None and etag in [tag.strip() for tag in if_none_match.split(",")]:
+            return Response(status_code=304, headers={"ETag": etag})
+        if limit is not None and limit < 1:
+            raise ValueError("limit must be at least 1.")
+
+        words = find_words(
+            word_list_path,
+            start_date_added=start_date_added,
+            end_date_added=end_date_added,
+            tags=tags.split(";") if tags else None,
+            match_all_tags=match_all_tags,
+            search=search,
+        )
+        if sort:
+            words = _sort_words(words, sort)
+        elif limit is not None:
+            words = words.sort_index(kind="stable")
+
+        total = len(words)
+        next_cursor = None
+        if limit is not None:
+            if cursor:
+                words = _words_after(words, sort, _decode_cursor(cursor, sort))
+            if len(words) > limit:
+                words = words.iloc[:limit]
+                next_cursor = _encode_cursor(sort, words)
+        words = _project_words(words, fields)
+        if row_ids:
+            words = words.rename_axis("row_id").reset_index()
+
+        if stream:
+            headers = {"ETag": etag, "X-Word-List-Version": version}
+            if next_cursor is not None:
+                headers["X-Next-Cursor"] = next_cursor
+            return StreamingResponse(_stream_word_records(words), media_type="application/x-ndjson", headers=headers)
+
+        # Replace NaN with empty string so JSON serialization produces valid output.
+        # The records are serialized by pandas, which is much faster than encoding a list of dicts.
+        body = '{"words": ' + words.fillna('').to_json(orient="records", force_ascii=False) + f', "version": {json.dumps(version)}'
+        if limit is not None:
+            body += f', "next_cursor": {json.dumps(next_cursor)}, "total": {total}'
+        return Response(body + "}", media_type="application/json", headers={"ETag": etag})
     except ValueError as e:
         return {"words": [], "error": str(e)}
 
@@ -359,26 +753,77 @@ def save_word_list_endpoint(request: SaveWordListRequest):
         })
         
         # Save to CSV (overwriting the old file)
-        df.to_csv(word_list_path, index=False)
+        word_list_store.write(word_list_path, df)
         
         return {"status": "success", "message": f"Saved {len(request.words)} word pairs"}
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
 
+@app.post("/patch_word_list")
+def patch_word_list_endpoint(request: PatchWordListRequest):
+    """Insert, update and delete single word pairs by row id instead of saving the entire list.
+
+    Row ids are the "row_id" values of /word_list?row_ids=true; they stay the same while other rows
+    change. If "expected_version" is given and the list was changed since, nothing is applied and the
+    response has "conflict": true and the current version.
+    """
+    try:
+        word_list_path = resolve_word_list_file_name(request.language_1, request.language_2)
+        now_str = datetime.now().strftime('%Y-%m-%d %H:%M')
+        updates, deletes, inserts = {}, [], []
+        for change in request.changes:
+            values = {
+                column: value
+                for column, value in (
+                    (request.language_1.capitalize(), change.word_language_1),
+                    (request.language_2.capitalize(), change.word_language_2),
+                    ("date_added", change.date_added),
+                    ("tags", change.tags),
+                )
+                if value is not None
+            }
+            if change.op == "insert":
+                inserts.append({"date_added": now_str, "tags": "", **values})
+            elif change.op in ("update", "delete") and change.row_id is None:
+                raise ValueError(f"A {change.op} needs a row_id.")
+            elif change.op == "update":
+                updates[change.row_id] = values
+            elif change.op == "delete":
+                deletes.append(change.row_id)
+            else:
+                raise ValueError(f"Unknown change: {change.op}")
+
+        version, inserted_row_ids = word_list_store.patch(word_list_path, updates, deletes, inserts, expected_version=request.expected_version)
+        return {"status": "success", "version": version, "inserted_row_ids": inserted_row_ids}
+    except VersionConflictError as e:
+        return {"status": "error", "conflict": True, "version": e.version, "message": str(e)}
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
+
 @app.post("/check_translation")
-def check_translation(
+async def check_translation(
     user_translation: str,
     correct_translation: str,
     be_stringent: bool = False,
     word_to_pay_attention_to: str | None = None,
     check_model: str | None = None,
     cloud_models_only: bool = False,
+    word_index: int | None = None,
+    session_id: str | None = None,
+    language_1: str | None = None,
+    language_2: str | None = None,
 ):
     """Check if a user's translation is correct.
     
     If check_model is provided, a temporary Llama_params is built for that
     specific ollama model instead of using the global llama_params.
+
+    If word_index is given, the outcome is stored in the review history: for the word of the
+    practice session session_id, or else for the row of the stored word list of language_1
+    and language_2. The answer is expected in language_2 (or the second language of the
+    session), which decides the articles that may be left out.
     """
     params_to_use = llama_params
     if check_model and not cloud_models_only:
@@ -387,82 +832,141 @@ def check_translation(
             "model_id": check_model,
             "url": "http://127.0.0.1:11434/v1/models"
         })
-    is_correct = check_equality(
+    session = practice_sessions.get(session_id) if session_id else None
+    is_correct = await check_equality_async(
         user_translation,
         correct_translation,
         llama_params=params_to_use,
         be_stringent=be_stringent,
         word_to_pay_attention_to=word_to_pay_attention_to,
         cloud_models_only=cloud_models_only,
+        language=session.language_2 if session is not None else language_2,
     )
+    if word_index is not None:
+        if session is not None:
+            await run_in_threadpool(session.record_answer, word_index, is_correct)
+        elif language_1 and language_2:
+            await run_in_threadpool(_record_stored_answer, language_1, language_2, word_index, is_correct)
     return {"is_correct": is_correct}
 
 
+def _record_stored_answer(language_1: str, language_2: str, word_index: int, is_correct: bool) -> None:
+    try:
+        words = word_list_store.read(resolve_word_list_file_name(language_1, language_2))
+    except ValueError:
+        return
+    if word_index not in words.index:
+        return
+    row = words.loc[word_index]
+    review_scheduler.record(language_1, language_2, row[language_1.capitalize()], row[language_2.capitalize()], is_correct)
+
+
+@app.get("/review_stats")
+def review_stats(language_1: str, language_2: str):
+    """Return the number of reviewed words of a language pair and how many of them are due."""
+    return review_scheduler.stats(language_1, language_2)
+
+
+def _load_words_for_filtering(language: str, language_pair: str | None) -> pd.DataFrame | None:
+    # If language_pair is provided, use that specific word list
+    if language_pair:
+        parts = language_pair.split('_')
+        if len(parts) == 2:
+            word_list_path = resolve_word_list_file_name(parts[0], parts[1])
+            return word_list_store.read(word_list_path)
+
+    # Otherwise (or if language_pair is malformed) combine all word lists containing the language
+    all_words = []
+    
+    for filepath in word_list_index.paths():
+        if language in os.path.basename(filepath):
+            words_df_temp = word_list_store.read(filepath)
+            all_words.append(words_df_temp)
+    
+    if not all_words:
+        return None
+    
+    return pd.concat(all_words, ignore_index=True).drop_duplicates()
+
+
 @app.post("/filter_words")
-def filter_words(language: str, description: str, language_pair: str = None, cloud_models_only: bool = False):
+async def filter_words(language: str, description: str, language_pair: str = None, cloud_models_only: bool = False, stream: bool = False, use_cache: bool = True):
     """Filter words based on a description using LLM.
     
     Args:
         language: The language to filter (e.g., 'german', 'english')
         description: The description to filter by (e.g., 'verbs only')
         language_pair: Optional language pair in format 'german_english' to use specific word list
+        stream: If True, return newline-delimited JSON with one {"filtered_words": [...]} line per
+            answered chunk of the word list, so the first matches arrive before the whole list is filtered
+        use_cache: If False, ignore the cached verdicts of earlier filters and ask the model about every word
     """
     if llama_params is None and not cloud_models_only:
         return {"filtered_words": [], "error": "No LLM configured"}
     try:
-        # If language_pair is provided, use that specific word list
-        if language_pair:
-            parts = language_pair.split('_')
-            if len(parts) == 2:
-                word_list_path = get_word_list_file_name(parts[0], parts[1])
-                words_df = pd.read_csv(word_list_path)
-            else:
-                # Fall back to finding all word lists containing the language
-                import os
-                word_lists_dir = "word_lists"
-                all_words = []
-                
-                for filename in os.listdir(word_lists_dir):
-                    if filename.endswith(".csv") and language in filename:
-                        filepath = os.path.join(word_lists_dir, filename)
-                        words_df_temp = pd.read_csv(filepath)
-                        all_words.append(words_df_temp)
-                
-                if not all_words:
-                    return {"filtered_words": []}
-                
-                words_df = pd.concat(all_words, ignore_index=True).drop_duplicates()
-        else:
-            # Find all CSV files containing the language
-            import os
-            word_lists_dir = "word_lists"
-            all_words = []
-            
-            for filename in os.listdir(word_lists_dir):
-                if filename.endswith(".csv") and language in filename:
-                    filepath = os.path.join(word_lists_dir, filename)
-                    words_df_temp = pd.read_csv(filepath)
-                    all_words.append(words_df_temp)
-            
-            if not all_words:
-                return {"filtered_words": []}
-            
-            words_df = pd.concat(all_words, ignore_index=True).drop_duplicates()
-        
+        words_df = await run_in_threadpool(_load_words_for_filtering, language, language_pair)
+        if words_df is None:
+            return {"filtered_words": []}
+
+        if stream:
+            return StreamingResponse(
+                _stream_filtered_words(words_df, language, description, cloud_models_only, use_cache),
+                media_type="application/x-ndjson",
+            )
+
         # Filter using the description
-        filtered_df = filter_word_list_by_description(
+        filtered_df = await filter_word_list_by_description_async(
             words_df,
             language,
             description,
             llama_params,
             cloud_models_only=cloud_models_only,
+            use_cache=use_cache,
         )
         
-        return {"filtered_words": filtered_df.to_dict('records')}
+        return {"filtered_words": filtered_df.fillna('').to_dict('records')}
     except Exception as e:
         return {"filtered_words": [], "error": str(e)}
 
 
+async def _stream_filtered_words(words_df: pd.DataFrame, language: str, description: str, cloud_models_only: bool, use_cache: bool):
+    try:
+        async for matched_df in iter_filter_word_list_by_description_async(
+            words_df,
+            language,
+            description,
+            llama_params,
+            cloud_models_only=cloud_models_only,
+            use_cache=use_cache,
+        ):
+            yield json.dumps({"filtered_words": matched_df.fillna('').to_dict('records')}, ensure_ascii=False) + "\n"
+    except Exception as e:
+        yield json.dumps({"filtered_words": [], "error": str(e)}, ensure_ascii=False) + "\n"
+
+
+@app.post("/rank_words")
+async def rank_words(language: str, description: str, language_pair: str = None, top_k: int = 50):
+    """Rank words by the similarity of their embedding to a description, without a generative model.
+
+    Args:
+        language: The language of the words to rank (e.g., 'german', 'english')
+        description: The description to rank by (e.g., 'kitchen tools')
+        language_pair: Optional language pair in format 'german_english' to use specific word list
+        top_k: The number of words to return
+    """
+    embedding_model = embedding_model_from_env()
+    if embedding_model is None:
+        return {"ranked_words": [], "error": "No embedding model configured (set EMBEDDING_MODEL)."}
+    try:
+        words_df = await run_in_threadpool(_load_words_for_filtering, language, language_pair)
+        if words_df is None:
+            return {"ranked_words": []}
+        ranked_df = await rank_word_list_by_description_async(words_df, language, description, embedding_model, top_k=top_k)
+        return {"ranked_words": ranked_df.fillna('').to_dict('records')}
+    except Exception as e:
+        return {"ranked_words": [], "error": str(e)}
+
+
 # ── Text Evaluation ─────────────────────────────────────────────────────────
 
 class EvaluateTextRequest(BaseModel):
@@ -481,6 +985,7 @@ class SampleWordsRequest(BaseModel):
     tag_filter_mode: str = "include"   # include | exclude
     tag_match_mode: str = "any"        # any | all
     description: str = ""
+    use_filter_cache: bool = True
     start_date: str = ""
     end_date: str = ""
     cloud_models_only: bool = False
@@ -492,70 +997,108 @@ def get_primary_language():
     return {"primary_language": os.getenv("PRIMARY_LANGUAGE", "german")}
 
 
+def _filter_stored_words(
+    word_list_path: str,
+    tags: list[str],
+    tag_filter_mode: str,
+    tag_match_mode: str,
+    start_date: str,
+    end_date: str,
+) -> pd.DataFrame:
+    """Load a word list and apply date and tag filters. The index of the result are the row ids of the stored list."""
+    from word_test_runner import filter_word_list_by_tags
+    words_df = word_list_store.read(word_list_path).fillna('')
+
+    # Date filter
+    if start_date or end_date:
+        dates_added = word_list_store.dates_added(word_list_path).reindex(words_df.index)
+        if start_date:
+            words_df = words_df[dates_added >= pd.to_datetime(start_date)]
+        if end_date:
+            words_df = words_df[dates_added.reindex(words_df.index) <= pd.to_datetime(end_date)]
+
+    # Tag filter
+    if tags:
+        exclude = tag_filter_mode == "exclude"
+        intersection = tag_match_mode == "all"
+        words_df = filter_word_list_by_tags(
+            words_df,
+            tags,
+            exclude_words_with_tag=exclude,
+            intersection=intersection,
+            tag_index=get_tag_index(word_list_path),
+        )
+    return words_df
+
+
+def _load_words_for_writing(request: SampleWordsRequest) -> pd.DataFrame | None:
+    """Load the word list and apply the date and tag filters of the request."""
+    word_list_path = resolve_word_list_file_name(request.primary_language, request.language)
+    return _filter_stored_words(
+        word_list_path,
+        request.tags,
+        request.tag_filter_mode,
+        request.tag_match_mode,
+        request.start_date,
+        request.end_date,
+    )
+
+
+def _sample_words_for_writing(words_df: pd.DataFrame, request: SampleWordsRequest) -> dict:
+    lang_col = request.language.capitalize()
+    primary_col = request.primary_language.capitalize()
+
+    if lang_col not in words_df.columns:
+        return {"words": [], "translations": [], "error": f"Column '{lang_col}' not found in word list."}
+
+    # Keep rows where the practice-language word is non-empty, deduplicate
+    valid_mask = words_df[lang_col].notna() & (words_df[lang_col].astype(str).str.strip() != '')
+    words_df = words_df[valid_mask].drop_duplicates(subset=[lang_col])
+
+    if words_df.empty:
+        return {"words": [], "translations": [], "error": "No words available after filtering."}
+
+    n = min(request.no_words, len(words_df))
+    sampled_df = words_df.sample(n)
+
+    translations = []
+    if primary_col in sampled_df.columns:
+        translations = sampled_df[primary_col].fillna('').astype(str).tolist()
+
+    return {"words": sampled_df[lang_col].tolist(), "translations": translations}
+
+
 @app.post("/sample_words_for_writing")
-def sample_words_for_writing(request: SampleWordsRequest):
+async def sample_words_for_writing(request: SampleWordsRequest):
     """Sample N words from a word list for a writing exercise, with optional tag / date filtering."""
-    from word_test_runner import filter_word_list_by_tags
     try:
-        word_list_path = get_word_list_file_name(request.primary_language, request.language)
-        words_df = pd.read_csv(word_list_path).fillna('')
-
-        # Date filter
-        if request.start_date:
-            words_df = words_df[pd.to_datetime(words_df["date_added"], errors='coerce') >= pd.to_datetime(request.start_date)]
-        if request.end_date:
-            words_df = words_df[pd.to_datetime(words_df["date_added"], errors='coerce') <= pd.to_datetime(request.end_date)]
-
-        # Tag filter
-        if request.tags:
-            exclude = request.tag_filter_mode == "exclude"
-            intersection = request.tag_match_mode == "all"
-            words_df = filter_word_list_by_tags(words_df, request.tags, exclude_words_with_tag=exclude, intersection=intersection)
-            if words_df is None or len(words_df) == 0:
-                return {"words": [], "error": "No words match the tag filter."}
+        words_df = await run_in_threadpool(_load_words_for_writing, request)
+        if request.tags and (words_df is None or len(words_df) == 0):
+            return {"words": [], "error": "No words match the tag filter."}
 
         # Description filter
         if request.description.strip() and (llama_params is not None or request.cloud_models_only):
-            filtered = filter_word_list_by_description(
+            filtered = await filter_word_list_by_description_async(
                 words_df,
                 request.language,
                 request.description,
                 llama_params,
                 cloud_models_only=request.cloud_models_only,
+                use_cache=request.use_filter_cache,
             )
             if filtered is not None and len(filtered) > 0:
                 words_df = filtered
 
-        lang_col = request.language.capitalize()
-        primary_col = request.primary_language.capitalize()
-
-        if lang_col not in words_df.columns:
-            return {"words": [], "translations": [], "error": f"Column '{lang_col}' not found in word list."}
-
-        # Keep rows where the practice-language word is non-empty, deduplicate
-        valid_mask = words_df[lang_col].notna() & (words_df[lang_col].astype(str).str.strip() != '')
-        words_df = words_df[valid_mask].drop_duplicates(subset=[lang_col])
-
-        if words_df.empty:
-            return {"words": [], "translations": [], "error": "No words available after filtering."}
-
-        n = min(request.no_words, len(words_df))
-        sampled_df = words_df.sample(n)
-
-        translations = []
-        if primary_col in sampled_df.columns:
-            translations = sampled_df[primary_col].fillna('').astype(str).tolist()
-
-        return {"words": sampled_df[lang_col].tolist(), "translations": translations}
+        return await run_in_threadpool(_sample_words_for_writing, words_df, request)
     except Exception as e:
         return {"words": [], "error": str(e)}
 
 
 @app.post("/evaluate_text")
-def evaluate_text(request: EvaluateTextRequest):
+async def evaluate_text(request: EvaluateTextRequest):
     """Evaluate a user-written text using Gemini or the local LLM and return feedback."""
-    from llm_utils.llm_api_utils import respond_with_gemini
-    from llm_utils.ollama_utils import respond_to_prompt
+    from llm_utils.llm_api_utils import respond_with_gemini_async
+    from llm_utils.ollama_utils import respond_to_prompt_async
     try:
         words_str = ", ".join(f'"{w}"' for w in request.words)
         level_hint = {
@@ -576,15 +1119,15 @@ def evaluate_text(request: EvaluateTextRequest):
         if request.use_local and not request.cloud_models_only:
             if llama_params is None:
                 # Fall back to Gemini and inform the client
-                feedback = respond_with_gemini(prompt)
+                feedback = await respond_with_gemini_async(prompt)
                 return {
                     "feedback": feedback.strip(),
                     "warning": "No local LLM initialized — used Gemini instead."
                 }
-            feedback = respond_to_prompt(prompt, llama_params)
+            feedback = await respond_to_prompt_async(prompt, llama_params)
             return {"feedback": feedback.strip()}
         else:
-            feedback = respond_with_gemini(prompt)
+            feedback = await respond_with_gemini_async(prompt)
             return {"feedback": feedback.strip()}
     except Exception as e:
         return {"feedback": "", "error": str(e)}
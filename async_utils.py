@@ -0,0 +1,44 @@
+import asyncio
+import threading
+from typing import Awaitable, TypeVar
+
+T = TypeVar("T")
+
+_loop: asyncio.AbstractEventLoop | None = None
+_loop_lock = threading.Lock()
+
+
+def get_shared_event_loop() -> asyncio.AbstractEventLoop:
+    """Get the event loop that runs coroutines for synchronous callers, starting it on first use."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="shared-event-loop", daemon=True).start()
+            _loop = loop
+        return _loop
+
+
+def run_sync(awaitable: Awaitable[T]) -> T:
+    """
+    Run a coroutine from synchronous code and wait for its result.
+
+    All synchronous callers (the CLI scripts and the sync wrappers around the async LLM helpers)
+    share one background event loop, instead of creating a new loop per call with `asyncio.run`.
+
+    Parameters:
+    - awaitable: The coroutine to run.
+
+    Returns:
+    - The result of the coroutine.
+
+    Raises:
+    - RuntimeError: If called from a running event loop; use `await` there instead.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run_coroutine_threadsafe(awaitable, get_shared_event_loop()).result()
+    if asyncio.iscoroutine(awaitable):
+        awaitable.close()
+    raise RuntimeError("run_sync() cannot be called from a running event loop, await the coroutine instead.")
@@ -0,0 +1,106 @@
+import glob
+import os
+import random
+import time
+import unicodedata
+from collections import defaultdict
+import click
+import pandas as pd
+from word_comparisons import ARTICLES, MAX_WORDS_PER_ALTERNATIVE, match_answer_locally
+
+
+def _old_normalize(word: str) -> str:
+    # normalization of check_equality before the local matcher
+    return word.strip().lower().replace("!", "").replace(".", "").replace(",", "").replace("?", "").replace("¿", "").replace("í", "i").replace("á", "a").replace("é", "e").replace("ó", "o").replace("ú", "u")
+
+
+def _old_decides(answer: str, correct: str) -> bool:
+    return _old_normalize(answer) == _old_normalize(correct) or len(_old_normalize(answer)) < 2
+
+
+def _strip_accents(text: str) -> str:
+    return "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c))
+
+
+def _typo(text: str, rng: random.Random) -> str | None:
+    letters = [i for i in range(len(text) - 1) if text[i].isalpha() and text[i + 1].isalpha()]
+    if len(text) < 5 or not letters:
+        return None
+    i = rng.choice(letters)
+    if rng.random() < 0.5:
+        return text[:i] + text[i + 1] + text[i] + text[i + 2:]
+    return text[:i] + text[i + 1:]
+
+
+def _answers(correct: str, language: str, other_answers: list[str], rng: random.Random) -> list[tuple[str, str, bool]]:
+    """Return (kind, answer, is_correct) variants a learner might type for the correct answer."""
+    answers = [("exact", correct, True), ("case and punctuation", correct.upper() + "!", True)]
+    if _strip_accents(correct) != correct:
+        answers.append(("accents left out", _strip_accents(correct), True))
+    tokens = correct.split()
+    if len(tokens) > 1 and tokens[0].lower() in ARTICLES.get(language, set()):
+        answers.append(("article left out", " ".join(tokens[1:]), True))
+    parts = [part.strip() for part in correct.replace(";", ",").split(",") if part.strip()]
+    if len(parts) > 1 and all(len(part.split()) <= MAX_WORDS_PER_ALTERNATIVE for part in parts):
+        answers.append(("one alternative", rng.choice(parts), True))
+    typo = _typo(correct, rng)
+    if typo is not None:
+        answers.append(("typo", typo, True))
+    wrong = rng.choice(other_answers)
+    if wrong != correct:
+        answers.append(("wrong word", wrong, False))
+    return answers
+
+
+@click.command()
+@click.option("--word_lists", default="word_lists", help="Folder with the word lists.")
+@click.option("--seed", default=0, help="Seed for the generated answers.")
+def bench_answer_matcher(word_lists: str, seed: int):
+    """Report which share of typical answers to the stored word lists is decided without a model.
+
+    For every word pair, the answers a learner might type are generated in both directions:
+    exact, with other case and punctuation, without accents, without the leading article,
+    one of several listed alternatives, with one typo, and a wrong word of the same list.
+    The old check only decided exact matches (after its normalization) without the model.
+    """
+    rng = random.Random(seed)
+    decided_old = defaultdict(int)
+    decided_new = defaultdict(int)
+    totals = defaultdict(int)
+    false_accepts = 0
+    duration = 0.0
+    for path in sorted(glob.glob(os.path.join(word_lists, "*.csv"))):
+        words = pd.read_csv(path)
+        if len(words) < 2:
+            continue
+        for language_column in words.columns[:2]:
+            language = language_column.lower()
+            column = words[language_column].dropna().astype(str).tolist()
+            for correct in column:
+                for kind, answer, is_correct in _answers(correct, language, column, rng):
+                    totals[kind] += 1
+                    decided_old[kind] += _old_decides(answer, correct)
+                    start = time.perf_counter()
+                    decision = match_answer_locally(answer, correct, language=language)
+                    duration += time.perf_counter() - start
+                    decided_new[kind] += decision is not None
+                    false_accepts += decision is True and not is_correct
+
+    num_answers = sum(totals.values())
+    if num_answers == 0:
+        print(f"No word lists with at least two words found in {word_lists}.")
+        return
+    print(f"{'answer kind':<22} {'n':>6} {'old':>7} {'new':>7}   (share decided without a model)")
+    for kind in totals:
+        print(f"{kind:<22} {totals[kind]:>6} {decided_old[kind] / totals[kind]:>7.0%} {decided_new[kind] / totals[kind]:>7.0%}")
+    print(
+        f"{'all':<22} {num_answers:>6} {sum(decided_old.values()) / num_answers:>7.0%} "
+        f"{sum(decided_new.values()) / num_answers:>7.0%}"
+    )
+    print(f"wrong words accepted without a model: {false_accepts} of {totals['wrong word']}")
+    print(f"local matcher: {duration / num_answers * 1e6:.1f} µs per answer")
+
+# example: PYTHONPATH=. python benchmarks/bench_answer_matcher.py
+
+if __name__ == "__main__":
+    bench_answer_matcher()
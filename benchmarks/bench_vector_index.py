@@ -0,0 +1,67 @@
+import tempfile
+import time
+import click
+import numpy as np
+from vector_index import VectorIndex
+
+
+def _clustered_vectors(n: int, dimensions: int, rng: np.random.Generator) -> np.ndarray:
+    # real embeddings of a word list form many loose clusters (topics, word families)
+    num_clusters = max(n // 50, 1)
+    centers = rng.normal(size=(num_clusters, dimensions)).astype(np.float32)
+    vectors = centers[rng.integers(num_clusters, size=n)] + 0.5 * rng.normal(size=(n, dimensions)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def _bench_size(n: int, dimensions: int, num_queries: int, k: int, rng: np.random.Generator) -> None:
+    vectors = _clustered_vectors(n, dimensions, rng)
+    # queries are close to indexed words, like a new word looked up against its list
+    queries = vectors[rng.choice(n, num_queries, replace=False)] + 0.1 * rng.normal(size=(num_queries, dimensions)).astype(np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        index = VectorIndex.build(directory, "benchmark", [str(i) for i in range(n)], vectors)
+        build_seconds = time.perf_counter() - start
+
+        exact_results = []
+        latencies = []
+        for query in queries:
+            start = time.perf_counter()
+            exact_results.append(set(np.argpartition(-(index._vectors @ query), k - 1)[:k]))
+            latencies.append(time.perf_counter() - start)
+        print(f"n={n:<7} lists={index.num_lists:<4} build {build_seconds:6.2f} s")
+        print(f"  {'brute force':<18} p50 {np.percentile(latencies, 50) * 1000:7.2f} ms  recall@{k} 1.000")
+
+        default_probe = max(8, index.num_lists // 10)
+        for num_probe in sorted({max(default_probe // 2, 1), default_probe, default_probe * 2}):
+            latencies = []
+            hits = 0
+            for query, exact in zip(queries, exact_results):
+                start = time.perf_counter()
+                found = index.search(query, k=k, num_probe=num_probe)
+                latencies.append(time.perf_counter() - start)
+                hits += len(exact & {p for p, _ in found})
+            label = f"ivf probe={num_probe}" + (" *" if num_probe == default_probe else "")
+            print(f"  {label:<18} p50 {np.percentile(latencies, 50) * 1000:7.2f} ms  recall@{k} {hits / (k * len(queries)):.3f}")
+
+
+@click.command()
+@click.option("--sizes", default="10000,100000", help="Comma-separated numbers of indexed words.")
+@click.option("--dimensions", default=256, help="Dimensions of the vectors.")
+@click.option("--num_queries", default=200, help="Queries per size.")
+@click.option("--k", default=10, help="Neighbours per query.")
+def bench_vector_index(sizes: str, dimensions: int, num_queries: int, k: int):
+    """Compare recall and latency of the IVF index with brute-force search.
+
+    The vectors are synthetic and clustered like word embeddings. The default number of probed
+    lists is marked with *.
+    """
+    rng = np.random.default_rng(0)
+    for n in (int(size) for size in sizes.split(",")):
+        _bench_size(n, dimensions, num_queries, k, rng)
+
+# example: PYTHONPATH=. python benchmarks/bench_vector_index.py --sizes 10000,100000
+
+if __name__ == "__main__":
+    bench_vector_index()
@@ -0,0 +1,75 @@
+import os
+import tempfile
+import time
+import click
+import numpy as np
+import pandas as pd
+from word_list_sidecar import get_sidecar_path, parse_dates_added, read_word_list_file
+
+
+def _make_word_list(path: str, n: int, rng: np.random.Generator) -> None:
+    syllables = np.array(["ka", "ne", "ro", "li", "stu", "ver", "ha", "gen", "mo", "tes", "ur", "bi"])
+    tags = np.array(["", "", "", "Nomen", "Verb", "Adjektiv", "Nomen;Essen", "Verb;Alltag", "Grundbegriff"])
+
+    def words(num_syllables: int) -> list[str]:
+        parts = syllables[rng.integers(len(syllables), size=(n, num_syllables))]
+        return ["".join(row) for row in parts]
+
+    minutes = rng.integers(0, 3 * 365 * 24 * 60, size=n)
+    dates = (pd.Timestamp("2024-01-01") + pd.to_timedelta(np.sort(minutes), unit="min")).strftime("%Y-%m-%d %H:%M")
+    pd.DataFrame({
+        "German": words(3),
+        "English": words(2),
+        "date_added": dates,
+        "tags": tags[rng.integers(len(tags), size=n)],
+    }).to_csv(path, index=False)
+
+
+def _best_of(repeats: int, function) -> float:
+    durations = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return min(durations)
+
+
+def _csv_load(path: str) -> None:
+    # what every request did before: parse the CSV, then parse the dates for the date filter
+    words = pd.read_csv(path)
+    parse_dates_added(words)
+
+
+@click.command()
+@click.option("--sizes", default="1000,100000,1000000", help="Comma-separated numbers of rows.")
+@click.option("--repeats", default=3, help="Runs per measurement, the fastest counts.")
+def bench_word_list_load(sizes: str, repeats: int):
+    """Compare loading a word list and its parsed dates from CSV and from the Arrow sidecar.
+
+    "cold" is the first load, which parses the CSV and writes the sidecar. "warm" loads the
+    up-to-date sidecar.
+    """
+    rng = np.random.default_rng(0)
+    print(f"{'rows':>9} {'csv MB':>7} {'arrow MB':>8} {'csv + dates':>12} {'cold':>9} {'warm':>9} {'speedup':>8}")
+    for n in (int(size) for size in sizes.split(",")):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "german_english.csv")
+            _make_word_list(path, n, rng)
+            csv_seconds = _best_of(repeats, lambda: _csv_load(path))
+
+            def cold():
+                if os.path.exists(get_sidecar_path(path)):
+                    os.remove(get_sidecar_path(path))
+                read_word_list_file(path)
+
+            cold_seconds = _best_of(repeats, cold)
+            warm_seconds = _best_of(repeats, lambda: read_word_list_file(path))
+            print(
+                f"{n:>9} {os.path.getsize(path) / 1e6:>7.1f} {os.path.getsize(get_sidecar_path(path)) / 1e6:>8.1f} "
+                f"{csv_seconds * 1000:>9.1f} ms {cold_seconds * 1000:>6.1f} ms {warm_seconds * 1000:>6.1f} ms {csv_seconds / warm_seconds:>7.1f}x"
+            )
+
+# example: PYTHONPATH=. python benchmarks/bench_word_list_load.py
+
+if __name__ == "__main__":
+    bench_word_list_load()
@@ -0,0 +1,52 @@
+import time
+import click
+import numpy as np
+import pandas as pd
+from word_pair_index import WordPairIndex
+
+
+def _old_exists(words: pd.DataFrame, word_1: str, word_2: str) -> bool:
+    # the check of add_word_pair_to_word_list before the index: a copy of the list and two column scans
+    words = words.copy()
+    return bool((words[words.columns[0]] == word_1).any() and (words[words.columns[1]] == word_2).any())
+
+
+def _per_call(function, queries: list[tuple[str, str]]) -> float:
+    start = time.perf_counter()
+    for word_1, word_2 in queries:
+        function(word_1, word_2)
+    return (time.perf_counter() - start) / len(queries)
+
+
+@click.command()
+@click.option("--sizes", default="1000,100000,1000000", help="Comma-separated numbers of rows.")
+@click.option("--num_queries", default=200, help="Lookups per size.")
+def bench_word_pair_index(sizes: str, num_queries: int):
+    """Compare the duplicate check of a new word pair with and without the word pair index.
+
+    Half of the queried pairs are in the list; the other half combine the words of two
+    different rows, which the old check wrongly reported as duplicates.
+    """
+    rng = np.random.default_rng(0)
+    print(f"{'rows':>9} {'build':>9} {'old check':>11} {'index':>9} {'speedup':>8} {'old false duplicates':>21}")
+    for n in (int(size) for size in sizes.split(",")):
+        words = pd.DataFrame({"German": [f"Wort {i}" for i in range(n)], "English": [f"word {i}" for i in range(n)]})
+        rows = rng.integers(n, size=(num_queries, 2))
+        queries = [(f"Wort {a}", f"word {a}") for a, _ in rows[: num_queries // 2]]
+        queries += [(f"Wort {a}", f"word {(a + 1 + b) % n}") for a, b in rows[num_queries // 2:] if n > 1]
+
+        start = time.perf_counter()
+        index = WordPairIndex(words)
+        build_seconds = time.perf_counter() - start
+        old_seconds = _per_call(lambda word_1, word_2: _old_exists(words, word_1, word_2), queries)
+        index_seconds = _per_call(index.get, queries)
+        false_duplicates = sum(_old_exists(words, *query) and not index.get(*query) for query in queries)
+        print(
+            f"{n:>9} {build_seconds * 1000:>6.1f} ms {old_seconds * 1e6:>8.0f} µs {index_seconds * 1e6:>6.1f} µs "
+            f"{old_seconds / index_seconds:>7.0f}x {false_duplicates:>21}"
+        )
+
+# example: PYTHONPATH=. python benchmarks/bench_word_pair_index.py
+
+if __name__ == "__main__":
+    bench_word_pair_index()
@@ -0,0 +1,74 @@
+import asyncio
+import time
+import click
+import httpx
+import numpy as np
+
+
+async def _run_client(client: httpx.AsyncClient, method: str, path: str, params: dict, num_requests: int, latencies: list[float], errors: list[str]) -> None:
+    for _ in range(num_requests):
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, path, params=params)
+            response.raise_for_status()
+        except Exception as e:
+            errors.append(str(e))
+            continue
+        latencies.append(time.perf_counter() - start)
+
+
+def _summary(name: str, latencies: list[float], errors: list[str]) -> str:
+    if not latencies:
+        return f"{name:<22} no successful requests ({len(errors)} errors)"
+    latencies_ms = np.array(latencies) * 1000
+    return (
+        f"{name:<22} n={len(latencies_ms):<5} errors={len(errors):<4} "
+        f"p50={np.percentile(latencies_ms, 50):8.1f} ms  p99={np.percentile(latencies_ms, 99):8.1f} ms"
+    )
+
+
+async def _load_test(base_url: str, slow_clients: int, fast_clients: int, requests_per_client: int, cloud_models_only: bool) -> None:
+    # Every slow request needs an LLM round trip: the answers differ, so check_equality asks the model.
+    # A unique answer per request avoids hitting the response cache.
+    slow_latencies, slow_errors = [], []
+    fast_latencies, fast_errors = [], []
+    limits = httpx.Limits(max_connections=slow_clients + fast_clients)
+    async with httpx.AsyncClient(base_url=base_url, timeout=300, limits=limits) as client:
+        tasks = []
+        for i in range(slow_clients):
+            params = {
+                "user_translation": f"the automobile number {i} {time.time_ns()}",
+                "correct_translation": "the car",
+                "cloud_models_only": cloud_models_only,
+            }
+            tasks.append(_run_client(client, "POST", "/check_translation", params, requests_per_client, slow_latencies, slow_errors))
+        for _ in range(fast_clients):
+            tasks.append(_run_client(client, "GET", "/llm_info", {}, requests_per_client * 5, fast_latencies, fast_errors))
+        start = time.perf_counter()
+        await asyncio.gather(*tasks)
+        duration = time.perf_counter() - start
+
+    print(f"{slow_clients} LLM clients, {fast_clients} light clients, {duration:.1f} s total")
+    print(_summary("POST /check_translation", slow_latencies, slow_errors))
+    print(_summary("GET /llm_info", fast_latencies, fast_errors))
+
+
+@click.command()
+@click.option("--base_url", default="http://127.0.0.1:8000", help="URL of the running API.")
+@click.option("--slow_clients", default=60, help="Concurrent clients sending LLM-backed requests.")
+@click.option("--fast_clients", default=5, help="Concurrent clients sending cheap requests.")
+@click.option("--requests_per_client", default=3, help="Requests sent by each LLM client.")
+@click.option("--cloud_models_only", is_flag=True, help="Use Gemini instead of the local model.")
+def load_test_api(base_url: str, slow_clients: int, fast_clients: int, requests_per_client: int, cloud_models_only: bool):
+    """Measure p50/p99 latency of LLM-backed and cheap endpoints under concurrent load.
+
+    Run it once against a server started from the commit before the async endpoints and once
+    against the current one to compare. With sync endpoints, the LLM requests occupy the whole
+    threadpool (40 threads by default) and the cheap requests queue behind them.
+    """
+    asyncio.run(_load_test(base_url, slow_clients, fast_clients, requests_per_client, cloud_models_only))
+
+# example: uvicorn api.main:app --port 8000 & python benchmarks/load_test_api.py --slow_clients 60
+
+if __name__ == "__main__":
+    load_test_api()
@@ -1,8 +1,8 @@
-import asyncio
 import pyttsx3
-from llm_utils.ollama_utils import respond_to_prompt, Llama_params
-from llm_utils.llm_api_utils import respond_with_gemini_fast
-from translator_utils import translate_text
+from llm_utils.ollama_utils import respond_to_prompt, respond_to_prompt_async, Llama_params
+from llm_utils.llm_api_utils import respond_with_gemini_fast_async
+from translator_utils import translate_many, translate_text
+from async_utils import run_sync
 
 def create_sentence_from_word(
     word: str,
@@ -15,7 +15,31 @@ def create_sentence_from_word(
     remark: str | None = None,
     cloud_models_only: bool = False
 ) -> tuple[str, str]:
-    
+    return run_sync(create_sentence_from_word_async(
+        word,
+        language_1,
+        language_2,
+        llama_params,
+        temperature=temperature,
+        max_num_words=max_num_words,
+        language_level=language_level,
+        remark=remark,
+        cloud_models_only=cloud_models_only,
+    ))
+
+
+async def create_sentence_from_word_async(
+    word: str,
+    language_1: str,
+    language_2: str,
+    llama_params: Llama_params,
+    temperature: float = 0.7,
+    max_num_words: int = 10,
+    language_level: str = "C1",
+    remark: str | None = None,
+    cloud_models_only: bool = False
+) -> tuple[str, str]:
+    """Same as `create_sentence_from_word`, but does not block the event loop."""
     if word.startswith("to "):
         word = word[3:]
 
@@ -27,20 +51,22 @@ def create_sentence_from_word(
     )
 
     if cloud_models_only:
-        response_in_language_1 = respond_with_gemini_fast(
+        response_in_language_1 = await respond_with_gemini_fast_async(
             prompt,
             temperature=temperature,
             max_tokens=60,
+            use_cache=False,
         )
     else:
-        response_in_language_1 = respond_to_prompt(
+        response_in_language_1 = await respond_to_prompt_async(
             prompt,
             llama_params,
             temperature=temperature,
-            stop_phrases=["."]
+            stop_phrases=["."],
+            use_cache=False,
         )
     response_in_language_1 = response_in_language_1.strip().split("\n")[0].strip('"').strip("'")
-    response_in_language_2 = asyncio.run(translate_text(response_in_language_1, language_1, language_2, add_to_word_list=False, speak_translated=False))
+    response_in_language_2 = await translate_text(response_in_language_1, language_1, language_2, add_to_word_list=False, speak_translated=False)
 
     return response_in_language_1, response_in_language_2
 
@@ -70,13 +96,15 @@ def create_next_word_candidates(
         prompt,
         llama_params=llama_params,
         temperature=0.7,
-        max_tokens=num_candidates*5
+        max_tokens=num_candidates*5,
+        use_cache=False,
     )
     candidates = [word.strip() for word in response.split(";")][:num_candidates]
-    word_pairs = []
-    for candidate in candidates:
-        translation = asyncio.run(translate_text(candidate, language_1, "german", add_to_word_list=False, speak_translated=False))
-        word_pairs.append((candidate, translation))
+    translations = run_sync(translate_many(candidates, language_1, "german"))
+    word_pairs = [
+        (candidate, translation if translation is not None else "Translation failed.")
+        for candidate, translation in zip(candidates, translations)
+    ]
 
 
     return word_pairs
@@ -0,0 +1,132 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import pandas as pd
+from word_list_store import word_list_store
+
+# columns of a word list that are not words
+_METADATA_COLUMNS = {"tags", "date_added"}
+# SQLite limits the number of parameters per statement
+_QUERY_BATCH_SIZE = 500
+
+
+class DescriptionFilterCache:
+    """Persistent cache of whether a word matches a description, per model.
+
+    Filtering a word list by a description asks the model about every word. With this cache,
+    a repeated filter only sends the words the model has not classified yet. Entries are keyed
+    by (model, language, description, word); the description is normalized and hashed.
+    When rows of a word list are edited or removed through the word list store, the entries
+    of their words are dropped for all descriptions. Entries expire after `ttl_seconds`, so a
+    wrong verdict of the model is asked again eventually.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float = 30 * 24 * 3600):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+
+    @staticmethod
+    def make_description_key(description: str) -> str:
+        """Hash a description, ignoring case and whitespace differences."""
+        normalized = " ".join(description.lower().split())
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS classifications ("
+                "model TEXT NOT NULL, language TEXT NOT NULL, description TEXT NOT NULL, word TEXT NOT NULL, "
+                "matches INTEGER NOT NULL, created REAL NOT NULL, "
+                "PRIMARY KEY (model, language, description, word))"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS classifications_word ON classifications (word)")
+            self._connection = connection
+        return self._connection
+
+    def get_many(self, model: str, language: str, description: str, words: list[str]) -> dict[str, bool]:
+        """
+        Look up the cached classifications of the given words.
+
+        Returns:
+        - A dictionary from word to whether it matches the description, containing only the cached, unexpired words.
+        """
+        description_key = self.make_description_key(description)
+        language = language.lower()
+        oldest = time.time() - self.ttl_seconds
+        results = {}
+        with self._lock:
+            try:
+                connection = self._connect()
+                for i in range(0, len(words), _QUERY_BATCH_SIZE):
+                    batch = words[i:i + _QUERY_BATCH_SIZE]
+                    rows = connection.execute(
+                        "SELECT word, matches FROM classifications WHERE model = ? AND language = ? AND description = ? "
+                        f"AND created >= ? AND word IN ({','.join('?' * len(batch))})",
+                        (model, language, description_key, oldest, *batch),
+                    ).fetchall()
+                    results.update((word, bool(matches)) for word, matches in rows)
+            except sqlite3.Error as e:
+                print(f"Warning: Description filter cache lookup failed: {e}")
+        return results
+
+    def set_many(self, model: str, language: str, description: str, results: dict[str, bool]) -> None:
+        """Store whether each of the words matches the description."""
+        description_key = self.make_description_key(description)
+        language = language.lower()
+        now = time.time()
+        with self._lock:
+            try:
+                connection = self._connect()
+                connection.execute("DELETE FROM classifications WHERE created < ?", (now - self.ttl_seconds,))
+                connection.executemany(
+                    "INSERT OR REPLACE INTO classifications (model, language, description, word, matches, created) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    [(model, language, description_key, word, int(matches), now) for word, matches in results.items()],
+                )
+                connection.commit()
+            except sqlite3.Error as e:
+                print(f"Warning: Description filter cache write failed: {e}")
+
+    def invalidate_words(self, words: list[str]) -> None:
+        """Drop the cached classifications of the given words for all models, languages and descriptions."""
+        with self._lock:
+            try:
+                connection = self._connect()
+                for i in range(0, len(words), _QUERY_BATCH_SIZE):
+                    batch = words[i:i + _QUERY_BATCH_SIZE]
+                    connection.execute(f"DELETE FROM classifications WHERE word IN ({','.join('?' * len(batch))})", batch)
+                connection.commit()
+            except sqlite3.Error as e:
+                print(f"Warning: Description filter cache invalidation failed: {e}")
+
+    def on_word_list_change(self, path: str, rows: pd.DataFrame) -> None:
+        """Listener for `word_list_store.add_listener`: drop the entries of the edited or removed rows."""
+        words = set()
+        for column in rows.columns:
+            if column not in _METADATA_COLUMNS:
+                words.update(rows[column].dropna().astype(str))
+        if words:
+            self.invalidate_words(sorted(words))
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            connection = self._connect()
+            connection.execute("DELETE FROM classifications")
+            connection.commit()
+
+
+description_filter_cache = DescriptionFilterCache(
+    os.getenv("FILTER_CACHE_PATH", ".cache/description_filter.sqlite"),
+    ttl_seconds=float(os.getenv("FILTER_CACHE_TTL_DAYS", "30")) * 24 * 3600,
+)
+word_list_store.add_listener(description_filter_cache.on_word_list_change)
@@ -1,12 +1,18 @@
-import glob
 import pandas as pd
 import datetime
-from llm_utils.ollama_utils import Llama_params, respond_to_prompt
-from llm_utils.llm_api_utils import respond_with_gemini
+from llm_utils.ollama_utils import Llama_params, respond_to_prompt_async
+from llm_utils.llm_api_utils import respond_with_gemini_async
+from async_utils import run_sync
+from word_list_store import word_list_store
+from word_list_index import word_list_index
+from word_list_db import get_list_name
+from tag_index import get_tag_index
+from vector_index import vector_indexes
+from llm_utils.embeddings import embedding_model_from_env
 
-def get_word_list_file_name(language_1, language_2) -> str:
+def resolve_word_list_file_name(language_1: str, language_2: str) -> str:
     """
-    Get the path to the word list file for the given language pair.
+    Get the path to the existing word list file for the given language pair.
 
     Parameters:
     - language_1: The first language (e.g., "german").
@@ -14,31 +20,108 @@ def get_word_list_file_name(language_1, language_2) -> str:
 
     Returns:
     - The path to the word list file.
-    
+
     Raises:
     - ValueError: If no word list is found for the given language pair.
     """
 
-    word_lists = glob.glob("word_lists/*.csv")
-    selected_word_list = None
-    for word_list in word_lists:
-        if f"{language_1.lower()}_{language_2.lower()}.csv" in word_list:
-            selected_word_list = word_list
-            break
-        elif f"{language_2.lower()}_{language_1.lower()}.csv" in word_list:
-            selected_word_list = word_list
-            break
+    selected_word_list = word_list_index.resolve(language_1, language_2)
     if selected_word_list is None:
-            print(f"No word list found for languages: {language_1}, {language_2}. Creating a new one.")
-            # make new word list
-            selected_word_list = f"word_lists/{language_1.lower()}_{language_2.lower()}.csv"
-            pd.DataFrame(columns=[language_1.capitalize(), language_2.capitalize(), "date_added"]).to_csv(selected_word_list, index=False)
+        raise ValueError(f"No word list found for languages: {language_1}, {language_2}.")
+    return selected_word_list
+
+
+def create_word_list_file(language_1: str, language_2: str) -> str:
+    """
+    Create a new, empty word list file for the given language pair.
+
+    Parameters:
+    - language_1: The first language (e.g., "german").
+    - language_2: The second language (e.g., "english").
+
+    Returns:
+    - The path to the new word list file.
+    """
+
+    selected_word_list = f"{word_list_index.directory}/{language_1.lower()}_{language_2.lower()}.csv"
+    word_list_store.write(selected_word_list, pd.DataFrame(columns=[language_1.capitalize(), language_2.capitalize(), "date_added"]))
+    word_list_index.add(selected_word_list)
     return selected_word_list
 
 
+def get_word_list_file_name(language_1, language_2) -> str:
+    """
+    Get the path to the word list file for the given language pair, creating an empty one if there is none.
+
+    Use `resolve_word_list_file_name` for read-only access.
+
+    Parameters:
+    - language_1: The first language (e.g., "german").
+    - language_2: The second language (e.g., "english").
+
+    Returns:
+    - The path to the word list file.
+    """
+
+    selected_word_list = word_list_index.resolve(language_1, language_2)
+    if selected_word_list is None:
+        print(f"No word list found for languages: {language_1}, {language_2}. Creating a new one.")
+        selected_word_list = create_word_list_file(language_1, language_2)
+    return selected_word_list
+
+
+def find_words(
+    word_list_path: str,
+    start_date_added: str | datetime.datetime | None = None,
+    end_date_added: str | datetime.datetime | None = None,
+    tags: list[str] | None = None,
+    match_all_tags: bool = False,
+    search: str | None = None,
+) -> pd.DataFrame:
+    """
+    Get the word pairs of a word list that match all given filters.
+
+    With the SQLite engine the filters are answered from the database indexes, otherwise from
+    the cached word list, its parsed dates and its tag index.
+
+    Parameters:
+    - word_list_path: The path to the word list file.
+    - start_date_added, end_date_added: Inclusive bounds of the date on which the words were added.
+    - tags: Keep the word pairs with any (or, with `match_all_tags`, all) of these tags.
+    - search: Keep the word pairs where one of the two words contains this text (ignoring case).
+
+    Returns:
+    - The matching word pairs in list order, labeled with their row ids as in `word_list_store.read`.
+    """
+    tags = [tag for tag in tags or [] if tag.strip()]
+    if word_list_store.database is not None:
+        return word_list_store.database.find(get_list_name(word_list_path), start_date_added, end_date_added, tags, match_all_tags, search)
+
+    words = word_list_store.read(word_list_path)
+    if start_date_added is not None or end_date_added is not None:
+        dates_added = word_list_store.dates_added(word_list_path)
+        mask = pd.Series(True, index=dates_added.index)
+        if start_date_added is not None:
+            mask &= dates_added >= pd.to_datetime(start_date_added)
+        if end_date_added is not None:
+            mask &= dates_added <= pd.to_datetime(end_date_added)
+        words = words[mask.reindex(words.index, fill_value=False)]
+    if tags:
+        tag_index = get_tag_index(word_list_path)
+        mask = pd.Series(tag_index.mask(tags, intersection=match_all_tags), index=tag_index.index)
+        words = words[mask.reindex(words.index, fill_value=False)]
+    if search:
+        mask = pd.Series(False, index=words.index)
+        for column in words.columns[:2]:
+            mask |= words[column].astype(str).str.contains(search, case=False, regex=False)
+        words = words[mask]
+    return words
+
+
 def add_word_pair_to_word_list(word_language_1: str, word_language_2: str, language_1: str, language_2: str) -> None:
     """
-    Add a new word pair to the appropriate word list file.
+    Add a new word pair to the appropriate word list file, unless the list already has it
+    (ignoring case and extra whitespace).
 
     Parameters:
     - word_language_1: The word in the first language.
@@ -48,16 +131,13 @@ def add_word_pair_to_word_list(word_language_1: str, word_language_2: str, langu
     """
 
     word_list_path = get_word_list_file_name(language_1, language_2)
-    new_row = pd.DataFrame({
-         language_1.capitalize(): [word_language_1.strip()],
-         language_2.capitalize(): [word_language_2.strip()],
-         "date_added": [datetime.datetime.now().strftime("%Y-%m-%d %H:%M")]
-         })
-    
-    words: pd.DataFrame = pd.read_csv(word_list_path)
-    if not ((words[language_1.capitalize()] == word_language_1.strip()).any() and (words[language_2.capitalize()] == word_language_2.strip()).any()):
-        words = pd.concat([words, new_row], ignore_index=True)
-        words.to_csv(word_list_path, index=False)
+    new_words = {language_1.capitalize(): word_language_1.strip(), language_2.capitalize(): word_language_2.strip()}
+    _, added = word_list_store.add(word_list_path, {
+        **new_words,
+        "date_added": datetime.datetime.now().strftime("%Y-%m-%d %H:%M"),
+    })
+    if added:
+        vector_indexes.add_words(word_list_path, new_words, embedding_model_from_env())
 
 
 def add_date_to_word_list(word_list_path: str) -> None:
@@ -67,10 +147,12 @@ def add_date_to_word_list(word_list_path: str) -> None:
     Parameters:
     - word_list_path: The path to the word list file.
     """
-    
-    words: pd.DataFrame = pd.read_csv(word_list_path)
-    words.loc[words["date_added"].isna() | (words["date_added"] == ""), "date_added"] = datetime.datetime.now().strftime("%Y-%m-%d %H:%M")
-    words.to_csv(word_list_path, index=False)
+
+    def _fill_dates(words: pd.DataFrame) -> pd.DataFrame:
+        words.loc[words["date_added"].isna() | (words["date_added"] == ""), "date_added"] = datetime.datetime.now().strftime("%Y-%m-%d %H:%M")
+        return words
+
+    word_list_store.update(word_list_path, _fill_dates)
 
 def add_tag_to_word_pair(word_1: str, word_2: str, language_1: str, language_2: str, tag: str) -> None:
     """
@@ -84,23 +166,7 @@ def add_tag_to_word_pair(word_1: str, word_2: str, language_1: str, language_2:
     - tag: The tag to add to the word pair.
     """
 
-    word_list_path = get_word_list_file_name(language_1, language_2)
-    words: pd.DataFrame = pd.read_csv(word_list_path)
-    if "tags" not in words.columns:
-        words["tags"] = ""
-    mask = (words[language_1.capitalize()] == word_1.strip()) & (words[language_2.capitalize()] == word_2.strip())
-    if mask.any():
-        raw = words.loc[mask, "tags"].iloc[0]
-        # raw may be NaN (float) if the cell is empty
-        if pd.isna(raw) or not str(raw).strip():
-            existing_tag_list = []
-        else:
-            existing_tag_list = [t.strip() for t in str(raw).split(";") if t.strip()]
-        # Only add if not already present
-        if tag.strip() and tag.strip() not in existing_tag_list:
-            existing_tag_list.append(tag.strip())
-        words.loc[mask, "tags"] = ";".join(existing_tag_list)
-        words.to_csv(word_list_path, index=False)
+    add_tag_list_to_word_pair(word_1, word_2, language_1, language_2, [tag])
 
 def add_tag_list_to_word_pair(word_1: str, word_2: str, language_1: str, language_2: str, tag_list: list[str]) -> None:
     """
@@ -114,8 +180,42 @@ def add_tag_list_to_word_pair(word_1: str, word_2: str, language_1: str, languag
     - tag_list: The list of tags to add to the word pair.
     """
 
-    for tag in tag_list:
-        add_tag_to_word_pair(word_1, word_2, language_1, language_2, tag)
+    tag_list = [tag.strip() for tag in tag_list if tag.strip()]
+    if not tag_list:
+        return
+    word_list_path = get_word_list_file_name(language_1, language_2)
+    word_list_store.append_to_pair(word_list_path, {language_1.capitalize(): word_1, language_2.capitalize(): word_2}, {"op": "tag", "tags": tag_list})
+
+
+def remove_word_pair_from_word_list(word_1: str, word_2: str, language_1: str, language_2: str) -> None:
+    """
+    Remove a word pair from the word list file.
+
+    Parameters:
+    - word_1: The word in the first language.
+    - word_2: The word in the second language.
+    - language_1: The first language (e.g., "german").
+    - language_2: The second language (e.g., "english").
+    """
+
+    word_list_path = resolve_word_list_file_name(language_1, language_2)
+    word_list_store.append_to_pair(word_list_path, {language_1.capitalize(): word_1, language_2.capitalize(): word_2}, {"op": "delete"})
+
+
+def edit_word_pair_in_word_list(word_1: str, word_2: str, language_1: str, language_2: str, new_values: dict[str, str]) -> None:
+    """
+    Overwrite fields of a word pair in the word list file.
+
+    Parameters:
+    - word_1: The word in the first language.
+    - word_2: The word in the second language.
+    - language_1: The first language (e.g., "german").
+    - language_2: The second language (e.g., "english").
+    - new_values: Mapping from column name (e.g. "German", "tags") to the new value.
+    """
+
+    word_list_path = resolve_word_list_file_name(language_1, language_2)
+    word_list_store.append_to_pair(word_list_path, {language_1.capitalize(): word_1, language_2.capitalize(): word_2}, {"op": "edit", "values": new_values})
 
 
 def suggest_tag_list_for_word_pair_with_llm(
@@ -139,8 +239,27 @@ def suggest_tag_list_for_word_pair_with_llm(
     Returns:
     - A list of suggested tags for the given word pair.
     """
-    word_list_path = get_word_list_file_name(language_1, language_2)
-    word_list = pd.read_csv(word_list_path)
+    return run_sync(suggest_tag_list_for_word_pair_with_llm_async(
+        word_1,
+        word_2,
+        language_1,
+        language_2,
+        llama_params,
+        cloud_models_only=cloud_models_only,
+    ))
+
+
+async def suggest_tag_list_for_word_pair_with_llm_async(
+    word_1: str,
+    word_2: str,
+    language_1: str,
+    language_2: str,
+    llama_params: Llama_params | None,
+    cloud_models_only: bool = False,
+) -> list[str]:
+    """Same as `suggest_tag_list_for_word_pair_with_llm`, but does not block the event loop."""
+    word_list_path = resolve_word_list_file_name(language_1, language_2)
+    word_list = word_list_store.read(word_list_path)
     unique_tags = word_list["tags"].dropna().unique()
     unique_tags_str = ", ".join(unique_tags)
     prompt = f"""
@@ -149,7 +268,7 @@ def suggest_tag_list_for_word_pair_with_llm(
     """
 
     if cloud_models_only:
-        response = respond_with_gemini(
+        response = await respond_with_gemini_async(
             prompt,
             model="gemini-flash-latest",
             temperature=0.2,
@@ -158,7 +277,7 @@ def suggest_tag_list_for_word_pair_with_llm(
     else:
         if llama_params is None:
             return []
-        response = respond_to_prompt(
+        response = await respond_to_prompt_async(
             prompt,
             llama_params,
             temperature=0.3,
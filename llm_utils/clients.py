@@ -0,0 +1,112 @@
+import asyncio
+import os
+import threading
+import weakref
+import ollama
+import requests
+from google import genai
+from googletrans import Translator
+
+
+class ClientRegistry:
+    """Shared clients for Gemini, Ollama, Google Translate and plain HTTP requests.
+
+    Every client is created once and reused, so calls share keep-alive connections instead of
+    paying for a new connection (and TLS handshake) each time. Async clients hold connection
+    pools that belong to one event loop, so they are kept per loop: the FastAPI loop and the
+    shared loop of `async_utils.run_sync` each get their own.
+
+    The API creates the clients at startup and closes them at shutdown (see `startup` and
+    `aclose`); scripts create them on first use.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._gemini: genai.Client | None = None
+        self._ollama: ollama.Client | None = None
+        self._http: requests.Session | None = None
+        self._async_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, object]] = weakref.WeakKeyDictionary()
+
+    def gemini_client(self) -> genai.Client:
+        """Return the shared synchronous Gemini client."""
+        with self._lock:
+            if self._gemini is None:
+                self._gemini = genai.Client(api_key=os.environ.get("GEMINI_API_KEY"))
+            return self._gemini
+
+    def ollama_client(self) -> ollama.Client:
+        """Return the shared synchronous Ollama client."""
+        with self._lock:
+            if self._ollama is None:
+                self._ollama = ollama.Client()
+            return self._ollama
+
+    def http_session(self) -> requests.Session:
+        """Return the shared HTTP session, e.g. for health checks."""
+        with self._lock:
+            if self._http is None:
+                self._http = requests.Session()
+            return self._http
+
+    def _async_client(self, name: str, create):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            clients = self._async_clients.setdefault(loop, {})
+            if name not in clients:
+                clients[name] = create()
+            return clients[name]
+
+    def async_gemini_client(self) -> genai.client.AsyncClient:
+        """Return the async Gemini client of the running event loop."""
+        return self._async_client("gemini", lambda: genai.Client(api_key=os.environ.get("GEMINI_API_KEY"))).aio
+
+    def async_ollama_client(self) -> ollama.AsyncClient:
+        """Return the async Ollama client of the running event loop."""
+        return self._async_client("ollama", ollama.AsyncClient)
+
+    def translator(self) -> Translator:
+        """Return the Google Translate client of the running event loop."""
+        return self._async_client("translator", Translator)
+
+    async def startup(self) -> None:
+        """Create the clients of the running event loop up front."""
+        self.async_ollama_client()
+        self.translator()
+        # without an API key, Gemini fails on first use as before
+        if os.environ.get("GEMINI_API_KEY"):
+            self.async_gemini_client()
+
+    async def aclose(self) -> None:
+        """Close all clients. Clients of other running event loops are closed on their loop."""
+        with self._lock:
+            async_clients = list(self._async_clients.items())
+            self._async_clients.clear()
+            sync_clients = [self._gemini, self._ollama, self._http]
+            self._gemini = self._ollama = self._http = None
+
+        current_loop = asyncio.get_running_loop()
+        for loop, clients in async_clients:
+            if loop is current_loop:
+                await _close_async_clients(clients)
+            elif loop.is_running():
+                await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(_close_async_clients(clients), loop))
+        for client in sync_clients:
+            if client is not None:
+                client.close()
+
+
+async def _close_async_clients(clients: dict[str, object]) -> None:
+    for name, client in clients.items():
+        try:
+            if name == "gemini":
+                await client.aio.aclose()
+                client.close()
+            elif name == "ollama":
+                await client.close()
+            elif name == "translator":
+                await client.client.aclose()
+        except Exception as e:
+            print(f"Warning: Closing the {name} client failed: {e}")
+
+
+client_registry = ClientRegistry()
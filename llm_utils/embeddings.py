@@ -0,0 +1,220 @@
+import asyncio
+import os
+import sqlite3
+import threading
+import zlib
+from collections import OrderedDict
+import numpy as np
+from llm_utils.clients import client_registry
+from llm_utils.start_ollama import start_ollama
+
+
+class HashingEmbeddingModel:
+    """Offline stand-in for an embedding model.
+
+    Texts are embedded as signed, hashed counts of their character n-grams. This needs no
+    server and no download and is deterministic, but it only measures how similar two texts
+    are spelled, not what they mean. It therefore never rejects an answer (`reject_similarity`
+    is None) and accepts only near-identical ones.
+    """
+
+    def __init__(self, dimensions: int = 256, ngram: int = 3, accept_similarity: float = 0.9, reject_similarity: float | None = None, description_reject_similarity: float | None = None):
+        self.name = f"hashing:{dimensions}:{ngram}"
+        self.dimensions = dimensions
+        self.ngram = ngram
+        self.accept_similarity = accept_similarity
+        self.reject_similarity = reject_similarity
+        self.description_reject_similarity = description_reject_similarity
+
+    def _embed_one(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        padded = f" {text.lower()} "
+        for i in range(max(len(padded) - self.ngram + 1, 1)):
+            digest = zlib.crc32(padded[i:i + self.ngram].encode("utf-8"))
+            vector[digest % self.dimensions] += 1.0 if digest & 0x80000000 else -1.0
+        return vector
+
+    async def embed(self, texts: list[str]) -> np.ndarray:
+        return np.stack([self._embed_one(text) for text in texts]) if texts else np.zeros((0, self.dimensions), dtype=np.float32)
+
+
+class OllamaEmbeddingModel:
+    """Sentence embedding model served by Ollama (e.g. `nomic-embed-text`).
+
+    The similarity bands depend on the model, the defaults fit small multilingual models.
+    """
+
+    def __init__(
+        self,
+        model_id: str,
+        url: str = "http://127.0.0.1:11434/v1/models",
+        accept_similarity: float = 0.92,
+        reject_similarity: float | None = 0.35,
+        description_reject_similarity: float | None = 0.2,
+        batch_size: int = 256,
+    ):
+        self.name = f"ollama:{model_id}"
+        self.model_id = model_id
+        self.url = url
+        self.accept_similarity = accept_similarity
+        self.reject_similarity = reject_similarity
+        self.description_reject_similarity = description_reject_similarity
+        self.batch_size = batch_size
+
+    async def embed(self, texts: list[str]) -> np.ndarray:
+        await asyncio.to_thread(start_ollama, url=self.url)
+        client = client_registry.async_ollama_client()
+        vectors = []
+        for start in range(0, len(texts), self.batch_size):
+            response = await client.embed(model=self.model_id, input=texts[start:start + self.batch_size], keep_alive=-1)
+            vectors.extend(response["embeddings"])
+        return np.asarray(vectors, dtype=np.float32)
+
+
+class LlamaCppEmbeddingModel:
+    """Embedding model run with llama.cpp. The model must be loaded with `embedding=True`."""
+
+    def __init__(self, llama_llm, accept_similarity: float = 0.92, reject_similarity: float | None = 0.35, description_reject_similarity: float | None = 0.2):
+        self.name = f"llama_cpp:{getattr(llama_llm, 'model_path', None)}"
+        self.llama_llm = llama_llm
+        self.accept_similarity = accept_similarity
+        self.reject_similarity = reject_similarity
+        self.description_reject_similarity = description_reject_similarity
+
+    async def embed(self, texts: list[str]) -> np.ndarray:
+        from llm_utils.ollama_utils import _llama_cpp_lock
+
+        def _embed() -> list:
+            with _llama_cpp_lock:
+                return self.llama_llm.embed(texts)
+
+        return np.asarray(await asyncio.to_thread(_embed), dtype=np.float32)
+
+
+EmbeddingModel = HashingEmbeddingModel | OllamaEmbeddingModel | LlamaCppEmbeddingModel
+
+
+class EmbeddingCache:
+    """Normalized embedding vectors by (model, text), stored in a SQLite file.
+
+    The most recently used vectors are also kept in memory, so ranking a word list again does
+    not read its vectors from disk.
+    """
+
+    def __init__(self, path: str, hot_size: int = 200_000):
+        self.path = path
+        self.hot_size = hot_size
+        self._hot: OrderedDict[tuple[str, str], np.ndarray] = OrderedDict()
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "model TEXT NOT NULL, text TEXT NOT NULL, vector BLOB NOT NULL, PRIMARY KEY (model, text)) WITHOUT ROWID"
+            )
+            self._connection = connection
+        return self._connection
+
+    def _remember(self, key: tuple[str, str], vector: np.ndarray) -> None:
+        self._hot[key] = vector
+        self._hot.move_to_end(key)
+        while len(self._hot) > self.hot_size:
+            self._hot.popitem(last=False)
+
+    def get_many(self, model: str, texts: list[str]) -> dict[str, np.ndarray]:
+        """Return the cached vectors of the texts that have one."""
+        result = {}
+        with self._lock:
+            missing = []
+            for text in texts:
+                vector = self._hot.get((model, text))
+                if vector is None:
+                    missing.append(text)
+                else:
+                    self._hot.move_to_end((model, text))
+                    result[text] = vector
+            try:
+                connection = self._connect()
+                for start in range(0, len(missing), 500):
+                    batch = missing[start:start + 500]
+                    rows = connection.execute(
+                        f"SELECT text, vector FROM embeddings WHERE model = ? AND text IN ({', '.join('?' * len(batch))})",
+                        (model, *batch),
+                    )
+                    for text, blob in rows:
+                        vector = np.frombuffer(blob, dtype=np.float32)
+                        self._remember((model, text), vector)
+                        result[text] = vector
+            except sqlite3.Error as e:
+                print(f"Warning: Embedding cache lookup failed: {e}")
+        return result
+
+    def set_many(self, model: str, vectors: dict[str, np.ndarray]) -> None:
+        with self._lock:
+            for text, vector in vectors.items():
+                self._remember((model, text), vector)
+            try:
+                connection = self._connect()
+                connection.executemany(
+                    "INSERT OR REPLACE INTO embeddings (model, text, vector) VALUES (?, ?, ?)",
+                    [(model, text, np.asarray(vector, dtype=np.float32).tobytes()) for text, vector in vectors.items()],
+                )
+                connection.commit()
+            except sqlite3.Error as e:
+                print(f"Warning: Embedding cache write failed: {e}")
+
+
+embedding_cache = EmbeddingCache(os.getenv("EMBEDDING_CACHE_PATH", os.path.join(".cache", "embeddings.sqlite")))
+
+
+async def embed_texts(texts: list[str], embedding_model: EmbeddingModel, use_cache: bool = True, cache: EmbeddingCache | None = None) -> np.ndarray:
+    """
+    Return the normalized embedding of every text, computing only the ones that are not cached.
+
+    Parameters:
+    - texts: The texts to embed.
+    - embedding_model: The embedding model.
+    - use_cache: If False, neither read nor store cached vectors.
+    - cache: The cache to use, `embedding_cache` by default.
+
+    Returns:
+    - An array of shape (len(texts), dimensions) whose rows have unit length (or are zero for empty texts).
+    """
+    cache = (cache or embedding_cache) if use_cache else None
+    unique_texts = list(dict.fromkeys(texts))
+    vectors = cache.get_many(embedding_model.name, unique_texts) if cache is not None else {}
+    missing = [text for text in unique_texts if text not in vectors]
+    if missing:
+        new_vectors = await embedding_model.embed(missing)
+        norms = np.linalg.norm(new_vectors, axis=1, keepdims=True)
+        new_vectors = new_vectors / np.where(norms > 0, norms, 1.0)
+        computed = dict(zip(missing, new_vectors.astype(np.float32)))
+        if cache is not None:
+            cache.set_many(embedding_model.name, computed)
+        vectors.update(computed)
+    if not texts:
+        return np.zeros((0, 0), dtype=np.float32)
+    return np.stack([vectors[text] for text in texts])
+
+
+async def cosine_similarity(text_1: str, text_2: str, embedding_model: EmbeddingModel) -> float:
+    """Return the cosine similarity of the embeddings of two texts."""
+    vectors = await embed_texts([text_1, text_2], embedding_model)
+    return float(vectors[0] @ vectors[1])
+
+
+def embedding_model_from_env() -> EmbeddingModel | None:
+    """Return the embedding model set in `EMBEDDING_MODEL`: "hashing" for the offline stand-in, an Ollama model id otherwise, or None if it is not set."""
+    name = os.getenv("EMBEDDING_MODEL", "").strip()
+    if not name:
+        return None
+    if name == "hashing":
+        return HashingEmbeddingModel()
+    return OllamaEmbeddingModel(name)
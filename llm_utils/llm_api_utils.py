@@ -1,5 +1,5 @@
-from google import genai
-import os
+from llm_utils.clients import client_registry
+from llm_utils.response_cache import llm_response_cache
 
 
 FAST_GEMINI_MODEL_CANDIDATES = [
@@ -8,8 +8,11 @@ FAST_GEMINI_MODEL_CANDIDATES = [
 ]
 
 
-def respond_with_gemini_fast(prompt: str, temperature: float = 0.01, max_tokens: int = 100) -> str:
-    """Use the fastest available Gemini model with fallback."""
+def respond_with_gemini_fast(prompt: str, temperature: float = 0.01, max_tokens: int = 100, use_cache: bool = True) -> str:
+    """Use the fastest available Gemini model with fallback.
+
+    Set `use_cache` to False for creative calls that should give a new response every time.
+    """
     last_error = None
     for candidate in FAST_GEMINI_MODEL_CANDIDATES:
         try:
@@ -18,6 +21,7 @@ def respond_with_gemini_fast(prompt: str, temperature: float = 0.01, max_tokens:
                 model=candidate,
                 temperature=temperature,
                 max_tokens=max_tokens,
+                use_cache=use_cache,
             )
         except Exception as e:
             last_error = e
@@ -28,13 +32,55 @@ def respond_with_gemini_fast(prompt: str, temperature: float = 0.01, max_tokens:
 
 
 
-def respond_with_gemini(prompt: str, model: str = "gemini-flash-latest", temperature: float = 0.01, max_tokens: int = 100) -> str:
+def respond_with_gemini(prompt: str, model: str = "gemini-flash-latest", temperature: float = 0.01, max_tokens: int = 100, use_cache: bool = True) -> str:
+    """Send a prompt to Gemini. Responses are cached by (model, prompt, sampling params) unless `use_cache` is False."""
+    cache_key = llm_response_cache.make_key("gemini", model, prompt, temperature, max_tokens)
+    if use_cache:
+        cached = llm_response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    response = client_registry.gemini_client().models.generate_content(
+        model=model,
+        contents=prompt
+    )
+    if use_cache and response.text is not None:
+        llm_response_cache.set(cache_key, response.text)
+    return response.text
+
+
+async def respond_with_gemini_fast_async(prompt: str, temperature: float = 0.01, max_tokens: int = 100, use_cache: bool = True) -> str:
+    """Same as `respond_with_gemini_fast`, but does not block the event loop."""
+    last_error = None
+    for candidate in FAST_GEMINI_MODEL_CANDIDATES:
+        try:
+            return await respond_with_gemini_async(
+                prompt=prompt,
+                model=candidate,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                use_cache=use_cache,
+            )
+        except Exception as e:
+            last_error = e
+            continue
+    if last_error is not None:
+        raise last_error
+    raise RuntimeError("No Gemini model candidates configured.")
+
 
-    api_key = os.environ.get("GEMINI_API_KEY")
-    client = genai.Client(api_key=api_key)
+async def respond_with_gemini_async(prompt: str, model: str = "gemini-flash-latest", temperature: float = 0.01, max_tokens: int = 100, use_cache: bool = True) -> str:
+    """Same as `respond_with_gemini`, but uses the async Gemini client."""
+    cache_key = llm_response_cache.make_key("gemini", model, prompt, temperature, max_tokens)
+    if use_cache:
+        cached = llm_response_cache.get(cache_key)
+        if cached is not None:
+            return cached
 
-    response = client.models.generate_content(
+    response = await client_registry.async_gemini_client().models.generate_content(
         model=model,
         contents=prompt
     )
-    return response.text
\ No newline at end of file
+    if use_cache and response.text is not None:
+        llm_response_cache.set(cache_key, response.text)
+    return response.text
@@ -1,8 +1,12 @@
-import ollama
+import asyncio
+import os
+import threading
 from openai import OpenAI
 import json
 from llama_cpp import Llama
+from llm_utils.clients import client_registry
 from llm_utils.start_ollama import start_ollama
+from llm_utils.response_cache import llm_response_cache
 
 
 class Llama_params:
@@ -94,16 +98,74 @@ def respond_with_structured_output(prompt: str, url: str, output_type: str, mode
 # )
 
 
+def get_ollama_num_parallel() -> int:
+    """Return how many requests the Ollama server handles in parallel (`OLLAMA_NUM_PARALLEL`, default 4)."""
+    try:
+        return max(int(os.getenv("OLLAMA_NUM_PARALLEL", "4")), 1)
+    except ValueError:
+        return 4
+
+
+def get_context_window_tokens(llama_params: Llama_params) -> int:
+    """Return the context window of the local model in tokens.
+
+    For llama.cpp this is the `n_ctx` the model was loaded with, for Ollama the server's
+    `OLLAMA_CONTEXT_LENGTH` (default 4096).
+    """
+    if llama_params.use_cpp and llama_params.llama_llm is not None:
+        return llama_params.llama_llm.n_ctx()
+    try:
+        return max(int(os.getenv("OLLAMA_CONTEXT_LENGTH", "4096")), 1)
+    except ValueError:
+        return 4096
+
+
+# llama.cpp models must not be called from several threads at once
+_llama_cpp_lock = threading.Lock()
+
+
+def _response_cache_key(prompt: str, llama_params: Llama_params, max_tokens: int, temperature: float, stop_phrases: list[str] | None) -> str:
+    if not llama_params.use_cpp:
+        return llm_response_cache.make_key("ollama", llama_params.model_id, prompt, max_tokens, temperature, stop_phrases)
+    model_path = getattr(llama_params.llama_llm, "model_path", None)
+    return llm_response_cache.make_key("llama_cpp", model_path, prompt, max_tokens, temperature, stop_phrases)
+
+
+def _respond_with_llama_cpp(prompt: str, llama_params: Llama_params, max_tokens: int, temperature: float, stop_phrases: list[str] | None) -> str:
+    if llama_params.llama_llm is None:
+        raise ValueError("llama_llm must be provided when use_cpp is True")
+    with _llama_cpp_lock:
+        response = llama_params.llama_llm(
+            prompt,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            stop=stop_phrases
+        )
+    return response["choices"][0]["text"]
+
+
 def respond_to_prompt(
     prompt: str,
     llama_params: Llama_params,
     max_tokens: int = 1000,
     temperature: float = 0.7,
-    stop_phrases: list[str] | None = None
+    stop_phrases: list[str] | None = None,
+    use_cache: bool = True,
 ):
+    """Send a prompt to the local model.
+
+    Responses are cached by (model, prompt, sampling params). Set `use_cache` to False for
+    creative calls that should give a new response every time.
+    """
+    cache_key = _response_cache_key(prompt, llama_params, max_tokens, temperature, stop_phrases)
+    if use_cache:
+        cached = llm_response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
     if not llama_params.use_cpp:
         start_ollama(url=llama_params.url, cpu_only=llama_params.cpu_only)
-        response = ollama.chat(
+        response = client_registry.ollama_client().chat(
             model=llama_params.model_id,
             messages=[{"role": "user", "content": prompt}],
             keep_alive=-1,  # keep model loaded indefinitely
@@ -112,14 +174,46 @@ def respond_to_prompt(
                 "max_tokens": max_tokens
             }
         )
-        return response["message"]["content"]
+        text = response["message"]["content"]
     else:
-        if llama_params.llama_llm is None:
-            raise ValueError("llama_llm must be provided when use_cpp is True")
-        response = llama_params.llama_llm(
-            prompt,
-            max_tokens=max_tokens,
-            temperature=temperature,
-            stop=stop_phrases
+        text = _respond_with_llama_cpp(prompt, llama_params, max_tokens, temperature, stop_phrases)
+    if use_cache:
+        llm_response_cache.set(cache_key, text)
+    return text
+
+
+async def respond_to_prompt_async(
+    prompt: str,
+    llama_params: Llama_params,
+    max_tokens: int = 1000,
+    temperature: float = 0.7,
+    stop_phrases: list[str] | None = None,
+    use_cache: bool = True,
+):
+    """Same as `respond_to_prompt`, but does not block the event loop.
+
+    Ollama is called through its async client; llama.cpp runs in a worker thread.
+    """
+    cache_key = _response_cache_key(prompt, llama_params, max_tokens, temperature, stop_phrases)
+    if use_cache:
+        cached = llm_response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    if not llama_params.use_cpp:
+        await asyncio.to_thread(start_ollama, url=llama_params.url, cpu_only=llama_params.cpu_only)
+        response = await client_registry.async_ollama_client().chat(
+            model=llama_params.model_id,
+            messages=[{"role": "user", "content": prompt}],
+            keep_alive=-1,  # keep model loaded indefinitely
+            options={
+                "temperature": temperature,
+                "max_tokens": max_tokens
+            }
         )
-        return response["choices"][0]["text"]
+        text = response["message"]["content"]
+    else:
+        text = await asyncio.to_thread(_respond_with_llama_cpp, prompt, llama_params, max_tokens, temperature, stop_phrases)
+    if use_cache:
+        llm_response_cache.set(cache_key, text)
+    return text
@@ -0,0 +1,126 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class ResponseCache:
+    """Persistent key-value cache for model responses.
+
+    Entries live in a SQLite file on disk and the most recently used ones are also kept in an
+    in-memory LRU, so repeated lookups do not touch the disk. Entries expire after `ttl_seconds`,
+    and once the cache holds more than `max_entries` the least recently used entries are evicted.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl_seconds: float = 30 * 24 * 3600,
+        max_entries: int = 50_000,
+        hot_size: int = 1024,
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hot_size = hot_size
+        self._hot: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+        self._num_writes = 0
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        """Build a cache key from the parts that determine a response (backend, model, prompt, sampling params)."""
+        return hashlib.sha256(json.dumps(parts, ensure_ascii=False, default=str).encode("utf-8")).hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+            self._connection = connection
+        return self._connection
+
+    def _remember(self, key: str, value: str, created: float) -> None:
+        self._hot[key] = (value, created)
+        self._hot.move_to_end(key)
+        while len(self._hot) > self.hot_size:
+            self._hot.popitem(last=False)
+
+    def get(self, key: str) -> str | None:
+        """Return the cached value for the key, or None if it is missing or expired."""
+        now = time.time()
+        with self._lock:
+            hot = self._hot.get(key)
+            if hot is not None:
+                value, created = hot
+                if now - created <= self.ttl_seconds:
+                    self._hot.move_to_end(key)
+                    return value
+                del self._hot[key]
+            try:
+                connection = self._connect()
+                row = connection.execute("SELECT value, created FROM responses WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    return None
+                value, created = row
+                if now - created > self.ttl_seconds:
+                    connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    connection.commit()
+                    return None
+                connection.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+                connection.commit()
+            except sqlite3.Error as e:
+                print(f"Warning: Response cache lookup failed: {e}")
+                return None
+            self._remember(key, value, created)
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        """Store a value under the key."""
+        now = time.time()
+        with self._lock:
+            self._remember(key, value, now)
+            try:
+                connection = self._connect()
+                connection.execute(
+                    "INSERT OR REPLACE INTO responses (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                    (key, value, now, now),
+                )
+                self._num_writes += 1
+                # checking the size on every write would cost a full count
+                if self._num_writes % 100 == 0:
+                    self._evict(connection, now)
+                connection.commit()
+            except sqlite3.Error as e:
+                print(f"Warning: Response cache write failed: {e}")
+
+    def _evict(self, connection: sqlite3.Connection, now: float) -> None:
+        connection.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl_seconds,))
+        (num_entries,) = connection.execute("SELECT COUNT(*) FROM responses").fetchone()
+        if num_entries > self.max_entries:
+            connection.execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY accessed LIMIT ?)",
+                (num_entries - self.max_entries,),
+            )
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._hot.clear()
+            connection = self._connect()
+            connection.execute("DELETE FROM responses")
+            connection.commit()
+
+
+llm_response_cache = ResponseCache(os.getenv("LLM_CACHE_PATH", ".cache/llm_responses.sqlite"))
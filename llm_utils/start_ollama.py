@@ -1,10 +1,25 @@
+import time
 import requests
+from llm_utils.clients import client_registry
+
+# how long a successful health check is trusted before the server is probed again
+HEALTH_CHECK_TTL_SECONDS = 10.0
+_last_successful_check: dict[str, float] = {}
+
 
 def _is_server_running(url: str) -> bool:
+    checked = _last_successful_check.get(url)
+    if checked is not None and time.monotonic() - checked < HEALTH_CHECK_TTL_SECONDS:
+        return True
     try:
-        return requests.get(url, timeout=1).status_code == 200
+        running = client_registry.http_session().get(url, timeout=1).status_code == 200
     except Exception:
-        return False
+        running = False
+    if running:
+        _last_successful_check[url] = time.monotonic()
+    else:
+        _last_successful_check.pop(url, None)
+    return running
 
 def start_ollama(url: str = "http://127.0.0.1:11434/v1/models", cpu_only: bool = False):
 
@@ -21,6 +36,8 @@ def start_ollama(url: str = "http://127.0.0.1:11434/v1/models", cpu_only: bool =
     server_cmd = ["ollama", "serve"]
     env = os.environ.copy()
     env["OLLAMA_KEEP_ALIVE"] = "-1"  # keep models loaded indefinitely
+    # must match the client-side concurrency limit (see ollama_utils.get_ollama_num_parallel)
+    env.setdefault("OLLAMA_NUM_PARALLEL", "4")
     if cpu_only:
         env["OLLAMA_NUM_GPU"] = "0"
         env["OLLAMA_LLM_LIBRARY"] = "cpu"
@@ -0,0 +1,251 @@
+import asyncio
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+import numpy as np
+import pandas as pd
+from llm_utils.ollama_utils import Llama_params
+from review_scheduler import DueQueue, ReviewScheduler
+from sentence_pool import SentencePool
+from weighted_sampler import WeightedSampler
+from word_test_runner import SAMPLING_MODES, sample_words_with_optional_sentences_batch_async
+
+
+class PracticeSession:
+    """A practice run over one word list that prepares the next words ahead of time.
+
+    While the learner answers the current word, the session already samples the next
+    `prefetch_size` words and creates their sentences in the background, so asking for the
+    next word returns from the buffer instead of waiting for the model.
+
+    Words are drawn by a `WeightedSampler` over the row ids, so a turn does not copy the word
+    list. The words shown in the last `hide_used_word_for_n_words` turns and the words already
+    in the buffer are not sampled again, unless the word list is too short for that.
+
+    With `sampling_mode="due"`, the words are taken in the order in which they are due for
+    review in `review_scheduler` instead (see `ReviewScheduler.most_due`), from a `DueQueue`
+    that is updated with every recorded answer. A word that was shown but not answered comes
+    back like a word that was answered incorrectly.
+    All methods must be awaited on the same event loop.
+    """
+
+    def __init__(
+        self,
+        words: pd.DataFrame,
+        language_1: str,
+        language_2: str,
+        probability_for_sentence_creation: float,
+        llama_params: Llama_params | None = None,
+        max_num_words_in_created_sentence: int = 10,
+        language_level_for_created_sentence: str = "C1",
+        remark: str | None = None,
+        cloud_models_only: bool = False,
+        prefetch_size: int = 3,
+        hide_used_word_for_n_words: int = 0,
+        sentence_pool: SentencePool | None = None,
+        weights: pd.Series | None = None,
+        sampling_mode: str = "random",
+        review_scheduler: ReviewScheduler | None = None,
+    ):
+        if sampling_mode not in SAMPLING_MODES:
+            raise ValueError(f"Unknown sampling mode: {sampling_mode}. Use one of {', '.join(SAMPLING_MODES)}.")
+        if sampling_mode == "due" and review_scheduler is None:
+            raise ValueError('Sampling mode "due" needs a review scheduler.')
+        self.words = words
+        self.language_1 = language_1
+        self.language_2 = language_2
+        self.probability_for_sentence_creation = probability_for_sentence_creation
+        self.llama_params = llama_params
+        self.max_num_words_in_created_sentence = max_num_words_in_created_sentence
+        self.language_level_for_created_sentence = language_level_for_created_sentence
+        self.remark = remark
+        self.cloud_models_only = cloud_models_only
+        self.prefetch_size = max(prefetch_size, 1)
+        self.hide_used_word_for_n_words = hide_used_word_for_n_words
+        self.sentence_pool = sentence_pool
+        self.sampler = WeightedSampler(words.index, None if weights is None else weights.reindex(words.index).fillna(1.0))
+        self.review_scheduler = review_scheduler
+        self._due_queue: DueQueue | None = None
+        if sampling_mode == "due":
+            due = review_scheduler.due_times(language_1, language_2, words)
+            self._due_queue = DueQueue(words.index, np.where(np.isnan(due), time.time(), due))
+        self._buffer: deque[dict] = deque()
+        self._fill_task: asyncio.Task | None = None
+
+    def _draw(self, num_words: int) -> list:
+        row_ids = []
+        if self._due_queue is not None:
+            while len(row_ids) < num_words:
+                row_id = self._due_queue.pop()
+                if row_id is None:
+                    break
+                row_ids.append(row_id)
+            return row_ids
+        while len(row_ids) < num_words:
+            row_id = self.sampler.sample()
+            if row_id is None:
+                # fewer words than the exclusion window: repeat recent words rather than stopping
+                if not row_ids and self.sampler.release_next():
+                    continue
+                break
+            # prepared words are not sampled again until they have been shown
+            self.sampler.remove(row_id)
+            row_ids.append(row_id)
+        return row_ids
+
+    async def _fill(self) -> None:
+        while len(self._buffer) < self.prefetch_size:
+            row_ids = self._draw(self.prefetch_size - len(self._buffer))
+            if not row_ids:
+                return
+            rows = self.words.loc[row_ids]
+            try:
+                entries = await self._sample(rows, self.probability_for_sentence_creation)
+            except Exception as e:
+                print(f"Warning: Preparing the next words failed, continuing without sentences: {e}")
+                entries = await self._sample(rows, 0.0)
+            for entry in entries:
+                # the word may have been removed while its sentence was created
+                if entry["index"] in self.sampler:
+                    self._buffer.append(entry)
+
+    async def _sample(self, rows: pd.DataFrame, probability_for_sentence_creation: float) -> list[dict]:
+        return await sample_words_with_optional_sentences_batch_async(
+            rows,
+            self.language_1,
+            self.language_2,
+            probability_for_sentence_creation,
+            llama_params=self.llama_params,
+            max_num_words_in_created_sentence=self.max_num_words_in_created_sentence,
+            language_level_for_created_sentence=self.language_level_for_created_sentence,
+            remark=self.remark,
+            cloud_models_only=self.cloud_models_only,
+            batch_size=len(rows),
+            sentence_pool=self.sentence_pool,
+        )
+
+    def prefetch(self) -> asyncio.Task:
+        """Start filling the buffer in the background, unless that is already running."""
+        if self._fill_task is None or self._fill_task.done():
+            self._fill_task = asyncio.ensure_future(self._fill())
+        return self._fill_task
+
+    async def next(self) -> dict | None:
+        """
+        Return the next word and start preparing the one after it.
+
+        Returns:
+        - A dict with "index", "word_language_1", "word_language_2" and "original_word_language_1",
+          or None if there are no words left to practice.
+        """
+        if not self._buffer:
+            await asyncio.shield(self.prefetch())
+        if not self._buffer:
+            # another caller may have taken the words of the fill we waited for
+            await asyncio.shield(self.prefetch())
+        if not self._buffer:
+            return None
+        entry = self._buffer.popleft()
+        if self._due_queue is not None:
+            self._due_queue.push(entry["index"], time.time() + self.review_scheduler.lapse_seconds)
+        else:
+            self.sampler.advance()
+            self.sampler.cooldown(entry["index"], self.hide_used_word_for_n_words)
+        self.prefetch()
+        return entry
+
+    async def remove_word(self, index) -> None:
+        """Stop practicing a word, e.g. after it was translated correctly."""
+        if index not in self.sampler:
+            return
+        self.sampler.discard(index)
+        if self._due_queue is not None:
+            self._due_queue.remove(index)
+        self._buffer = deque(e for e in self._buffer if e["index"] != index)
+        self.prefetch()
+
+    def record_answer(self, index, correct: bool) -> None:
+        """Store the outcome of a review in the review history and reschedule the word."""
+        if self.review_scheduler is None or index not in self.sampler:
+            return
+        row = self.words.loc[index]
+        due = self.review_scheduler.record(
+            self.language_1,
+            self.language_2,
+            row[self.language_1.capitalize()],
+            row[self.language_2.capitalize()],
+            correct,
+        )
+        # words that are still in the buffer are rescheduled when they are shown
+        if self._due_queue is not None and index in self._due_queue:
+            self._due_queue.push(index, due)
+
+    def set_weight(self, index, weight: float) -> None:
+        """Change how likely a word is to be sampled."""
+        if index in self.sampler:
+            self.sampler.set_weight(index, weight)
+
+    def close(self) -> None:
+        """Stop preparing words."""
+        if self._fill_task is not None:
+            self._fill_task.cancel()
+
+
+class PracticeSessionStore:
+    """The practice sessions of the API, by session id. Sessions expire when they are not used for `ttl_seconds`."""
+
+    def __init__(self, ttl_seconds: float = 3600.0, max_sessions: int = 1000):
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self._sessions: OrderedDict[str, tuple[PracticeSession, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _evict(self, now: float) -> None:
+        while self._sessions:
+            session_id, (session, last_used) = next(iter(self._sessions.items()))
+            if len(self._sessions) <= self.max_sessions and now - last_used <= self.ttl_seconds:
+                break
+            del self._sessions[session_id]
+            session.close()
+
+    def add(self, session: PracticeSession) -> str:
+        """Store a session and return its id."""
+        session_id = uuid.uuid4().hex
+        now = time.monotonic()
+        with self._lock:
+            self._sessions[session_id] = (session, now)
+            self._evict(now)
+        return session_id
+
+    def get(self, session_id: str) -> PracticeSession | None:
+        """Return the session with the given id, or None if it does not exist or has expired."""
+        now = time.monotonic()
+        with self._lock:
+            self._evict(now)
+            item = self._sessions.get(session_id)
+            if item is None:
+                return None
+            self._sessions[session_id] = (item[0], now)
+            self._sessions.move_to_end(session_id)
+            return item[0]
+
+    def remove(self, session_id: str) -> bool:
+        """Close and forget a session. Returns False if it did not exist."""
+        with self._lock:
+            item = self._sessions.pop(session_id, None)
+        if item is None:
+            return False
+        item[0].close()
+        return True
+
+    def clear(self) -> None:
+        """Close all sessions."""
+        with self._lock:
+            sessions = [session for session, _ in self._sessions.values()]
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+
+practice_sessions = PracticeSessionStore()
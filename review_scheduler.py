@@ -0,0 +1,210 @@
+import heapq
+import itertools
+import os
+import random
+import sqlite3
+import threading
+import time
+from typing import Hashable, Iterable
+import numpy as np
+import pandas as pd
+
+DAY_SECONDS = 86400.0
+INITIAL_EASE = 2.5
+MIN_EASE = 1.3
+# SM-2 answer quality of a correct and an incorrect answer (0-5)
+CORRECT_QUALITY = 4
+INCORRECT_QUALITY = 1
+
+
+def _normalize_word(word) -> str:
+    return " ".join(str(word).lower().split())
+
+
+class ReviewScheduler:
+    """Review history and SM-2 schedule of the words of all language pairs.
+
+    Every answer updates the state of its word: the number of correct answers in a row, the
+    current interval, the ease factor and the time at which the word is due again. A correct
+    answer grows the interval (1 day, 6 days, then interval * ease), an incorrect one brings the
+    word back after `lapse_seconds`. Words are identified by their normalized word pair, so the
+    history survives edits elsewhere in the word list and does not depend on the direction in
+    which the pair is practiced.
+
+    The states are stored in a SQLite file next to the word lists and kept in memory per
+    language pair after the first use.
+    """
+
+    def __init__(self, path: str, lapse_seconds: float = 600.0):
+        self.path = path
+        self.lapse_seconds = lapse_seconds
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+        # language pair -> word key -> (repetitions, interval in days, ease, due)
+        self._states: dict[str, dict[str, tuple[int, float, float, float]]] = {}
+
+    @staticmethod
+    def make_key(language_1: str, language_2: str, word_language_1: str, word_language_2: str) -> tuple[str, str]:
+        """Return the (language pair, word key) of a word pair, independent of the direction."""
+        language_1, language_2 = language_1.strip().lower(), language_2.strip().lower()
+        word_language_1, word_language_2 = _normalize_word(word_language_1), _normalize_word(word_language_2)
+        if language_1 > language_2:
+            language_1, language_2, word_language_1, word_language_2 = language_2, language_1, word_language_2, word_language_1
+        return f"{language_1}_{language_2}", f"{word_language_1}\t{word_language_2}"
+
+    def make_keys(self, language_1: str, language_2: str, words: pd.DataFrame) -> tuple[str, pd.Series]:
+        """Same as `make_key` for all rows of a word list."""
+
+        def normalize(column: pd.Series) -> pd.Series:
+            return column.astype(str).str.lower().str.strip().str.replace(r"\s+", " ", regex=True)
+
+        column_1 = normalize(words[language_1.capitalize()])
+        column_2 = normalize(words[language_2.capitalize()])
+        if language_1.strip().lower() > language_2.strip().lower():
+            column_1, column_2 = column_2, column_1
+        language_pair, _ = self.make_key(language_1, language_2, "", "")
+        return language_pair, column_1 + "\t" + column_2
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS reviews ("
+                "language_pair TEXT NOT NULL, word TEXT NOT NULL, repetitions INTEGER NOT NULL, "
+                "interval_days REAL NOT NULL, ease REAL NOT NULL, due REAL NOT NULL, "
+                "num_correct INTEGER NOT NULL, num_incorrect INTEGER NOT NULL, last_reviewed REAL NOT NULL, "
+                "PRIMARY KEY (language_pair, word)) WITHOUT ROWID"
+            )
+            self._connection = connection
+        return self._connection
+
+    def _pair_states(self, language_pair: str) -> dict[str, tuple[int, float, float, float]]:
+        states = self._states.get(language_pair)
+        if states is None:
+            states = {}
+            try:
+                rows = self._connect().execute(
+                    "SELECT word, repetitions, interval_days, ease, due FROM reviews WHERE language_pair = ?",
+                    (language_pair,),
+                )
+                states = {word: (repetitions, interval, ease, due) for word, repetitions, interval, ease, due in rows}
+            except sqlite3.Error as e:
+                print(f"Warning: Loading the review history failed: {e}")
+            self._states[language_pair] = states
+        return states
+
+    def record(self, language_1: str, language_2: str, word_language_1: str, word_language_2: str, correct: bool, now: float | None = None) -> float:
+        """
+        Store the outcome of a review and schedule the next one.
+
+        Returns:
+        - The time (seconds since the epoch) at which the word is due again.
+        """
+        now = time.time() if now is None else now
+        language_pair, word = self.make_key(language_1, language_2, word_language_1, word_language_2)
+        with self._lock:
+            states = self._pair_states(language_pair)
+            repetitions, interval, ease, _ = states.get(word, (0, 0.0, INITIAL_EASE, now))
+            quality = CORRECT_QUALITY if correct else INCORRECT_QUALITY
+            if correct:
+                interval = 1.0 if repetitions == 0 else 6.0 if repetitions == 1 else interval * ease
+                repetitions += 1
+                due = now + interval * DAY_SECONDS
+            else:
+                repetitions, interval = 0, 0.0
+                due = now + self.lapse_seconds
+            ease = max(MIN_EASE, ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+            states[word] = (repetitions, interval, ease, due)
+            try:
+                connection = self._connect()
+                connection.execute(
+                    "INSERT INTO reviews VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (language_pair, word) DO UPDATE SET repetitions = excluded.repetitions, "
+                    "interval_days = excluded.interval_days, ease = excluded.ease, due = excluded.due, "
+                    "num_correct = num_correct + excluded.num_correct, num_incorrect = num_incorrect + excluded.num_incorrect, "
+                    "last_reviewed = excluded.last_reviewed",
+                    (language_pair, word, repetitions, interval, ease, due, int(correct), int(not correct), now),
+                )
+                connection.commit()
+            except sqlite3.Error as e:
+                print(f"Warning: Storing the review failed: {e}")
+            return due
+
+    def due_times(self, language_1: str, language_2: str, words: pd.DataFrame) -> np.ndarray:
+        """Return the due time of every row of a word list, NaN for words that were never reviewed."""
+        language_pair, keys = self.make_keys(language_1, language_2, words)
+        with self._lock:
+            states = self._pair_states(language_pair)
+            return np.array([states[key][3] if key in states else np.nan for key in keys], dtype=float)
+
+    def most_due(self, language_1: str, language_2: str, words: pd.DataFrame, n: int, now: float | None = None) -> np.ndarray:
+        """
+        Return the positions of the `n` rows to review next.
+
+        Overdue words come first, then new words in random order, then the words that are not due yet.
+        """
+        now = time.time() if now is None else now
+        due = self.due_times(language_1, language_2, words)
+        due = np.where(np.isnan(due), now, due)
+        order = np.lexsort((np.random.rand(len(due)), due))
+        return order[:n]
+
+    def stats(self, language_1: str, language_2: str, now: float | None = None) -> dict:
+        """Return the number of reviewed and currently due words of a language pair."""
+        now = time.time() if now is None else now
+        language_pair, _ = self.make_key(language_1, language_2, "", "")
+        with self._lock:
+            states = self._pair_states(language_pair)
+            return {
+                "reviewed_words": len(states),
+                "due_words": sum(1 for state in states.values() if state[3] <= now),
+            }
+
+
+class DueQueue:
+    """Row ids ordered by due time.
+
+    A heap with lazy updates: rescheduling or removing a row leaves its old heap entry behind,
+    which is skipped when it comes up. Taking the next row and rescheduling are O(log n).
+    Rows with the same due time come out in random order.
+    """
+
+    def __init__(self, row_ids: Iterable[Hashable], due_times: Iterable[float], rng: random.Random | None = None):
+        self._rng = rng or random.Random()
+        self._counter = itertools.count()
+        self._due: dict[Hashable, float] = {}
+        self._heap: list[tuple[float, float, int, Hashable]] = []
+        for row_id, due in zip(row_ids, due_times):
+            self._due[row_id] = float(due)
+            self._heap.append((float(due), self._rng.random(), next(self._counter), row_id))
+        heapq.heapify(self._heap)
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+    def __contains__(self, row_id: Hashable) -> bool:
+        return row_id in self._due
+
+    def push(self, row_id: Hashable, due: float) -> None:
+        """Add a row or change its due time."""
+        self._due[row_id] = float(due)
+        heapq.heappush(self._heap, (float(due), self._rng.random(), next(self._counter), row_id))
+
+    def remove(self, row_id: Hashable) -> None:
+        self._due.pop(row_id, None)
+
+    def pop(self) -> Hashable | None:
+        """Remove and return the row that is due first, or None if the queue is empty."""
+        while self._heap:
+            due, _, _, row_id = heapq.heappop(self._heap)
+            if self._due.get(row_id) == due:
+                del self._due[row_id]
+                return row_id
+        return None
+
+
+review_scheduler = ReviewScheduler(os.getenv("REVIEW_HISTORY_PATH", os.path.join("word_lists", ".review_history.sqlite")))
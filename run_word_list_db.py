@@ -0,0 +1,39 @@
+import os
+import click
+
+
+@click.group()
+@click.option("--db_path", default=None, help="Path to the SQLite database. Defaults to WORD_LIST_DB_PATH or word_lists/word_lists.sqlite.")
+@click.pass_context
+def run_word_list_db(ctx: click.Context, db_path: str | None):
+    """Copy word lists between the CSV files and the SQLite database (WORD_LIST_ENGINE=sqlite)."""
+    from word_list_db import WordListDatabase
+
+    ctx.obj = WordListDatabase(db_path or os.getenv("WORD_LIST_DB_PATH", os.path.join("word_lists", "word_lists.sqlite")))
+
+
+@run_word_list_db.command("import")
+@click.argument("directory", default="word_lists")
+@click.pass_obj
+def import_word_lists(database, directory: str):
+    """Import all CSV word lists in DIRECTORY into the database."""
+    from word_list_db import import_csv_files
+
+    for name in import_csv_files(database, directory):
+        click.echo(f"Imported {name}")
+
+
+@run_word_list_db.command("export")
+@click.argument("directory", default="word_lists")
+@click.pass_obj
+def export_word_lists(database, directory: str):
+    """Export all word lists of the database to CSV files in DIRECTORY."""
+    from word_list_db import export_csv_files
+
+    for path in export_csv_files(database, directory):
+        click.echo(f"Exported {path}")
+
+# example: python run_word_list_db.py import word_lists && WORD_LIST_ENGINE=sqlite ./start.sh
+
+if __name__ == "__main__":
+    run_word_list_db()
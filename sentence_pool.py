@@ -0,0 +1,227 @@
+import asyncio
+import os
+import random
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable
+
+# (language_1, language_2, word, language level, max number of words in the sentence, model)
+PoolKey = tuple[str, str, str, str, int, str]
+
+
+class SentencePool:
+    """Pool of pre-generated example sentences per word.
+
+    Creating a sentence for a practice question takes a model call and a translation while the
+    learner waits. The pool keeps up to `target_depth` ready (sentence_language_1,
+    sentence_language_2) pairs per (language pair, word, language level, max sentence length,
+    model), so most questions can take one instead. A sentence is used only once, and only by
+    requests that asked for the model which created it.
+
+    The words to prepare are registered with `want`. A background task (see `start_worker`)
+    generates sentences for them whenever no sentences were requested for `idle_seconds`,
+    so it does not compete with live requests for the model. The pool is stored in a SQLite
+    file next to the word lists and survives restarts.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        target_depth: int = 3,
+        idle_seconds: float = 2.0,
+        max_wanted_keys: int = 5000,
+    ):
+        self.path = path
+        self.target_depth = target_depth
+        self.idle_seconds = idle_seconds
+        self.max_wanted_keys = max_wanted_keys
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+        self._wanted: OrderedDict[PoolKey, None] = OrderedDict()
+        self._last_request = 0.0
+        self._hits = 0
+        self._misses = 0
+        self._generated = 0
+        self._worker: asyncio.Task | None = None
+
+    @staticmethod
+    def make_key(language_1: str, language_2: str, word: str, language_level: str, max_num_words: int, model: str) -> PoolKey:
+        return language_1.lower(), language_2.lower(), str(word).strip(), str(language_level), int(max_num_words), str(model)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS sentences ("
+                "id INTEGER PRIMARY KEY, language_1 TEXT NOT NULL, language_2 TEXT NOT NULL, word TEXT NOT NULL, "
+                "language_level TEXT NOT NULL, max_num_words INTEGER NOT NULL, model TEXT NOT NULL, "
+                "sentence_language_1 TEXT NOT NULL, sentence_language_2 TEXT NOT NULL, created REAL NOT NULL)"
+            )
+            columns = [row[1] for row in connection.execute("PRAGMA table_info(sentences)")]
+            if "model" not in columns:
+                # pools from before the model was part of the key: nobody knows which model made the sentences
+                connection.execute("DROP INDEX IF EXISTS sentences_key")
+                connection.execute("DELETE FROM sentences")
+                connection.execute("ALTER TABLE sentences ADD COLUMN model TEXT NOT NULL DEFAULT ''")
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS sentences_model_key "
+                "ON sentences (language_1, language_2, word, language_level, max_num_words, model)"
+            )
+            connection.commit()
+            self._connection = connection
+        return self._connection
+
+    def want(self, keys: list[PoolKey]) -> None:
+        """Register words whose sentences the worker should prepare. The most recently wanted words are filled first."""
+        with self._lock:
+            for key in keys:
+                self._wanted[key] = None
+                self._wanted.move_to_end(key)
+            while len(self._wanted) > self.max_wanted_keys:
+                self._wanted.popitem(last=False)
+
+    def take(self, key: PoolKey) -> tuple[str, str] | None:
+        """
+        Remove and return one pre-generated sentence pair for the key.
+
+        Returns:
+        - (sentence_language_1, sentence_language_2), or None if the pool has no sentence for the key.
+        """
+        with self._lock:
+            self._last_request = time.monotonic()
+            self._wanted[key] = None
+            self._wanted.move_to_end(key)
+            row = None
+            try:
+                connection = self._connect()
+                row = connection.execute(
+                    "SELECT id, sentence_language_1, sentence_language_2 FROM sentences "
+                    "WHERE language_1 = ? AND language_2 = ? AND word = ? AND language_level = ? AND max_num_words = ? AND model = ? "
+                    "ORDER BY id LIMIT 1",
+                    key,
+                ).fetchone()
+                if row is not None:
+                    connection.execute("DELETE FROM sentences WHERE id = ?", (row[0],))
+                    connection.commit()
+            except sqlite3.Error as e:
+                print(f"Warning: Sentence pool lookup failed: {e}")
+            if row is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            return row[1], row[2]
+
+    def put(self, key: PoolKey, sentence_language_1: str, sentence_language_2: str) -> None:
+        """Add a sentence pair to the pool."""
+        with self._lock:
+            try:
+                connection = self._connect()
+                connection.execute(
+                    "INSERT INTO sentences (language_1, language_2, word, language_level, max_num_words, model, "
+                    "sentence_language_1, sentence_language_2, created) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (*key, sentence_language_1, sentence_language_2, time.time()),
+                )
+                connection.commit()
+            except sqlite3.Error as e:
+                print(f"Warning: Sentence pool write failed: {e}")
+
+    def depth(self, key: PoolKey) -> int:
+        """Return the number of ready sentences for the key."""
+        with self._lock:
+            connection = self._connect()
+            (count,) = connection.execute(
+                "SELECT COUNT(*) FROM sentences "
+                "WHERE language_1 = ? AND language_2 = ? AND word = ? AND language_level = ? AND max_num_words = ? AND model = ?",
+                key,
+            ).fetchone()
+            return count
+
+    def _next_key_to_fill(self) -> PoolKey | None:
+        with self._lock:
+            candidates = list(reversed(self._wanted))
+        # look at a few of the most recently wanted words first, then at random ones
+        for key in candidates[:20] + random.sample(candidates, min(len(candidates), 20)):
+            if self.depth(key) < self.target_depth:
+                return key
+        return None
+
+    def stats(self) -> dict:
+        """Return the hit rate and depth of the pool."""
+        with self._lock:
+            connection = self._connect()
+            num_sentences, num_words = connection.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT language_1 || '|' || language_2 || '|' || word || '|' || language_level || '|' || max_num_words || '|' || model) "
+                "FROM sentences"
+            ).fetchone()
+            num_requests = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / num_requests if num_requests else None,
+                "pool_depth": num_sentences,
+                "words_in_pool": num_words,
+                "mean_depth_per_word": num_sentences / num_words if num_words else 0.0,
+                "wanted_words": len(self._wanted),
+                "generated": self._generated,
+                "target_depth": self.target_depth,
+            }
+
+    def start_worker(self, generate: Callable[[PoolKey], Awaitable[tuple[str, str] | None]], poll_seconds: float = 1.0) -> None:
+        """
+        Start filling the pool in the background on the running event loop.
+
+        Parameters:
+        - generate: Coroutine function that creates one sentence pair for a key, or returns None
+          if no sentence can be created right now (e.g. no model is configured).
+        - poll_seconds: How long the worker sleeps when there is nothing to do.
+        """
+        if self._worker is not None:
+            return
+
+        async def _run():
+            while True:
+                if time.monotonic() - self._last_request < self.idle_seconds:
+                    await asyncio.sleep(poll_seconds)
+                    continue
+                key = await asyncio.to_thread(self._next_key_to_fill)
+                if key is None:
+                    await asyncio.sleep(poll_seconds)
+                    continue
+                try:
+                    pair = await generate(key)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    print(f"Warning: Sentence pool generation failed: {e}")
+                    await asyncio.sleep(poll_seconds * 10)
+                    continue
+                if pair is None:
+                    # wanted again with the next request for it, so other keys are not starved meanwhile
+                    with self._lock:
+                        self._wanted.pop(key, None)
+                    await asyncio.sleep(poll_seconds * 10)
+                    continue
+                self.put(key, *pair)
+                self._generated += 1
+
+        self._worker = asyncio.get_running_loop().create_task(_run())
+
+    async def stop_worker(self) -> None:
+        """Stop the background worker."""
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+
+
+sentence_pool = SentencePool(os.getenv("SENTENCE_POOL_PATH", os.path.join("word_lists", ".sentence_pool.sqlite")))
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+from word_list_store import word_list_store
+
+
+class TagIndex:
+    """Inverted index from tag to the rows of a word list that carry it.
+
+    Every tag is mapped to a boolean NumPy array over the rows, so tag filters become
+    vectorized AND/OR/NOT operations instead of a string search per row. Tags are matched
+    exactly (ignoring case and surrounding whitespace), so "Verb" does not match "Adverb".
+    """
+
+    def __init__(self, tags: pd.Series):
+        self.index = tags.index
+        self._num_rows = len(tags)
+        self._names: dict[str, str] = {}
+        positions: dict[str, list[int]] = {}
+        for position, cell in enumerate(tags.to_numpy()):
+            if pd.isna(cell):
+                continue
+            for tag in str(cell).split(";"):
+                tag = tag.strip()
+                if not tag:
+                    continue
+                key = tag.lower()
+                self._names.setdefault(key, tag)
+                positions.setdefault(key, []).append(position)
+        self._bitmaps: dict[str, np.ndarray] = {}
+        for key, rows in positions.items():
+            bitmap = np.zeros(self._num_rows, dtype=bool)
+            bitmap[rows] = True
+            self._bitmaps[key] = bitmap
+
+    def tags(self) -> list[str]:
+        """Return all tags in the index."""
+        return list(self._names.values())
+
+    def bitmap(self, tag: str) -> np.ndarray:
+        """Return the rows that carry the given tag as a boolean array."""
+        bitmap = self._bitmaps.get(tag.strip().lower())
+        if bitmap is None:
+            return np.zeros(self._num_rows, dtype=bool)
+        return bitmap
+
+    def mask(self, tags: list[str], exclude_words_with_tag: bool = False, intersection: bool = False) -> np.ndarray:
+        """
+        Compute which rows match a tag filter.
+
+        Parameters:
+        - tags: A list of tags to filter the words by.
+        - exclude_words_with_tag: If True, select the rows that do not match.
+        - intersection: If True, a row matches if it has all of the tags, otherwise if it has at least one of them.
+
+        Returns:
+        - A boolean array over the rows of the word list.
+        """
+        bitmaps = [self.bitmap(tag) for tag in tags]
+        if not bitmaps:
+            mask = np.full(self._num_rows, intersection, dtype=bool)
+        elif intersection:
+            mask = np.logical_and.reduce(bitmaps)
+        else:
+            mask = np.logical_or.reduce(bitmaps)
+        return ~mask if exclude_words_with_tag else mask
+
+
+def _build_tag_index(words: pd.DataFrame) -> TagIndex:
+    if "tags" not in words.columns:
+        return TagIndex(pd.Series([np.nan] * len(words), index=words.index, dtype=object))
+    return TagIndex(words["tags"])
+
+
+def get_tag_index(word_list_path: str) -> TagIndex:
+    """
+    Get the tag index of a word list file. The index is built once per version of the word list.
+
+    Parameters:
+    - word_list_path: The path to the word list file.
+
+    Returns:
+    - The tag index, aligned with the index of the word list returned by `word_list_store.read`.
+    """
+    return word_list_store.derived(word_list_path, "tag_index", _build_tag_index)
@@ -0,0 +1,66 @@
+import word_comparisons
+from word_comparisons import check_equality, damerau_levenshtein, fold_answer, match_answer_locally
+
+
+def test_fold_answer_ignores_case_accents_and_punctuation():
+    assert fold_answer("  ¿Qué   tal? ") == "que tal"
+    assert fold_answer("Straße") == "strasse"
+    assert fold_answer("well-known") == "well known"
+
+
+def test_damerau_levenshtein_is_bounded():
+    assert damerau_levenshtein("proclivity", "porclivity", 2) == 1
+    assert damerau_levenshtein("house", "horse", 1) == 1
+    assert damerau_levenshtein("apple", "banana", 2) == 3
+    assert damerau_levenshtein("a", "abcdef", 2) == 3
+
+
+def test_local_tiers():
+    assert match_answer_locally("evince", "to evince", language="english") is True
+    assert match_answer_locally("Ausguss", "Abfluss, Ausguss", language="german") is True
+    assert match_answer_locally("aqui", "aquí", language="spanish") is True
+    assert match_answer_locally("proclivty", "proclivity", allow_typos=True) is True
+    assert match_answer_locally("proclivty", "proclivity") is None
+    assert match_answer_locally("x", "Haus") is False
+    # wrong articles, short words with another letter and synonyms are left to the model
+    assert match_answer_locally("die See", "der See", language="german") is None
+    assert match_answer_locally("Maus", "Haus") is None
+    assert match_answer_locally("car", "automobile") is None
+    # sentences are not split into alternatives at their commas
+    assert match_answer_locally("bleibe ich zu Hause", "Wenn es regnet, bleibe ich zu Hause.") is None
+
+
+# different real words within the typo distance of each other
+NEAR_WORDS = [
+    ("horse", "house", "english"),
+    ("Kirsche", "Kirche", "german"),
+    ("quiet", "quite", "english"),
+    ("angel", "angle", "english"),
+    ("desert", "dessert", "english"),
+    ("perro", "perra", "spanish"),
+    ("nicht", "nichts", "german"),
+]
+
+
+def test_near_words_are_left_to_the_model(monkeypatch):
+    prompts = []
+
+    async def respond(prompt, llama_params, **kwargs):
+        prompts.append(prompt)
+        return "DIFFERENT"
+
+    monkeypatch.setattr(word_comparisons, "respond_to_prompt_async", respond)
+    monkeypatch.setenv("EMBEDDING_MODEL", "")
+    for answer, correct, language in NEAR_WORDS:
+        assert match_answer_locally(answer, correct, language=language) is None
+        assert check_equality(answer, correct, llama_params=object(), language=language) is False
+    assert len(prompts) == len(NEAR_WORDS)
+
+    # without a model, small typos are still accepted
+    assert check_equality("proclivty", "proclivity") is True
+
+
+if __name__ == "__main__":
+    test_fold_answer_ignores_case_accents_and_punctuation()
+    test_damerau_levenshtein_is_bounded()
+    test_local_tiers()
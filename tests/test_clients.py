@@ -0,0 +1,37 @@
+import asyncio
+from llm_utils.clients import ClientRegistry
+
+
+def test_async_clients_are_shared_per_event_loop():
+    registry = ClientRegistry()
+
+    async def get_clients():
+        return registry.async_ollama_client(), registry.translator()
+
+    async def get_clients_twice():
+        return await get_clients(), await get_clients()
+
+    first, second = asyncio.run(get_clients_twice())
+    assert first[0] is second[0] and first[1] is second[1]
+    # a new loop gets its own clients, the connection pools of the old ones belong to the old loop
+    other = asyncio.run(get_clients())
+    assert other[0] is not first[0]
+    assert registry.ollama_client() is registry.ollama_client()
+
+
+def test_aclose_closes_and_forgets_clients():
+    registry = ClientRegistry()
+
+    async def run():
+        client = registry.async_ollama_client()
+        session = registry.http_session()
+        await registry.aclose()
+        assert registry.async_ollama_client() is not client
+        assert registry.http_session() is not session
+        await registry.aclose()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    test_async_clients_are_shared_per_event_loop()
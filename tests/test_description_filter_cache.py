@@ -0,0 +1,98 @@
+import asyncio
+import time
+import pandas as pd
+from description_filter_cache import DescriptionFilterCache
+from llm_utils.ollama_utils import Llama_params
+from word_list_store import WordListStore
+from word_test_runner import filter_word_list_by_description_async
+
+
+def _create_word_list(path):
+    pd.DataFrame({
+        "German": ["laufen", "Haus", "essen"],
+        "English": ["to run", "house", "to eat"],
+        "tags": ["verb", "", "verb"],
+    }).to_csv(path, index=False)
+
+
+def test_classifications_survive_restart(tmp_path):
+    path = str(tmp_path / "filter.sqlite")
+    cache = DescriptionFilterCache(path)
+    cache.set_many("ollama:llama3", "german", "Verbs only", {"laufen": True, "Haus": False})
+
+    # the description is matched regardless of case and whitespace
+    cached = DescriptionFilterCache(path).get_many("ollama:llama3", "German", "  verbs   only", ["laufen", "Haus", "essen"])
+    assert cached == {"laufen": True, "Haus": False}
+    assert cache.get_many("gemini:gemini-flash-latest", "german", "Verbs only", ["laufen"]) == {}
+    assert cache.get_many("ollama:llama3", "german", "Food", ["laufen"]) == {}
+
+
+def test_edited_and_removed_rows_are_invalidated(tmp_path):
+    word_list_path = str(tmp_path / "german_english.csv")
+    _create_word_list(word_list_path)
+    store = WordListStore()
+    cache = DescriptionFilterCache(str(tmp_path / "filter.sqlite"))
+    store.add_listener(cache.on_word_list_change)
+    store.read(word_list_path)
+    cache.set_many("ollama:llama3", "german", "Verbs only", {"laufen": True, "Haus": False, "essen": True})
+
+    store.append(word_list_path, {"op": "edit", "match": {"German": "laufen", "English": "to run"}, "values": {"English": "to walk"}})
+    assert cache.get_many("ollama:llama3", "german", "Verbs only", ["laufen", "Haus", "essen"]) == {"Haus": False, "essen": True}
+
+    words = store.read(word_list_path)
+    store.write(word_list_path, words[words["German"] != "essen"])
+    assert cache.get_many("ollama:llama3", "german", "Verbs only", ["laufen", "Haus", "essen"]) == {"Haus": False}
+
+    # new rows do not touch the cache
+    cache.set_many("ollama:llama3", "german", "Verbs only", {"laufen": True})
+    store.append(word_list_path, {"op": "add", "values": {"German": "gehen", "English": "to go"}})
+    assert cache.get_many("ollama:llama3", "german", "Verbs only", ["laufen", "Haus"]) == {"laufen": True, "Haus": False}
+
+
+def test_expired_classifications_are_not_returned(tmp_path):
+    path = str(tmp_path / "filter.sqlite")
+    DescriptionFilterCache(path).set_many("ollama:llama3", "german", "Verbs only", {"laufen": True, "Haus": False})
+    time.sleep(0.01)
+    assert DescriptionFilterCache(path, ttl_seconds=0).get_many("ollama:llama3", "german", "Verbs only", ["laufen", "Haus"]) == {}
+    assert DescriptionFilterCache(path).get_many("ollama:llama3", "german", "Verbs only", ["laufen", "Haus"]) == {"laufen": True, "Haus": False}
+
+
+def test_only_cleanly_parsed_verdicts_are_cached(tmp_path, monkeypatch):
+    cache = DescriptionFilterCache(str(tmp_path / "filter.sqlite"))
+    monkeypatch.setattr("word_test_runner.description_filter_cache", cache)
+    monkeypatch.setenv("EMBEDDING_MODEL", "")
+    answers = []
+
+    async def respond(prompt, llama_params, **kwargs):
+        return answers.pop(0)
+
+    monkeypatch.setattr("word_test_runner.respond_to_prompt_async", respond)
+    words = pd.DataFrame({"German": ["laufen", "Haus", "essen"], "English": ["to run", "house", "to eat"]})
+    llama_params = Llama_params(model_id="llama3")
+
+    def filter_words(use_cache=True):
+        filtered = asyncio.run(filter_word_list_by_description_async(words, "german", "Verbs only", llama_params, use_cache=use_cache))
+        return filtered["German"].tolist()
+
+    # the answer was cut off, so "essen" would wrongly count as no match for good
+    answers.append("laufen;es")
+    assert filter_words() == ["laufen"]
+    assert cache.get_many("ollama:llama3", "german", "Verbs only", ["laufen", "Haus", "essen"]) == {}
+
+    answers.append("laufen; essen")
+    assert filter_words() == ["laufen", "essen"]
+    assert cache.get_many("ollama:llama3", "german", "Verbs only", ["laufen", "Haus", "essen"]) == {"laufen": True, "Haus": False, "essen": True}
+    # served from the cache without asking the model, unless the caller bypasses it
+    assert filter_words() == ["laufen", "essen"]
+    answers.append("laufen")
+    assert filter_words(use_cache=False) == ["laufen"]
+    assert cache.get_many("ollama:llama3", "german", "Verbs only", ["essen"]) == {"essen": True}
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_edited_and_removed_rows_are_invalidated(pathlib.Path(tmp_dir))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_expired_classifications_are_not_returned(pathlib.Path(tmp_dir))
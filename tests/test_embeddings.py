@@ -0,0 +1,71 @@
+import asyncio
+import numpy as np
+import pandas as pd
+from llm_utils.embeddings import EmbeddingCache, HashingEmbeddingModel, embed_texts
+from word_comparisons import check_equality_async
+from word_test_runner import rank_word_list_by_description_async
+
+
+class _CountingModel(HashingEmbeddingModel):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.embedded: list[str] = []
+
+    async def embed(self, texts):
+        self.embedded.extend(texts)
+        return await super().embed(texts)
+
+
+def test_vectors_are_normalized_and_cached_on_disk(tmp_path):
+    path = str(tmp_path / "embeddings.sqlite")
+    model = _CountingModel()
+    vectors = asyncio.run(embed_texts(["Haus", "Baum", "Haus"], model, cache=EmbeddingCache(path)))
+    assert vectors.shape == (3, model.dimensions)
+    assert np.allclose(np.linalg.norm(vectors, axis=1), 1.0)
+    assert np.array_equal(vectors[0], vectors[2])
+    assert model.embedded == ["Haus", "Baum"]
+
+    again = asyncio.run(embed_texts(["Baum", "Haus"], model, cache=EmbeddingCache(path)))
+    assert model.embedded == ["Haus", "Baum"]
+    assert np.array_equal(again[1], vectors[0])
+
+
+def test_similarity_bands_decide_without_the_generative_model(tmp_path, monkeypatch):
+    monkeypatch.setattr("llm_utils.embeddings.embedding_cache", EmbeddingCache(str(tmp_path / "embeddings.sqlite")))
+    model = HashingEmbeddingModel(accept_similarity=0.7, reject_similarity=0.05)
+    prompts = []
+
+    async def respond(prompt, llama_params, **kwargs):
+        # the generative model would call every pair the same, so a rejection can only come from the embedding
+        prompts.append(prompt)
+        return "SAME"
+
+    monkeypatch.setattr("word_comparisons.respond_to_prompt_async", respond)
+
+    async def check(answer, correct):
+        return await check_equality_async(answer, correct, llama_params=object(), embedding_model=model)
+
+    # too many typos for the local matcher, but spelled very similarly
+    assert asyncio.run(check("the washing machin broke", "the washing machine is broken"))
+    assert not asyncio.run(check("xyz qwv", "the washing machine is broken"))
+    assert prompts == []
+
+    # between the bands, the generative model decides
+    assert asyncio.run(check("the machine", "the washing machine is broken"))
+    assert len(prompts) == 1
+
+
+def test_rank_word_list_by_description(tmp_path, monkeypatch):
+    monkeypatch.setattr("llm_utils.embeddings.embedding_cache", EmbeddingCache(str(tmp_path / "embeddings.sqlite")))
+    words = pd.DataFrame({"German": ["Baum", "Haustür", "Auto", "Haus"], "English": ["tree", "front door", "car", "house"]})
+    ranked = asyncio.run(rank_word_list_by_description_async(words, "german", "Haus", HashingEmbeddingModel(), top_k=2))
+    assert ranked["German"].tolist() == ["Haus", "Haustür"]
+    assert ranked["similarity"].iloc[0] > ranked["similarity"].iloc[1]
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    with tempfile.TemporaryDirectory() as directory:
+        test_vectors_are_normalized_and_cached_on_disk(Path(directory))
@@ -0,0 +1,69 @@
+import asyncio
+import pandas as pd
+from practice_session import PracticeSession
+from review_scheduler import ReviewScheduler
+
+
+def _words(n):
+    return pd.DataFrame({"German": [f"Wort {i}" for i in range(n)], "English": [f"word {i}" for i in range(n)]})
+
+
+def test_recent_words_are_not_repeated():
+    async def run():
+        session = PracticeSession(_words(6), "german", "english", 0.0, prefetch_size=2, hide_used_word_for_n_words=3)
+        return [(await session.next())["index"] for _ in range(30)]
+
+    indices = asyncio.run(run())
+    # the last three words and the two prefetched ones are never sampled again
+    for i in range(len(indices) - 3):
+        assert len(set(indices[i:i + 4])) == 4
+
+
+def test_short_lists_repeat_recent_words():
+    async def run():
+        session = PracticeSession(_words(2), "german", "english", 0.0, prefetch_size=1, hide_used_word_for_n_words=4)
+        return [(await session.next())["index"] for _ in range(6)]
+
+    assert sorted(set(asyncio.run(run()))) == [0, 1]
+
+
+def test_removed_words_are_not_practiced_again():
+    async def run():
+        session = PracticeSession(_words(3), "german", "english", 0.0, prefetch_size=2)
+        entry = await session.next()
+        await session.remove_word(entry["index"])
+        remaining = []
+        for _ in range(10):
+            entry = await session.next()
+            remaining.append(entry["index"])
+            await session.remove_word(entry["index"])
+            if len(remaining) == 2:
+                break
+        return entry, remaining, await session.next()
+
+    first, remaining, last = asyncio.run(run())
+    assert len(set(remaining)) == 2
+    assert last is None
+
+
+def test_due_mode_reviews_due_words_first(tmp_path):
+    scheduler = ReviewScheduler(str(tmp_path / ".review_history.sqlite"))
+    words = _words(4)
+    for i in range(4):
+        scheduler.record("german", "english", f"Wort {i}", f"word {i}", i != 2)
+
+    async def run():
+        session = PracticeSession(words, "german", "english", 0.0, prefetch_size=1, sampling_mode="due", review_scheduler=scheduler)
+        first = await session.next()
+        session.record_answer(first["index"], True)
+        return first, await session.next()
+
+    first, second = asyncio.run(run())
+    # the word answered incorrectly is due first, the rest is due in a day
+    assert first["index"] == 2
+    assert second["index"] != 2
+    assert scheduler.stats("german", "english")["due_words"] == 0
+
+
+if __name__ == "__main__":
+    test_recent_words_are_not_repeated()
@@ -0,0 +1,38 @@
+import time
+from llm_utils.response_cache import ResponseCache
+
+
+def test_cache_survives_restart(tmp_path):
+    path = str(tmp_path / "responses.sqlite")
+    cache = ResponseCache(path)
+    key = ResponseCache.make_key("ollama", "llama3:8b", "Is 'car' the same as 'automobile'?", 100, 0.01, None)
+    assert cache.get(key) is None
+
+    cache.set(key, "SAME")
+    assert cache.get(key) == "SAME"
+    # a new instance has an empty in-memory tier and reads from disk
+    assert ResponseCache(path).get(key) == "SAME"
+    # different sampling params give a different key
+    assert key != ResponseCache.make_key("ollama", "llama3:8b", "Is 'car' the same as 'automobile'?", 100, 0.7, None)
+
+
+def test_expired_entries_are_not_returned(tmp_path):
+    cache = ResponseCache(str(tmp_path / "responses.sqlite"), ttl_seconds=0.05)
+    cache.set("key", "value")
+    time.sleep(0.1)
+    assert cache.get("key") is None
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ResponseCache(str(tmp_path / "responses.sqlite"), max_entries=50, hot_size=10)
+    for i in range(200):
+        cache.set(f"key-{i}", f"value-{i}")
+    assert cache.get("key-0") is None
+    assert cache.get("key-199") == "value-199"
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_cache_survives_restart(pathlib.Path(tmp_dir))
@@ -0,0 +1,48 @@
+import random
+import pandas as pd
+from review_scheduler import DAY_SECONDS, DueQueue, ReviewScheduler
+
+
+def test_intervals_grow_with_correct_answers_and_reset_on_lapses(tmp_path):
+    path = str(tmp_path / ".review_history.sqlite")
+    scheduler = ReviewScheduler(path, lapse_seconds=600.0)
+    now = 1_000_000.0
+    assert scheduler.record("german", "english", "Haus", "house", True, now=now) == now + DAY_SECONDS
+    assert scheduler.record("german", "english", "Haus", "house", True, now=now) == now + 6 * DAY_SECONDS
+    assert scheduler.record("german", "english", "Haus", "house", True, now=now) == now + 15 * DAY_SECONDS
+    assert scheduler.record("german", "english", "Haus", "house", False, now=now) == now + 600.0
+    assert scheduler.record("german", "english", "Haus", "house", True, now=now) == now + DAY_SECONDS
+
+    # the history survives a restart and does not depend on the direction or spelling of the pair
+    restarted = ReviewScheduler(path)
+    words = pd.DataFrame({"English": [" House", "tree"], "German": ["haus", "Baum"]})
+    due = restarted.due_times("english", "german", words)
+    assert due[0] == now + DAY_SECONDS
+    assert due[1] != due[1]
+    assert restarted.stats("english", "german", now=now) == {"reviewed_words": 1, "due_words": 0}
+
+
+def test_most_due_puts_overdue_then_new_then_later_words(tmp_path):
+    scheduler = ReviewScheduler(str(tmp_path / ".review_history.sqlite"))
+    now = 1_000_000.0
+    words = pd.DataFrame({"German": ["später", "neu", "fällig"], "English": ["later", "new", "due"]})
+    scheduler.record("german", "english", "später", "later", True, now=now)
+    scheduler.record("german", "english", "fällig", "due", False, now=now - 3600)
+    assert list(scheduler.most_due("german", "english", words, 3, now=now)) == [2, 1, 0]
+
+
+def test_due_queue_takes_rows_in_due_order():
+    queue = DueQueue(["a", "b", "c"], [3.0, 1.0, 2.0], rng=random.Random(0))
+    queue.push("a", 0.5)
+    queue.remove("c")
+    assert [queue.pop(), queue.pop(), queue.pop()] == ["a", "b", None]
+    assert len(queue) == 0
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    with tempfile.TemporaryDirectory() as directory:
+        test_intervals_grow_with_correct_answers_and_reset_on_lapses(Path(directory))
+    test_due_queue_takes_rows_in_due_order()
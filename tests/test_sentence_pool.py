@@ -0,0 +1,82 @@
+import asyncio
+import time
+from sentence_pool import SentencePool
+
+
+def test_sentences_are_taken_once_and_survive_restart(tmp_path):
+    path = str(tmp_path / ".sentence_pool.sqlite")
+    pool = SentencePool(path)
+    key = pool.make_key("German", "English", " Haus ", "C1", 10, "ollama:llama3")
+    assert pool.take(key) is None
+
+    pool.put(key, "Das Haus ist alt.", "The house is old.")
+    pool.put(key, "Wir bauen ein Haus.", "We are building a house.")
+    assert SentencePool(path).depth(key) == 2
+
+    assert pool.take(key) == ("Das Haus ist alt.", "The house is old.")
+    assert pool.depth(key) == 1
+    # other levels, lengths and models have their own sentences
+    assert pool.take(pool.make_key("german", "english", "Haus", "A1", 10, "ollama:llama3")) is None
+    assert pool.take(pool.make_key("german", "english", "Haus", "C1", 10, "gemini:fast")) is None
+
+    stats = pool.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 3
+    assert stats["pool_depth"] == 1
+
+
+def test_worker_fills_wanted_words_when_idle(tmp_path):
+    pool = SentencePool(str(tmp_path / ".sentence_pool.sqlite"), target_depth=2, idle_seconds=0.05)
+    keys = [pool.make_key("german", "english", word, "C1", 10, "ollama:llama3") for word in ["Haus", "Baum"]]
+    pool.want(keys)
+
+    async def generate(key):
+        return f"Satz mit {key[2]}", f"Sentence with {key[2]}"
+
+    async def run():
+        pool.start_worker(generate, poll_seconds=0.01)
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline and not all(pool.depth(key) == 2 for key in keys):
+            await asyncio.sleep(0.02)
+        await pool.stop_worker()
+
+    asyncio.run(run())
+    assert [pool.depth(key) for key in keys] == [2, 2]
+    assert pool.take(keys[1]) == ("Satz mit Baum", "Sentence with Baum")
+
+
+def test_worker_creates_sentences_only_with_the_requested_model(tmp_path, monkeypatch):
+    import word_test_runner
+    from api import main
+
+    pool = SentencePool(str(tmp_path / ".sentence_pool.sqlite"))
+    monkeypatch.setattr(main, "sentence_pool", pool)
+    monkeypatch.setattr(main, "llama_params", None)
+    monkeypatch.setenv("GEMINI_API_KEY", "test")
+    calls = []
+
+    async def create_sentence(word, language_1, language_2, llama_params, max_num_words, language_level, cloud_models_only):
+        calls.append(cloud_models_only)
+        return f"Satz mit {word}", f"Sentence with {word}"
+
+    monkeypatch.setattr(main, "create_sentence_from_word_async", create_sentence)
+    request = main.CreateWordRequest(
+        language_1="german", language_2="english", words_language_1=["Haus"], words_language_2=["house"],
+        probability_for_sentence_creation=0.5, cloud_models_only=True,
+    )
+    main._want_pooled_sentences(main._words_from_request(request), request)
+    (key,) = list(pool._wanted)
+    assert key[-1] == word_test_runner.sentence_model_name(None, True)
+    assert asyncio.run(main._generate_pooled_sentence(key)) == ("Satz mit Haus", "Sentence with Haus")
+    assert calls == [True]
+
+    # a learner who asked for a local model must not get sentences from another one
+    local_key = pool.make_key("german", "english", "Haus", "C1", 10, "ollama:llama3")
+    assert asyncio.run(main._generate_pooled_sentence(local_key)) is None
+    assert calls == [True]
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_worker_fills_wanted_words_when_idle(pathlib.Path(tmp_dir))
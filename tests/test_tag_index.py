@@ -0,0 +1,29 @@
+import numpy as np
+import pandas as pd
+from tag_index import TagIndex, get_tag_index
+
+
+def test_tags_are_matched_exactly():
+    index = TagIndex(pd.Series(["Verb", "Adverb", "verb;Bewegung", np.nan, "Nomen; Bewegung "]))
+
+    assert index.mask(["Verb"]).tolist() == [True, False, True, False, False]
+    assert index.mask(["verb", "Bewegung"], intersection=True).tolist() == [False, False, True, False, False]
+    assert index.mask(["Verb", "Nomen"]).tolist() == [True, False, True, False, True]
+    assert index.mask(["Verb"], exclude_words_with_tag=True).tolist() == [False, True, False, True, True]
+    assert sorted(index.tags()) == ["Adverb", "Bewegung", "Nomen", "Verb"]
+
+
+def test_tag_index_is_rebuilt_after_changes(tmp_path):
+    path = str(tmp_path / "german_english.csv")
+    pd.DataFrame({"German": ["laufen"], "English": ["to run"], "date_added": [""], "tags": ["Verb"]}).to_csv(path, index=False)
+    from word_list_store import word_list_store
+
+    first = get_tag_index(path)
+    assert get_tag_index(path) is first
+
+    word_list_store.append(path, {"op": "tag", "match": {"German": "laufen", "English": "to run"}, "tags": ["Bewegung"]})
+    assert sorted(get_tag_index(path).tags()) == ["Bewegung", "Verb"]
+
+
+if __name__ == "__main__":
+    test_tags_are_matched_exactly()
@@ -1,8 +1,10 @@
 import asyncio
+import types
 import pandas as pd
 from llama_cpp import Llama
 from llm_utils.ollama_utils import Llama_params
-from translator_utils import translate_text, show_multiple_translations
+from llm_utils.response_cache import ResponseCache
+from translator_utils import translate_many, translate_text, show_multiple_translations
 
 
 def test_translate_text():
@@ -15,6 +17,22 @@ def test_translate_text():
         translated_es = asyncio.run(translate_text("House", "de", "es"))
         assert translated_es == "Casa"
 
+def test_translate_many():
+        translations = asyncio.run(translate_many(["Haus", "Baum", "Haus"], "de", "en"))
+        assert translations == ["House", "Tree", "House"]
+
+def test_translate_many_keeps_the_other_translations_when_one_fails(tmp_path, monkeypatch):
+        class _Translator:
+            async def translate(self, text, src, dest):
+                if text == "kaputt":
+                    raise ConnectionError("connection reset")
+                return types.SimpleNamespace(text=text.upper())
+
+        monkeypatch.setattr("translator_utils.translation_cache", ResponseCache(str(tmp_path / "translations.sqlite")))
+        monkeypatch.setattr("translator_utils.client_registry.translator", lambda: _Translator())
+        translations = asyncio.run(translate_many(["Haus", "kaputt", "Baum"], "de", "en"))
+        assert translations == ["HAUS", None, "BAUM"]
+
 def test_add_to_word_list():
 
     asyncio.run(translate_text("Test", "de", "es", add_to_word_list=True))
@@ -35,6 +53,8 @@ def test_show_multiple_translations():
 if __name__ == "__main__":
     test_translate_text()
 
+    test_translate_many()
+
     test_add_to_word_list()
 
     test_show_multiple_translations()
\ No newline at end of file
@@ -0,0 +1,72 @@
+import json
+import os
+import numpy as np
+import pandas as pd
+from llm_utils.embeddings import EmbeddingCache, HashingEmbeddingModel
+from vector_index import VectorIndex, VectorIndexRegistry, suggest_tags_from_neighbours
+
+
+def _clustered_vectors(n, dimensions=32, num_clusters=20, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(num_clusters, dimensions))
+    vectors = centers[rng.integers(num_clusters, size=n)] + 0.3 * rng.normal(size=(n, dimensions))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+def test_search_finds_the_exact_neighbours_of_most_queries(tmp_path):
+    vectors = _clustered_vectors(3000)
+    index = VectorIndex.build(str(tmp_path / "index"), "test", [str(i) for i in range(3000)], vectors)
+    hits = 0
+    for query in vectors[:50]:
+        exact = set(np.argsort(-(vectors @ query))[:10])
+        hits += len(exact & {p for p, _ in index.search(query, k=10)})
+    assert hits / 500 > 0.9
+    assert [p for p, _ in index.search(vectors[7], k=1, num_probe=index.num_lists)] == [7]
+
+
+def test_added_vectors_survive_reload_and_interrupted_adds_are_ignored(tmp_path):
+    directory = str(tmp_path / "index")
+    vectors = _clustered_vectors(200)
+    index = VectorIndex.build(directory, "test", [f"w{i}" for i in range(150)], vectors[:150])
+    index.add([f"w{i}" for i in range(150, 200)], vectors[150:])
+    # an add that stopped before meta.json was written
+    with open(os.path.join(directory, "texts.jsonl"), "ab") as f:
+        f.write((json.dumps("partial") + "\n").encode("utf-8"))
+    with open(os.path.join(directory, "vectors.f32"), "ab") as f:
+        f.write(vectors[0].tobytes())
+
+    loaded = VectorIndex.load(directory)
+    assert len(loaded) == 200 and loaded.texts[-1] == "w199"
+    position, similarity = loaded.search(vectors[180], k=1, num_probe=loaded.num_lists)[0]
+    assert loaded.texts[position] == "w180" and similarity > 0.99
+
+    loaded.add(["w200"], vectors[:1])
+    assert VectorIndex.load(directory).texts[-1] == "w200"
+
+
+def test_similar_words_follow_the_word_list(tmp_path, monkeypatch):
+    monkeypatch.setattr("llm_utils.embeddings.embedding_cache", EmbeddingCache(str(tmp_path / "embeddings.sqlite")))
+    path = str(tmp_path / "german_english.csv")
+    pd.DataFrame({
+        "German": ["Haus", "Hausschuh", "Baum", "Baumhaus"],
+        "English": ["house", "slipper", "tree", "tree house"],
+        "date_added": [""] * 4,
+        "tags": ["Wohnen", "Wohnen;Kleidung", "Natur", "Wohnen"],
+    }).to_csv(path, index=False)
+    registry = VectorIndexRegistry()
+    model = HashingEmbeddingModel()
+
+    similar = registry.similar_words(path, "German", "Hauser", model, k=2)
+    assert similar["German"].tolist()[0] == "Haus"
+    assert suggest_tags_from_neighbours(similar) == ["Wohnen", "Kleidung"]
+
+    registry.add_words(path, {"German": "Häuser", "English": "houses"}, model)
+    assert "Häuser" in VectorIndex.load(registry._directory(path, "German")).texts
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    with tempfile.TemporaryDirectory() as directory:
+        test_search_finds_the_exact_neighbours_of_most_queries(Path(directory))
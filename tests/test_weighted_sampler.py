@@ -0,0 +1,75 @@
+import random
+from collections import Counter
+from weighted_sampler import WeightedSampler
+
+
+def test_samples_proportional_to_weights():
+    sampler = WeightedSampler(["a", "b", "c"], [1.0, 3.0, 0.0], rng=random.Random(0))
+    counts = Counter(sampler.sample() for _ in range(4000))
+    assert counts["c"] == 0
+    assert 2.5 < counts["b"] / counts["a"] < 3.5
+
+    sampler.set_weight("c", 4.0)
+    sampler.set_weight("a", 0.0)
+    sampler.set_weight("b", 0.0)
+    assert {sampler.sample() for _ in range(100)} == {"c"}
+
+
+def test_remove_restore_and_discard():
+    sampler = WeightedSampler(range(5), rng=random.Random(0))
+    for row_id in range(4):
+        sampler.remove(row_id)
+    assert len(sampler) == 1
+    assert {sampler.sample() for _ in range(50)} == {4}
+
+    sampler.restore(0)
+    sampler.discard(4)
+    assert 4 not in sampler and 3 in sampler
+    assert {sampler.sample() for _ in range(50)} == {0}
+
+    sampler.restore(4)
+    sampler.discard(0)
+    assert sampler.sample() is None
+
+
+def test_cooldown_brings_ids_back_after_turns():
+    sampler = WeightedSampler(["a", "b", "c"], rng=random.Random(0))
+    sampler.cooldown("a", 2)
+    sampler.cooldown("b", 1)
+    assert len(sampler) == 1
+
+    sampler.advance()
+    assert "b" in {sampler.sample() for _ in range(50)} and len(sampler) == 2
+    sampler.advance()
+    assert len(sampler) == 3
+
+    # a newer cooldown replaces the old one, a discarded id does not come back
+    sampler.cooldown("a", 1)
+    sampler.cooldown("a", 3)
+    sampler.cooldown("c", 1)
+    sampler.discard("c")
+    sampler.advance()
+    assert len(sampler) == 1
+    sampler.advance()
+    sampler.advance()
+    assert len(sampler) == 2 and "c" not in sampler
+
+
+def test_release_next_ends_the_earliest_cooldown():
+    sampler = WeightedSampler(["a", "b"], rng=random.Random(0))
+    sampler.cooldown("a", 5)
+    sampler.cooldown("b", 2)
+    assert sampler.sample() is None
+
+    assert sampler.release_next()
+    assert sampler.sample() == "b"
+    assert sampler.release_next()
+    assert not sampler.release_next()
+    assert len(sampler) == 2
+
+
+if __name__ == "__main__":
+    test_samples_proportional_to_weights()
+    test_remove_restore_and_discard()
+    test_cooldown_brings_ids_back_after_turns()
+    test_release_next_ends_the_earliest_cooldown()
@@ -0,0 +1,88 @@
+import json
+import pandas as pd
+from fastapi.testclient import TestClient
+from api import main
+from word_list_store import WordListStore
+
+
+def _client(tmp_path, monkeypatch) -> tuple[TestClient, str]:
+    path = str(tmp_path / "german_english.csv")
+    pd.DataFrame({
+        "German": ["Haus", "baum", "Auto", "Hund", "Apfel"],
+        "English": ["house", "tree", "car", "dog", "apple"],
+        "date_added": ["2026-01-01 12:00", "2026-01-02 12:00", "2026-01-03 12:00", "2026-01-04 12:00", "2026-01-05 12:00"],
+        "tags": ["Nomen", "Nomen;Natur", None, "Tier", "Natur"],
+    }).to_csv(path, index=False)
+    store = WordListStore()
+    monkeypatch.setattr(main, "word_list_store", store)
+    monkeypatch.setattr("file_utils.word_list_store", store)
+    monkeypatch.setattr(main, "resolve_word_list_file_name", lambda language_1, language_2: path)
+    return TestClient(main.app), path
+
+
+def _pages(client: TestClient, **params) -> list[list[dict]]:
+    pages, cursor = [], None
+    while True:
+        response = client.get("/word_list", params={"language_1": "german", "language_2": "english", **params, **({"cursor": cursor} if cursor else {})}).json()
+        pages.append(response["words"])
+        cursor = response["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+def test_pages_sorted_and_projected(tmp_path, monkeypatch):
+    client, _ = _client(tmp_path, monkeypatch)
+    pages = _pages(client, limit=2, sort="German", fields="German")
+    assert pages == [[{"German": "Apfel"}, {"German": "Auto"}], [{"German": "baum"}, {"German": "Haus"}], [{"German": "Hund"}]]
+
+    pages = _pages(client, limit=3, sort="-date_added", row_ids=True, fields="English")
+    assert [[word["row_id"] for word in page] for page in pages] == [[4, 3, 2], [1, 0]]
+    assert set(pages[0][0]) == {"row_id", "English"}
+
+    response = client.get("/word_list", params={"language_1": "german", "language_2": "english", "limit": 2, "tags": "Natur"}).json()
+    assert response["total"] == 2 and [word["German"] for word in response["words"]] == ["baum", "Apfel"]
+    assert response["next_cursor"] is None
+
+    cursor = client.get("/word_list", params={"language_1": "german", "language_2": "english", "limit": 2, "sort": "German"}).json()["next_cursor"]
+    response = client.get("/word_list", params={"language_1": "german", "language_2": "english", "limit": 2, "sort": "English", "cursor": cursor}).json()
+    assert response["words"] == [] and "sort order" in response["error"]
+
+
+def test_cursor_is_not_shifted_by_changes(tmp_path, monkeypatch):
+    client, path = _client(tmp_path, monkeypatch)
+    first = client.get("/word_list", params={"language_1": "german", "language_2": "english", "limit": 2, "sort": "German"}).json()
+    assert [word["German"] for word in first["words"]] == ["Apfel", "Auto"]
+
+    # a word sorted in front of the cursor is added: the next page still starts after "Auto"
+    main.word_list_store.add(path, {"German": "Ameise", "English": "ant"})
+    second = client.get("/word_list", params={"language_1": "german", "language_2": "english", "limit": 2, "sort": "German", "cursor": first["next_cursor"]}).json()
+    assert [word["German"] for word in second["words"]] == ["baum", "Haus"]
+    assert second["version"] != first["version"]
+
+
+def test_stream_and_not_modified(tmp_path, monkeypatch):
+    client, path = _client(tmp_path, monkeypatch)
+    params = {"language_1": "german", "language_2": "english", "stream": True, "limit": 4, "fields": "German,English"}
+    response = client.get("/word_list", params=params)
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines == [{"German": "Haus", "English": "house"}, {"German": "baum", "English": "tree"}, {"German": "Auto", "English": "car"}, {"German": "Hund", "English": "dog"}]
+    rest = client.get("/word_list", params={**params, "cursor": response.headers["X-Next-Cursor"]})
+    assert [json.loads(line)["German"] for line in rest.text.splitlines()] == ["Apfel"]
+    assert "X-Next-Cursor" not in rest.headers
+
+    etag = response.headers["ETag"]
+    assert client.get("/word_list", params=params, headers={"If-None-Match": etag}).status_code == 304
+    main.word_list_store.append(path, {"op": "edit", "rows": [0], "values": {"English": "home"}})
+    changed = client.get("/word_list", params=params, headers={"If-None-Match": etag})
+    assert changed.status_code == 200 and changed.headers["ETag"] != etag
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    import pytest
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        with pytest.MonkeyPatch.context() as monkeypatch:
+            test_pages_sorted_and_projected(pathlib.Path(tmp_dir), monkeypatch)
@@ -0,0 +1,112 @@
+import pandas as pd
+from word_list_db import WordListDatabase, export_csv_files, import_csv_files
+from word_list_journal import apply_record
+from word_list_store import WordListStore
+
+
+def _words():
+    return pd.DataFrame({
+        "German": ["Haus", "gehen", "Baum"],
+        "English": ["house", "to go", "tree"],
+        "date_added": ["2026-01-01 12:00", "2026-02-01 12:00", "2026-03-01 12:00"],
+        "tags": ["Nomen", "Verb;Alltag", None],
+    })
+
+
+def _same(left: pd.DataFrame, right: pd.DataFrame) -> bool:
+    return left.fillna("").astype(str).equals(right.fillna("").astype(str))
+
+
+def test_records_behave_like_the_journal(tmp_path):
+    database = WordListDatabase(str(tmp_path / "word_lists.sqlite"))
+    words = _words()
+    database.write("german_english", words)
+    records = [
+        {"op": "add", "values": {"German": "Hund", "English": "dog", "date_added": "2026-04-01 12:00"}},
+        {"op": "add", "values": {"English": "house", "German": "Haus", "date_added": "2026-05-01 12:00"}},
+        {"op": "add", "values": {"German": "Katze", "English": "cat"}, "row_id": 7},
+        {"op": "add", "values": {"German": "Katze", "English": "cat"}, "row_id": 7},
+        {"op": "tag", "match": {"German": "Baum", "English": "tree"}, "tags": ["Nomen", "Natur"]},
+        {"op": "tag", "rows": [1], "tags": ["Verb", "Bewegung"]},
+        {"op": "edit", "rows": [7, 9], "values": {"tags": "Tier"}},
+        {"op": "tag", "rows": [7], "pair": ["BAUM", "tree"], "tags": ["Pflanze"]},
+        {"op": "edit", "match": {"German": "Hund", "English": "dog"}, "values": {"English": "hound", "note": "old"}},
+        {"op": "delete", "match": {"German": "Haus", "English": "house"}},
+        {"op": "delete", "match": {"Spanish": "casa"}},
+        {
+            "op": "patch",
+            "update": [{"row": 1, "before": {"German": "gehen", "English": "to go"}, "values": {"English": "to walk"}}],
+            "delete": [{"row": 2, "before": {"German": "Baum", "English": "tree"}}, {"row": 0, "before": {"German": "Haus"}}],
+            "insert": [{"row": 8, "values": {"German": "Maus", "English": "mouse", "date_added": "2026-06-01 12:00"}}],
+        },
+    ]
+    for record in records:
+        words = apply_record(words, record)
+        database.apply_record("german_english", record)
+        assert _same(database.read("german_english"), words), record
+
+
+def test_find_uses_dates_tags_and_text(tmp_path):
+    database = WordListDatabase(str(tmp_path / "word_lists.sqlite"))
+    database.write("german_english", _words())
+
+    assert database.find("german_english", start_date_added="2026-01-15", end_date_added="2026-03-01 12:00")["German"].tolist() == ["gehen", "Baum"]
+    assert database.find("german_english", tags=["verb", "Nomen"])["German"].tolist() == ["Haus", "gehen"]
+    assert database.find("german_english", tags=["Verb", "Alltag"], match_all_tags=True)["German"].tolist() == ["gehen"]
+    assert database.find("german_english", search="AUM")["German"].tolist() == ["Baum"]
+    assert database.find("german_english", search="go")["German"].tolist() == ["gehen"]
+    database.apply_record("german_english", {"op": "edit", "match": {"German": "Baum"}, "values": {"English": "shrub"}})
+    assert database.find("german_english", search="tree").empty
+    assert database.find("german_english", search="shrub")["German"].tolist() == ["Baum"]
+
+
+def test_store_with_database(tmp_path):
+    database = WordListDatabase(str(tmp_path / "word_lists.sqlite"))
+    path = str(tmp_path / "german_english.csv")
+    store = WordListStore(database)
+    store.write(path, _words())
+    store.append(path, {"op": "add", "values": {"German": "Hund", "English": "dog", "date_added": "2026-04-01 12:00"}})
+    assert store.read(path)["German"].tolist() == ["Haus", "gehen", "Baum", "Hund"]
+
+    # a change by another process is noticed through the version of the list
+    WordListStore(WordListDatabase(database.path)).append(path, {"op": "delete", "match": {"German": "Haus"}})
+    assert store.read(path)["German"].tolist() == ["gehen", "Baum", "Hund"]
+
+    version, inserted = store.patch(path, updates={1: {"English": "to walk"}}, deletes=[2], inserts=[{"German": "Maus", "English": "mouse"}], expected_version=store.version(path))
+    assert inserted == [4]
+    assert store.read(path).index.tolist() == [1, 3, 4]
+    assert _same(store.read(path), database.read("german_english"))
+    assert WordListStore(WordListDatabase(database.path)).version(path) == version
+
+
+def test_row_ids_of_deleted_rows_are_not_reused(tmp_path):
+    database = WordListDatabase(str(tmp_path / "word_lists.sqlite"))
+    path = str(tmp_path / "german_english.csv")
+    store = WordListStore(database)
+    store.write(path, _words())
+
+    assert store.add(path, {"German": "Hund", "English": "dog"}) == (3, True)
+    store.append(path, {"op": "delete", "rows": [3]})
+    assert store.add(path, {"German": "Katze", "English": "cat"}) == (4, True)
+    store.write(path, _words())
+    database.apply_record("german_english", {"op": "add", "values": {"German": "Maus", "English": "mouse"}})
+    assert database.read("german_english").index.tolist() == [0, 1, 2, 5]
+    assert WordListStore(WordListDatabase(database.path)).next_row_id(path) == 6
+
+
+def test_import_and_export_csv_files(tmp_path):
+    (tmp_path / "csv").mkdir()
+    _words().assign(row_id=[5, 2, 9]).to_csv(tmp_path / "csv" / "german_english.csv", index=False)
+    database = WordListDatabase(str(tmp_path / "word_lists.sqlite"))
+
+    assert import_csv_files(database, str(tmp_path / "csv")) == ["german_english"]
+    export_csv_files(database, str(tmp_path / "export"))
+    assert (tmp_path / "export" / "german_english.csv").read_text() == (tmp_path / "csv" / "german_english.csv").read_text()
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    for test in (test_records_behave_like_the_journal, test_find_uses_dates_tags_and_text, test_store_with_database, test_row_ids_of_deleted_rows_are_not_reused, test_import_and_export_csv_files):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            test(pathlib.Path(tmp_dir))
@@ -0,0 +1,35 @@
+import os
+import time
+from word_list_index import WordListIndex
+
+
+def test_resolve_is_independent_of_language_order(tmp_path):
+    (tmp_path / "german_english.csv").write_text("German,English,date_added\n")
+    index = WordListIndex(str(tmp_path))
+
+    expected = os.path.join(str(tmp_path), "german_english.csv")
+    assert index.resolve("german", "english") == expected
+    assert index.resolve("English", "German") == expected
+    assert index.resolve("german", "french") is None
+    # resolving must not create anything
+    assert os.listdir(tmp_path) == ["german_english.csv"]
+
+
+def test_new_files_are_picked_up(tmp_path):
+    (tmp_path / "german_english.csv").write_text("German,English,date_added\n")
+    (tmp_path / ".german_english.csv.journal").write_text("")
+    index = WordListIndex(str(tmp_path))
+    assert [pair["key"] for pair in index.language_pairs()] == ["german_english"]
+
+    (tmp_path / "german_french.csv").write_text("German,French,date_added\n")
+    # make sure the directory mtime differs even on file systems with coarse timestamps
+    os.utime(tmp_path, ns=(time.time_ns(), time.time_ns() + 10_000_000))
+    assert index.resolve("french", "german") == os.path.join(str(tmp_path), "german_french.csv")
+    assert [pair["key"] for pair in index.language_pairs()] == ["german_english", "german_french"]
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_resolve_is_independent_of_language_order(pathlib.Path(tmp_dir))
@@ -0,0 +1,156 @@
+import pandas as pd
+from word_list_journal import get_journal_path, get_journal_size, with_row_id_column
+from word_list_store import VersionConflictError, WordListStore
+
+
+def _write_csv(path, rows):
+    pd.DataFrame(rows, columns=["German", "English", "date_added"]).to_csv(path, index=False)
+
+
+def _add_record(german, english):
+    return {"op": "add", "values": {"German": german, "English": english, "date_added": "2026-01-01 12:00"}}
+
+
+def test_changes_are_journaled_without_rewriting_the_csv(tmp_path):
+    path = str(tmp_path / "german_english.csv")
+    _write_csv(path, [["Haus", "house", "2026-01-01 12:00"]])
+    csv_before = open(path).read()
+    store = WordListStore()
+
+    store.append(path, _add_record("Baum", "tree"))
+    store.append(path, {"op": "tag", "match": {"German": "Baum", "English": "tree"}, "tags": ["Nomen", "Natur"]})
+    store.append(path, {"op": "edit", "match": {"German": "Haus", "English": "house"}, "values": {"English": "home"}})
+
+    assert open(path).read() == csv_before
+    words = store.read(path)
+    assert words["English"].tolist() == ["home", "tree"]
+    assert words.loc[1, "tags"] == "Nomen;Natur"
+
+    # a second process sees the same state by replaying the journal
+    assert WordListStore().read(path).equals(words)
+
+
+def test_compaction_folds_the_journal_into_the_csv(tmp_path):
+    path = str(tmp_path / "german_english.csv")
+    _write_csv(path, [["Haus", "house", "2026-01-01 12:00"]])
+    store = WordListStore()
+    store.append(path, _add_record("Baum", "tree"))
+    store.append(path, {"op": "delete", "match": {"German": "Haus", "English": "house"}})
+
+    store.recover(str(tmp_path))
+    assert get_journal_size(path) == 0
+    assert pd.read_csv(path)["German"].tolist() == ["Baum"]
+    assert store.read(path)["German"].tolist() == ["Baum"]
+
+
+def test_torn_record_is_ignored_and_replay_is_idempotent(tmp_path):
+    path = str(tmp_path / "german_english.csv")
+    _write_csv(path, [["Haus", "house", "2026-01-01 12:00"]])
+    store = WordListStore()
+    store.append(path, _add_record("Baum", "tree"))
+    # simulate a crash in the middle of writing the next record
+    with open(get_journal_path(path), "a", encoding="utf-8") as f:
+        f.write('{"op": "add", "values": {"German": "Kat')
+
+    words = WordListStore().read(path)
+    assert words["German"].tolist() == ["Haus", "Baum"]
+
+    # simulate a crash after the CSV was compacted but before the journal was truncated
+    words.to_csv(path, index=False)
+    assert WordListStore().read(path)["German"].tolist() == ["Haus", "Baum"]
+
+
+def test_patch_changes_rows_by_id_and_replays_idempotently(tmp_path):
+    path = str(tmp_path / "german_english.csv")
+    _write_csv(path, [["Haus", "house", "2026-01-01 12:00"], ["Baum", "tree", "2026-01-01 12:00"], ["Hund", "dog", "2026-01-01 12:00"]])
+    store = WordListStore()
+    version = store.version(path)
+
+    new_version, inserted = store.patch(
+        path,
+        updates={2: {"English": "hound", "tags": "Tier"}},
+        deletes=[0],
+        inserts=[{"English": "cat", "German": "Katze"}],
+        expected_version=version,
+    )
+    words = store.read(path)
+    assert words["English"].tolist() == ["tree", "hound", "cat"]
+    # row ids stay with their rows
+    assert words.index.tolist() == [1, 2, 3]
+    assert words.loc[2, "tags"] == "Tier"
+    assert inserted == [3]
+    assert new_version == store.version(path) != version
+
+    # row ids of an older version are rejected
+    try:
+        store.patch(path, deletes=[0], expected_version=version)
+        assert False, "expected a version conflict"
+    except VersionConflictError as e:
+        assert e.version == new_version
+
+    # replaying the journal on top of the compacted CSV changes nothing
+    with_row_id_column(words).to_csv(path, index=False)
+    assert WordListStore().read(path).fillna("").equals(words.fillna(""))
+
+
+def test_rows_added_by_hand_do_not_take_the_ids_of_journaled_rows(tmp_path):
+    path = str(tmp_path / "german_english.csv")
+    _write_csv(path, [["Baum", "tree", "2026-01-01 12:00"]])
+    store = WordListStore()
+    store.add(path, {"German": "Haus", "English": "house"})
+    store.compact(path)
+    row_id, _ = store.add(path, {"German": "Hund", "English": "dog"})
+
+    # a line appended by hand without row id while the add is still in the journal
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("Katze,cat,2026-01-01 12:00,\n")
+    words = WordListStore().read(path)
+    assert sorted(words["German"].tolist()) == ["Baum", "Haus", "Hund", "Katze"]
+    assert words.loc[row_id, "German"] == "Hund"
+
+
+def test_journaled_changes_find_their_rows_after_the_csv_was_renumbered(tmp_path):
+    path = str(tmp_path / "german_english.csv")
+    _write_csv(path, [["Haus", "house", "2026-01-01 12:00"], ["verlassen", "to leave", "2026-01-01 12:00"], ["Baum", "tree", "2026-01-01 12:00"]])
+    store = WordListStore()
+    assert store.append_to_pair(path, {"German": "Verlassen", "English": "to leave"}, {"op": "delete"}) == [1]
+    store.patch(path, updates={2: {"English": "shrub"}})
+
+    # a line inserted by hand in front of the others, in a CSV that has no row ids yet
+    lines = open(path, encoding="utf-8").read().splitlines(keepends=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.writelines([lines[0], "Aufgabe,task,2026-01-01 12:00\n", *lines[1:]])
+    words = WordListStore().read(path)
+    assert words["German"].tolist() == ["Aufgabe", "Haus", "Baum"]
+    assert words["English"].tolist() == ["task", "house", "shrub"]
+
+
+def test_stopped_compaction_does_not_replay_the_journal(tmp_path, monkeypatch):
+    path = str(tmp_path / "german_english.csv")
+    _write_csv(path, [["Haus", "house", "2026-01-01 12:00"]])
+    store = WordListStore()
+    row_id, _ = store.add(path, {"German": "Baum", "English": "tree"})
+    store.append(path, {"op": "edit", "rows": [row_id], "values": {"English": "shrub"}})
+
+    def _stop(word_list_path):
+        raise KeyboardInterrupt()
+    monkeypatch.setattr("word_list_store.truncate_journal", _stop)
+    try:
+        store.compact(path)
+        assert False, "expected the compaction to stop"
+    except KeyboardInterrupt:
+        pass
+    monkeypatch.undo()
+
+    words = WordListStore().read(path)
+    assert words["English"].tolist() == ["house", "shrub"]
+    assert get_journal_size(path) == 0
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_changes_are_journaled_without_rewriting_the_csv(pathlib.Path(tmp_dir))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_patch_changes_rows_by_id_and_replays_idempotently(pathlib.Path(tmp_dir))
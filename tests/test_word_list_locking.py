@@ -0,0 +1,74 @@
+import multiprocessing
+import threading
+import pandas as pd
+from word_list_store import WordListStore
+
+
+NUM_WRITERS = 4
+NUM_WORDS_PER_WRITER = 25
+
+
+def _write_csv(path, rows):
+    pd.DataFrame(rows, columns=["German", "English", "date_added"]).to_csv(path, index=False)
+
+
+def _add_words(path: str, writer_id: int) -> None:
+    """Add words through a fresh store, mixing journal appends with full rewrites."""
+    store = WordListStore()
+    for i in range(NUM_WORDS_PER_WRITER):
+        german, english = f"Wort-{writer_id}-{i}", f"word-{writer_id}-{i}"
+        if i % 5 == 0:
+            # read-modify-write of the whole list, like /save_word_list
+            store.update(path, lambda words: pd.concat(
+                [words, pd.DataFrame({"German": [german], "English": [english], "date_added": ["2026-01-01 12:00"]})],
+                ignore_index=True,
+            ))
+        else:
+            store.append(path, {"op": "add", "values": {"German": german, "English": english, "date_added": "2026-01-01 12:00"}})
+        if i % 10 == 0:
+            store.compact(path)
+
+
+def _expected_words() -> set[str]:
+    return {f"Wort-{w}-{i}" for w in range(NUM_WRITERS) for i in range(NUM_WORDS_PER_WRITER)}
+
+
+def test_concurrent_threads_do_not_lose_rows(tmp_path):
+    path = str(tmp_path / "german_english.csv")
+    _write_csv(path, [])
+
+    threads = [threading.Thread(target=_add_words, args=(path, w)) for w in range(NUM_WRITERS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    words = WordListStore().read(path)
+    assert set(words["German"]) == _expected_words()
+    assert len(words) == NUM_WRITERS * NUM_WORDS_PER_WRITER
+
+
+def test_concurrent_processes_do_not_lose_rows(tmp_path):
+    path = str(tmp_path / "german_english.csv")
+    _write_csv(path, [])
+
+    context = multiprocessing.get_context("spawn")
+    processes = [context.Process(target=_add_words, args=(path, w)) for w in range(NUM_WRITERS)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+        assert process.exitcode == 0
+
+    store = WordListStore()
+    store.compact(path)
+    words = pd.read_csv(path)
+    assert set(words["German"]) == _expected_words()
+    assert len(words) == NUM_WRITERS * NUM_WORDS_PER_WRITER
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_concurrent_processes_do_not_lose_rows(pathlib.Path(tmp_dir))
@@ -0,0 +1,57 @@
+import os
+import time
+import pandas as pd
+import word_list_sidecar
+from word_list_sidecar import get_sidecar_path, read_word_list_file
+from word_list_store import WordListStore
+
+
+def _write_csv(path, rows):
+    pd.DataFrame(rows, columns=["German", "English", "date_added", "tags"]).to_csv(path, index=False)
+
+
+def test_sidecar_matches_csv(tmp_path):
+    path = str(tmp_path / "german_english.csv")
+    _write_csv(path, [["Haus", "house", "2026-01-01 12:00", "Nomen"], ["gehen", "to go", "2026-01-02 08:30", None], ["Baum", "tree", "", "Nomen"]])
+
+    words, dates = read_word_list_file(path)
+    if word_list_sidecar.pa is not None:
+        assert os.path.exists(get_sidecar_path(path))
+    sidecar_words, sidecar_dates = read_word_list_file(path)
+
+    expected = pd.read_csv(path)
+    pd.testing.assert_frame_equal(words, expected)
+    pd.testing.assert_frame_equal(sidecar_words, expected)
+    assert sidecar_dates.tolist() == dates.tolist()
+    assert sidecar_dates[0] == pd.Timestamp("2026-01-01 12:00")
+    assert pd.isna(sidecar_dates[2])
+
+
+def test_sidecar_is_regenerated_when_csv_changes(tmp_path):
+    path = str(tmp_path / "german_english.csv")
+    _write_csv(path, [["Haus", "house", "2026-01-01 12:00", "Nomen"]])
+    read_word_list_file(path)
+
+    _write_csv(path, [["Haus", "house", "2026-01-01 12:00", "Nomen"], ["Baum", "tree", "2026-03-01 12:00", "Nomen"]])
+    os.utime(path, ns=(time.time_ns(), time.time_ns() + 10_000_000))
+    words, dates = read_word_list_file(path)
+    assert words["German"].tolist() == ["Haus", "Baum"]
+    assert dates[1] == pd.Timestamp("2026-03-01 12:00")
+
+
+def test_store_dates_follow_journaled_changes(tmp_path):
+    path = str(tmp_path / "german_english.csv")
+    _write_csv(path, [["Haus", "house", "2026-01-01 12:00", "Nomen"]])
+    store = WordListStore()
+    assert store.dates_added(path).tolist() == [pd.Timestamp("2026-01-01 12:00")]
+
+    store.append(path, {"op": "add", "values": {"German": "Baum", "English": "tree", "date_added": "2026-02-01 12:00"}})
+    assert store.dates_added(path).tolist() == [pd.Timestamp("2026-01-01 12:00"), pd.Timestamp("2026-02-01 12:00")]
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    for test in (test_sidecar_matches_csv, test_sidecar_is_regenerated_when_csv_changes, test_store_dates_follow_journaled_changes):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            test(pathlib.Path(tmp_dir))
@@ -0,0 +1,138 @@
+import os
+import time
+import pandas as pd
+from word_list_store import WordListStore
+
+
+def _write_csv(path, rows):
+    pd.DataFrame(rows, columns=["German", "English", "date_added"]).to_csv(path, index=False)
+
+
+def test_read_is_served_from_cache(tmp_path):
+    path = str(tmp_path / "german_english.csv")
+    _write_csv(path, [["Haus", "house", "2026-01-01 12:00"]])
+    store = WordListStore()
+
+    first = store.read(path)
+    # modifying the returned copy must not leak into the cache
+    first.loc[0, "German"] = "Baum"
+    assert store.read(path).loc[0, "German"] == "Haus"
+
+
+def test_write_updates_file_and_cache(tmp_path):
+    path = str(tmp_path / "german_english.csv")
+    _write_csv(path, [["Haus", "house", "2026-01-01 12:00"]])
+    store = WordListStore()
+
+    store.update(path, lambda words: pd.concat([words, pd.DataFrame({"German": ["Baum"], "English": ["tree"]})], ignore_index=True))
+    assert store.read(path)["German"].tolist() == ["Haus", "Baum"]
+    assert pd.read_csv(path)["German"].tolist() == ["Haus", "Baum"]
+
+
+def test_external_edit_is_noticed(tmp_path):
+    path = str(tmp_path / "german_english.csv")
+    _write_csv(path, [["Haus", "house", "2026-01-01 12:00"]])
+    store = WordListStore()
+    assert len(store.read(path)) == 1
+
+    _write_csv(path, [["Haus", "house", "2026-01-01 12:00"], ["Baum", "tree", "2026-01-02 12:00"]])
+    # make sure the mtime differs even on file systems with coarse timestamps
+    os.utime(path, ns=(time.time_ns(), time.time_ns() + 10_000_000))
+    assert store.read(path)["German"].tolist() == ["Haus", "Baum"]
+
+
+def test_version_changes_with_the_word_list(tmp_path):
+    path = str(tmp_path / "german_english.csv")
+    _write_csv(path, [["Haus", "house", "2026-01-01 12:00"]])
+    store = WordListStore()
+    version = store.version(path)
+    assert WordListStore().version(path) == version
+
+    store.append(path, {"op": "add", "values": {"German": "Baum", "English": "tree"}})
+    assert store.version(path) != version
+    # another process sees the same version for the same content
+    assert WordListStore().version(path) == store.version(path)
+
+
+def test_version_is_never_reused(tmp_path):
+    path = str(tmp_path / "german_english.csv")
+    _write_csv(path, [["Haus", "house", "2026-01-01 12:00"]])
+    store = WordListStore()
+    versions = [store.version(path)]
+
+    row_id, _ = store.add(path, {"German": "Baum", "English": "tree"})
+    versions.append(store.version(path))
+    store.append(path, {"op": "delete", "rows": [row_id]})
+    versions.append(store.version(path))
+    # compaction does not change the content, nor the version
+    assert store.compact(path)
+    assert store.version(path) == versions[-1]
+    assert WordListStore().version(path) == versions[-1]
+    store.add(path, {"German": "Baum", "English": "tree"})
+    versions.append(store.version(path))
+
+    _write_csv(path, [["Haus", "house", "2026-01-01 12:00"]])
+    os.utime(path, ns=(time.time_ns(), time.time_ns() + 10_000_000))
+    versions.append(store.version(path))
+    assert WordListStore().version(path) == versions[-1]
+    os.remove(os.path.join(str(tmp_path), ".german_english.csv.meta"))
+    versions.append(WordListStore().version(path))
+    assert len(set(versions)) == len(versions)
+
+
+def test_row_ids_are_stored_and_pairs_found_ignoring_case(tmp_path):
+    path = str(tmp_path / "german_english.csv")
+    _write_csv(path, [["Haus", "house", "2026-01-01 12:00"], ["Baum", "tree", "2026-01-01 12:00"]])
+    store = WordListStore()
+
+    assert store.find_rows(path, {"English": " HOUSE", "German": "haus"}) == [0]
+    # both words exist, but not in the same row
+    assert store.add(path, {"German": "Haus", "English": "tree"}) == (2, True)
+    assert store.add(path, {"German": "baum ", "English": "Tree"}) == (1, False)
+    store.append(path, {"op": "delete", "rows": [0]})
+    assert store.find_rows(path, {"German": "Haus", "English": "house"}) == []
+    assert store.compact(path)
+    assert pd.read_csv(path)["row_id"].tolist() == [1, 2]
+
+    # a full replacement keeps the ids of known word pairs
+    store.write(path, pd.DataFrame({"German": ["Hund", "Haus", "Baum"], "English": ["dog", "tree", "tree"]}))
+    words = WordListStore().read(path)
+    assert words.index.tolist() == [3, 2, 1]
+    assert store.find_rows(path, {"German": "Hund", "English": "dog"}) == [3]
+
+
+def test_row_ids_of_deleted_rows_are_not_reused(tmp_path):
+    path = str(tmp_path / "german_english.csv")
+    _write_csv(path, [["Haus", "house", "2026-01-01 12:00"], ["Baum", "tree", "2026-01-01 12:00"]])
+    store = WordListStore()
+
+    assert store.add(path, {"German": "Hund", "English": "dog"}) == (2, True)
+    store.append(path, {"op": "delete", "rows": [2]})
+    assert store.add(path, {"German": "Katze", "English": "cat"}) == (3, True)
+    store.append(path, {"op": "delete", "rows": [3]})
+    # the journal with the deleted rows is gone after compaction, the next row id is not
+    assert store.compact(path)
+    assert WordListStore().add(path, {"German": "Maus", "English": "mouse"}) == (4, True)
+    _, inserted = WordListStore().patch(path, deletes=[4], inserts=[{"German": "Vogel", "English": "bird"}])
+    assert inserted == [5]
+
+    store.write(path, pd.DataFrame({"German": ["Haus"], "English": ["house"]}))
+    assert WordListStore().next_row_id(path) == 6
+    assert store.add(path, {"German": "Fisch", "English": "fish"}) == (6, True)
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_read_is_served_from_cache(pathlib.Path(tmp_dir))
+        test_write_updates_file_and_cache(pathlib.Path(tmp_dir))
+        test_external_edit_is_noticed(pathlib.Path(tmp_dir))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_version_changes_with_the_word_list(pathlib.Path(tmp_dir))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_version_is_never_reused(pathlib.Path(tmp_dir))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_row_ids_are_stored_and_pairs_found_ignoring_case(pathlib.Path(tmp_dir))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_row_ids_of_deleted_rows_are_not_reused(pathlib.Path(tmp_dir))
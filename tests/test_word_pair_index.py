@@ -0,0 +1,24 @@
+import pandas as pd
+from word_pair_index import WordPairIndex, normalize_word
+
+
+def test_pairs_are_found_by_normalized_words():
+    words = pd.DataFrame({"German": ["Haus", "Baum", "haus "], "English": ["house", "tree", "House"]}, index=[4, 7, 9])
+    index = WordPairIndex(words)
+
+    assert normalize_word("  Guten   Morgen ") == "guten morgen"
+    assert index.get("HAUS", "house") == [4, 9]
+    assert index.get("Haus", "tree") == []
+    assert len(index) == 3
+
+    words.loc[4, "English"] = "home"
+    words = words.drop(index=[9])
+    words.loc[11] = ["Straße", "street"]
+    index.update(words, [4, 9, 11])
+    assert index.get("Haus", "house") == []
+    assert index.get("haus", "Home") == [4]
+    assert index.get("STRASSE", "street") == [11]
+
+
+if __name__ == "__main__":
+    test_pairs_are_found_by_normalized_words()
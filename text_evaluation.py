@@ -1,6 +1,7 @@
 from llm_utils.llm_api_utils import respond_with_gemini
 from llm_utils.ollama_utils import Llama_params, respond_to_prompt
-from file_utils import get_word_list_file_name
+from file_utils import resolve_word_list_file_name
+from word_list_store import word_list_store
 import pandas as pd
 from typing import Literal
 import os
@@ -26,8 +27,8 @@ def find_mistakes(text_from_user: str, level: Literal["Basic", "Intermediate", "
 
 
 def run_text_evaluation_loop(language: str, no_words_per_task: int = 1, level: Literal["Basic", "Intermediate", "Advanced"] = "Intermediate") -> None:
-    selected_word_list = get_word_list_file_name(os.getenv("PRIMARY_LANGUAGE", "german"), language)
-    words = pd.read_csv(selected_word_list)[language.capitalize()].dropna().unique()
+    selected_word_list = resolve_word_list_file_name(os.getenv("PRIMARY_LANGUAGE", "german"), language)
+    words = word_list_store.read(selected_word_list)[language.capitalize()].dropna().unique()
     while True:
         words_to_translate = pd.Series(words).sample(no_words_per_task).tolist()
         print(f"Please write a text containing the following word in {language}: {', '.join(words_to_translate)}")
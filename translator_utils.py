@@ -1,6 +1,10 @@
-from googletrans import Translator
-from llm_utils.ollama_utils import Llama_params, respond_to_prompt
-from llm_utils.llm_api_utils import respond_with_gemini
+import asyncio
+import os
+from llm_utils.clients import client_registry
+from llm_utils.response_cache import ResponseCache
+from llm_utils.ollama_utils import Llama_params, respond_to_prompt_async
+from llm_utils.llm_api_utils import respond_with_gemini_async
+from async_utils import run_sync
 
 from file_utils import add_word_pair_to_word_list
 
@@ -18,21 +22,74 @@ google_trans_language_to_file_language_dict = {
 }
 
 
-async def translate_text(text: str, src_language: str, dest_language: str, add_to_word_list: bool = False, speak_translated: bool = False) -> str:
-    async with Translator() as translator:
-        result = await translator.translate(text, src=src_language, dest=dest_language)
-        # return error message if translation failed
-        if result.text is None:
-            return "Translation failed."
-        if speak_translated:
-            from create_text_and_voice import create_voice_from_text
-            create_voice_from_text(result.text, language=dest_language)
-        if add_to_word_list:
-            language_1 = google_trans_language_to_file_language_dict.get(src_language)
-            language_2 = google_trans_language_to_file_language_dict.get(dest_language)
-            add_word_pair_to_word_list(text, result.text, language_1, language_2)
+translation_cache = ResponseCache(os.getenv("TRANSLATION_CACHE_PATH", ".cache/translations.sqlite"))
+# Google Translate blocks clients that send too many requests at once
+MAX_CONCURRENT_TRANSLATIONS = 8
+
+
+async def translate_many(texts: list[str], src_language: str, dest_language: str) -> list[str | None]:
+    """
+    Translate several texts with Google Translate.
+
+    Every distinct text is translated once. Translations are cached on disk by
+    (text, source language, target language), and only the texts missing from the cache
+    are sent to Google Translate, concurrently.
+
+    Parameters:
+    - texts: The texts to translate.
+    - src_language: The language of the texts (e.g., "de").
+    - dest_language: The language to translate into (e.g., "en").
+
+    Returns:
+    - The translations in the order of `texts`, None where the translation failed.
+    """
+    keys = {
+        text: translation_cache.make_key("google", src_language.lower(), dest_language.lower(), text)
+        for text in dict.fromkeys(texts)
+    }
+    translations: dict[str, str | None] = {}
+    missing_texts = []
+    for text, key in keys.items():
+        cached = translation_cache.get(key) if text.strip() else text
+        if cached is not None:
+            translations[text] = cached
+        else:
+            missing_texts.append(text)
+
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_TRANSLATIONS)
+
+    async def translate_one(text: str) -> str | None:
+        try:
+            async with semaphore:
+                result = await client_registry.translator().translate(text, src=src_language, dest=dest_language)
+        except Exception as e:
+            # one failed text must not fail the whole batch
+            print(f"Warning: Translating {text!r} failed: {e}")
+            return None
         return result.text
 
+    results = await asyncio.gather(*(translate_one(text) for text in missing_texts))
+    for text, translated in zip(missing_texts, results):
+        translations[text] = translated
+        if translated is not None:
+            translation_cache.set(keys[text], translated)
+    return [translations[text] for text in texts]
+
+
+async def translate_text(text: str, src_language: str, dest_language: str, add_to_word_list: bool = False, speak_translated: bool = False) -> str:
+    translated = (await translate_many([text], src_language, dest_language))[0]
+    # return error message if translation failed
+    if translated is None:
+        return "Translation failed."
+    if speak_translated:
+        from create_text_and_voice import create_voice_from_text
+        await asyncio.to_thread(create_voice_from_text, translated, language=dest_language)
+    if add_to_word_list:
+        language_1 = google_trans_language_to_file_language_dict.get(src_language)
+        language_2 = google_trans_language_to_file_language_dict.get(dest_language)
+        await asyncio.to_thread(add_word_pair_to_word_list, text, translated, language_1, language_2)
+    return translated
+
 
 
 def show_multiple_translations(
@@ -56,7 +113,27 @@ def show_multiple_translations(
     Returns:
     - A list of translations for the given word.
     """
-    
+    return run_sync(show_multiple_translations_async(
+        word,
+        src_language,
+        dest_language,
+        LLama_params,
+        max_num_translations=max_num_translations,
+        google_translation=google_translation,
+        cloud_models_only=cloud_models_only,
+    ))
+
+
+async def show_multiple_translations_async(
+    word: str,
+    src_language: str,
+    dest_language: str,
+    LLama_params: Llama_params | None,
+    max_num_translations: int = 5,
+    google_translation: str | None = None,
+    cloud_models_only: bool = False,
+) -> list[str]:
+    """Same as `show_multiple_translations`, but does not block the event loop."""
     prompt = f"""
         Provide a list of at most {max_num_translations} different translations for the word "{word}" from {src_language} to {dest_language}. 
         The translations should be common and widely used. 
@@ -67,7 +144,7 @@ def show_multiple_translations(
         prompt += f" The Google Translate translation for this word is: {google_translation}. Use it as the first word you return."
 
     if cloud_models_only:
-        response = respond_with_gemini(
+        response = await respond_with_gemini_async(
             prompt,
             model="gemini-flash-latest",
             temperature=0.1,
@@ -76,7 +153,7 @@ def show_multiple_translations(
     else:
         if LLama_params is None:
             return []
-        response = respond_to_prompt(
+        response = await respond_to_prompt_async(
             prompt,
             LLama_params,
             temperature=0.1,
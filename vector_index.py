@@ -0,0 +1,327 @@
+import json
+import math
+import os
+import threading
+from collections import Counter
+import numpy as np
+import pandas as pd
+from async_utils import run_sync
+from llm_utils.embeddings import EmbeddingModel, embed_texts
+from word_list_store import word_list_store
+
+# rebuild the index when this share of its texts is no longer in the word list, or when it
+# has grown this many times beyond the size its centroids were trained on
+MAX_STALE_SHARE = 0.25
+MAX_GROWTH_SINCE_TRAINING = 4.0
+
+
+def _spherical_kmeans(vectors: np.ndarray, num_lists: int, rng: np.random.Generator, iterations: int = 10) -> np.ndarray:
+    centroids = vectors[rng.choice(len(vectors), num_lists, replace=False)].copy()
+    for _ in range(iterations):
+        assignments = np.argmax(vectors @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, vectors)
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        # empty lists keep their old centroid
+        centroids = np.where(norms > 0, sums / np.where(norms > 0, norms, 1.0), centroids)
+    return centroids.astype(np.float32)
+
+
+class VectorIndex:
+    """Approximate nearest neighbour index of normalized vectors (IVF).
+
+    The vectors are assigned to the closest of `num_lists` centroids, found with k-means. A search
+    only scores the vectors of the `num_probe` lists whose centroids are closest to the query,
+    so it reads about num_probe / num_lists of the index instead of all of it.
+
+    An index lives in one directory: the vectors and their list numbers are raw arrays that are
+    appended to and memory-mapped, the texts are one JSON line each, and `meta.json` holds the
+    number of valid entries. `meta.json` is replaced last, so entries of an interrupted `add`
+    are ignored when the index is loaded again.
+    """
+
+    def __init__(self, directory: str, model: str, centroids: np.ndarray, trained_count: int):
+        self.directory = directory
+        self.model = model
+        self.centroids = centroids
+        self.dimensions = centroids.shape[1]
+        self.trained_count = trained_count
+        self.texts: list[str] = []
+        self._texts_size = 0
+        self._vectors: np.ndarray = np.zeros((0, self.dimensions), dtype=np.float32)
+        self._lists: list[np.ndarray] = [np.zeros(0, dtype=np.int64) for _ in range(len(centroids))]
+
+    @property
+    def num_lists(self) -> int:
+        return len(self.centroids)
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _write_meta(self) -> None:
+        meta = {
+            "model": self.model,
+            "count": len(self.texts),
+            "texts_size": self._texts_size,
+            "dimensions": self.dimensions,
+            "trained_count": self.trained_count,
+        }
+        temporary_path = self._path("meta.json.tmp")
+        with open(temporary_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(temporary_path, self._path("meta.json"))
+
+    def _map_vectors(self) -> None:
+        count = len(self.texts)
+        if count == 0:
+            self._vectors = np.zeros((0, self.dimensions), dtype=np.float32)
+        else:
+            self._vectors = np.memmap(self._path("vectors.f32"), dtype=np.float32, mode="r", shape=(count, self.dimensions))
+
+    def _assign(self, vectors: np.ndarray) -> np.ndarray:
+        assignments = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), 8192):
+            assignments[start:start + 8192] = np.argmax(vectors[start:start + 8192] @ self.centroids.T, axis=1)
+        return assignments
+
+    def _set_lists(self, assignments: np.ndarray) -> None:
+        order = np.argsort(assignments, kind="stable")
+        boundaries = np.cumsum(np.bincount(assignments, minlength=self.num_lists))[:-1]
+        self._lists = np.split(order.astype(np.int64), boundaries)
+
+    @classmethod
+    def build(cls, directory: str, model: str, texts: list[str], vectors: np.ndarray, num_lists: int | None = None, seed: int = 0) -> "VectorIndex":
+        """
+        Build a new index from normalized vectors, replacing the index in the directory.
+
+        Parameters:
+        - directory: Where the index is stored.
+        - model: The name of the embedding model, an index is only used with its own model.
+        - texts: The text of every vector.
+        - vectors: Array of shape (len(texts), dimensions) with unit-length rows.
+        - num_lists: The number of inverted lists. Default: about the square root of the number of vectors.
+        """
+        os.makedirs(directory, exist_ok=True)
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        rng = np.random.default_rng(seed)
+        num_lists = num_lists or max(1, int(math.sqrt(len(vectors))))
+        num_lists = max(1, min(num_lists, len(vectors)))
+        if len(vectors) == 0:
+            index = cls(directory, model, np.zeros((1, 0), dtype=np.float32), 0)
+        else:
+            # train on a sample, assigning all vectors is cheap compared to the iterations
+            sample = vectors[rng.choice(len(vectors), min(len(vectors), 64 * num_lists), replace=False)]
+            index = cls(directory, model, _spherical_kmeans(sample, num_lists, rng), len(vectors))
+        assignments = index._assign(vectors) if len(vectors) else np.zeros(0, dtype=np.int32)
+        vectors.tofile(index._path("vectors.f32"))
+        assignments.tofile(index._path("lists.i32"))
+        with open(index._path("texts.jsonl"), "wb") as f:
+            f.writelines((json.dumps(text, ensure_ascii=False) + "\n").encode("utf-8") for text in texts)
+            index._texts_size = f.tell()
+        np.save(index._path("centroids.npy"), index.centroids)
+        index.texts = list(texts)
+        index._write_meta()
+        index._set_lists(assignments)
+        index._map_vectors()
+        return index
+
+    @classmethod
+    def load(cls, directory: str) -> "VectorIndex | None":
+        """Load the index stored in the directory, or return None if there is none."""
+        try:
+            with open(os.path.join(directory, "meta.json"), encoding="utf-8") as f:
+                meta = json.load(f)
+            centroids = np.load(os.path.join(directory, "centroids.npy"))
+            index = cls(directory, meta["model"], centroids, meta["trained_count"])
+            count = meta["count"]
+            index._texts_size = meta["texts_size"]
+            with open(index._path("texts.jsonl"), encoding="utf-8") as f:
+                index.texts = [json.loads(line) for _, line in zip(range(count), f)]
+            assignments = np.fromfile(index._path("lists.i32"), dtype=np.int32, count=count)
+        except (OSError, ValueError, KeyError) as e:
+            if os.path.exists(directory):
+                print(f"Warning: Loading the vector index in {directory} failed, it is rebuilt: {e}")
+            return None
+        if len(index.texts) != count or len(assignments) != count:
+            return None
+        index._set_lists(assignments)
+        index._map_vectors()
+        return index
+
+    def add(self, texts: list[str], vectors: np.ndarray) -> None:
+        """Add normalized vectors to the index without retraining the centroids."""
+        if not texts:
+            return
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        count = len(self.texts)
+        assignments = self._assign(vectors)
+        # drop entries of an interrupted earlier add before appending
+        for name, size, data in (
+            ("vectors.f32", 4 * self.dimensions * count, vectors.tobytes()),
+            ("lists.i32", 4 * count, assignments.tobytes()),
+            ("texts.jsonl", self._texts_size, "".join(json.dumps(text, ensure_ascii=False) + "\n" for text in texts).encode("utf-8")),
+        ):
+            with open(self._path(name), "r+b") as f:
+                f.truncate(size)
+                f.seek(size)
+                f.write(data)
+                if name == "texts.jsonl":
+                    self._texts_size = f.tell()
+        self.texts.extend(texts)
+        self._write_meta()
+        for list_number in np.unique(assignments):
+            new_positions = count + np.flatnonzero(assignments == list_number)
+            self._lists[list_number] = np.concatenate([self._lists[list_number], new_positions])
+        self._map_vectors()
+
+    def search(self, query: np.ndarray, k: int = 10, num_probe: int | None = None) -> list[tuple[int, float]]:
+        """
+        Find the vectors with the highest cosine similarity to a normalized query vector.
+
+        Parameters:
+        - query: The query vector.
+        - k: The number of results.
+        - num_probe: The number of inverted lists to search. Default: about 10% of them, at least 8. Use `num_lists` for an exact search.
+
+        Returns:
+        - (position, similarity) pairs, most similar first. `texts[position]` is the text of a result.
+        """
+        if len(self.texts) == 0 or k <= 0:
+            return []
+        query = np.asarray(query, dtype=np.float32)
+        num_probe = min(num_probe or max(8, self.num_lists // 10), self.num_lists)
+        if num_probe >= self.num_lists:
+            positions = np.arange(len(self.texts))
+            similarities = np.asarray(self._vectors @ query)
+        else:
+            probed = np.argpartition(-(self.centroids @ query), num_probe - 1)[:num_probe]
+            # sorted positions read the memory-mapped vectors front to back
+            positions = np.sort(np.concatenate([self._lists[i] for i in probed]))
+            if len(positions) == 0:
+                return []
+            similarities = np.asarray(self._vectors[positions] @ query)
+        k = min(k, len(positions))
+        best = np.argpartition(-similarities, k - 1)[:k]
+        best = best[np.argsort(-similarities[best])]
+        return [(int(positions[i]), float(similarities[i])) for i in best]
+
+
+class VectorIndexRegistry:
+    """The vector indexes of the word lists, one per word list and language column.
+
+    An index is built on first use from the embeddings of all words in the column (see
+    `embed_texts`, which caches them), stored under `.vector_index` next to the word lists,
+    and kept up to date incrementally: words added with `file_utils.add_word_pair_to_word_list`
+    are added right away, other changes are picked up on the next search.
+    """
+
+    def __init__(self):
+        self._indexes: dict[tuple[str, str], VectorIndex] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _directory(word_list_path: str, column: str) -> str:
+        return os.path.join(os.path.dirname(word_list_path), ".vector_index", f"{os.path.basename(word_list_path)}.{column}")
+
+    def _sync(self, word_list_path: str, column: str, words: pd.DataFrame, embedding_model: EmbeddingModel) -> VectorIndex:
+        key = (os.path.abspath(word_list_path), column)
+        texts = list(dict.fromkeys(words[column].dropna().astype(str)))
+        index = self._indexes.get(key) or VectorIndex.load(self._directory(word_list_path, column))
+        if index is not None and len(index) > 0 and index.model == embedding_model.name:
+            current = set(texts)
+            indexed = set(index.texts)
+            num_stale = sum(1 for text in index.texts if text not in current)
+            missing = [text for text in texts if text not in indexed]
+            if num_stale <= MAX_STALE_SHARE * max(len(index), 1) and len(index) + len(missing) <= MAX_GROWTH_SINCE_TRAINING * max(index.trained_count, 1):
+                if missing:
+                    index.add(missing, run_sync(embed_texts(missing, embedding_model)))
+                self._indexes[key] = index
+                return index
+        vectors = run_sync(embed_texts(texts, embedding_model)) if texts else np.zeros((0, 0), dtype=np.float32)
+        index = VectorIndex.build(self._directory(word_list_path, column), embedding_model.name, texts, vectors)
+        self._indexes[key] = index
+        return index
+
+    def get(self, word_list_path: str, column: str, embedding_model: EmbeddingModel) -> VectorIndex:
+        """Return the up-to-date index of a column of a word list, building or updating it if needed."""
+        with self._lock:
+            # runs again only after the word list changed
+            return word_list_store.derived(
+                word_list_path,
+                f"vector_index:{column}:{embedding_model.name}",
+                lambda words: self._sync(word_list_path, column, words, embedding_model),
+            )
+
+    def add_words(self, word_list_path: str, values: dict[str, str], embedding_model: EmbeddingModel | None) -> None:
+        """Add the words of a new row to the existing indexes of the word list."""
+        if embedding_model is None:
+            return
+        with self._lock:
+            for column, text in values.items():
+                key = (os.path.abspath(word_list_path), column)
+                index = self._indexes.get(key) or VectorIndex.load(self._directory(word_list_path, column))
+                if index is None or len(index) == 0 or index.model != embedding_model.name or text in index.texts:
+                    continue
+                try:
+                    index.add([text], run_sync(embed_texts([text], embedding_model)))
+                except Exception as e:
+                    print(f"Warning: Adding '{text}' to the vector index failed: {e}")
+                    continue
+                self._indexes[key] = index
+
+    def similar_words(
+        self,
+        word_list_path: str,
+        column: str,
+        text: str,
+        embedding_model: EmbeddingModel,
+        k: int = 10,
+        num_probe: int | None = None,
+    ) -> pd.DataFrame:
+        """
+        Find the rows of a word list whose word in `column` is most similar to a text.
+
+        Parameters:
+        - word_list_path: The path to the word list file.
+        - column: The column to search (e.g. "German").
+        - text: The text to search for.
+        - embedding_model: The embedding model of the index.
+        - k: The number of distinct words to return.
+        - num_probe: See `VectorIndex.search`.
+
+        Returns:
+        - The matching rows with an additional "similarity" column, most similar first.
+        """
+        index = self.get(word_list_path, column, embedding_model)
+        words = word_list_store.read(word_list_path)
+        query = run_sync(embed_texts([text], embedding_model))[0]
+        present = set(words[column].dropna().astype(str))
+        # ask for more results, removed words may still be in the index
+        results = [(index.texts[p], s) for p, s in index.search(query, k=2 * k + 5, num_probe=num_probe) if index.texts[p] in present][:k]
+        similarity_by_text = dict(results)
+        matched = words[words[column].astype(str).isin(similarity_by_text)]
+        matched = matched.assign(similarity=matched[column].astype(str).map(similarity_by_text))
+        return matched.sort_values("similarity", ascending=False, kind="stable")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._indexes.clear()
+
+
+def suggest_tags_from_neighbours(similar_rows: pd.DataFrame, max_tags: int = 3) -> list[str]:
+    """Return the tags that occur most often among similar rows (see `VectorIndexRegistry.similar_words`)."""
+    if "tags" not in similar_rows.columns:
+        return []
+    counts = Counter(
+        tag.strip()
+        for tags in similar_rows["tags"].dropna().astype(str)
+        for tag in tags.split(";")
+        if tag.strip()
+    )
+    return [tag for tag, _ in counts.most_common(max_tags)]
+
+
+vector_indexes = VectorIndexRegistry()
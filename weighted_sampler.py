@@ -0,0 +1,165 @@
+import heapq
+import random
+from typing import Hashable, Iterable
+
+
+class WeightedSampler:
+    """Weighted random sampling over row ids with removal and cooldown.
+
+    The weights are kept in a Fenwick tree (binary indexed tree), so sampling, changing a
+    weight, removing an id and putting it back are O(log n), without copying the word list.
+    An id can be put on cooldown: it is removed now and comes back after a number of turns
+    (calls to `advance`), which is how recently used words are kept out of a practice session.
+    """
+
+    def __init__(self, ids: Iterable[Hashable], weights: Iterable[float] | None = None, rng: random.Random | None = None):
+        self._ids = list(ids)
+        self._positions = {row_id: position for position, row_id in enumerate(self._ids)}
+        num_ids = len(self._ids)
+        self._weights = [1.0] * num_ids if weights is None else [float(w) for w in weights]
+        if len(self._weights) != num_ids:
+            raise ValueError("ids and weights must have the same length")
+        if any(w < 0 for w in self._weights):
+            raise ValueError("weights must not be negative")
+        self._active = [True] * num_ids
+        self._num_active = num_ids
+        self._discarded: set[int] = set()
+        # position -> turn at which its cooldown ends, and a heap of (turn, position)
+        self._cooldown_until: dict[int, int] = {}
+        self._cooling: list[tuple[int, int]] = []
+        self._turn = 0
+        self._rng = rng or random.Random()
+        self._build()
+
+    def _build(self) -> None:
+        num_ids = len(self._ids)
+        tree = [0.0] * (num_ids + 1)
+        for position in range(num_ids):
+            if self._active[position]:
+                tree[position + 1] = self._weights[position]
+        for i in range(1, num_ids + 1):
+            parent = i + (i & -i)
+            if parent <= num_ids:
+                tree[parent] += tree[i]
+        self._tree = tree
+
+    def _add(self, position: int, delta: float) -> None:
+        i = position + 1
+        while i < len(self._tree):
+            self._tree[i] += delta
+            i += i & -i
+
+    def _total(self) -> float:
+        total = 0.0
+        i = len(self._tree) - 1
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    def _find(self, target: float) -> int:
+        # smallest position whose prefix sum exceeds target
+        position = 0
+        step = 1 << (len(self._tree) - 1).bit_length()
+        while step:
+            next_position = position + step
+            if next_position < len(self._tree) and self._tree[next_position] <= target:
+                position = next_position
+                target -= self._tree[next_position]
+            step >>= 1
+        return position
+
+    def _set_active(self, position: int, active: bool) -> None:
+        if self._active[position] == active:
+            return
+        self._active[position] = active
+        self._num_active += 1 if active else -1
+        self._add(position, self._weights[position] if active else -self._weights[position])
+
+    def __len__(self) -> int:
+        """Return the number of ids that can currently be sampled."""
+        return self._num_active
+
+    def __contains__(self, row_id: Hashable) -> bool:
+        """Return True if the id is part of the sampler and was not discarded (it may be removed or cooling down)."""
+        position = self._positions.get(row_id)
+        return position is not None and position not in self._discarded
+
+    def sample(self) -> Hashable | None:
+        """Draw an id with probability proportional to its weight, or None if no id can be sampled."""
+        for _ in range(2):
+            total = self._total()
+            if self._num_active == 0 or total <= 0:
+                return None
+            position = min(self._find(self._rng.random() * total), len(self._ids) - 1)
+            if self._active[position] and self._weights[position] > 0:
+                return self._ids[position]
+            # rounding errors accumulated over many updates, start from exact sums again
+            self._build()
+        return None
+
+    def set_weight(self, row_id: Hashable, weight: float) -> None:
+        """Change the weight of an id."""
+        if weight < 0:
+            raise ValueError("weights must not be negative")
+        position = self._positions[row_id]
+        if self._active[position]:
+            self._add(position, weight - self._weights[position])
+        self._weights[position] = weight
+
+    def remove(self, row_id: Hashable) -> None:
+        """Stop sampling an id until it is restored. This also cancels a running cooldown."""
+        position = self._positions[row_id]
+        self._cooldown_until.pop(position, None)
+        self._set_active(position, False)
+
+    def restore(self, row_id: Hashable) -> None:
+        """Sample a removed id again. Discarded ids stay removed."""
+        position = self._positions[row_id]
+        self._cooldown_until.pop(position, None)
+        if position not in self._discarded:
+            self._set_active(position, True)
+
+    def discard(self, row_id: Hashable) -> None:
+        """Remove an id for good, also if it is cooling down."""
+        position = self._positions[row_id]
+        self._discarded.add(position)
+        self._cooldown_until.pop(position, None)
+        self._set_active(position, False)
+
+    def cooldown(self, row_id: Hashable, turns: int) -> None:
+        """Remove an id and restore it after `turns` calls to `advance`."""
+        if turns <= 0:
+            self.restore(row_id)
+            return
+        self.remove(row_id)
+        position = self._positions[row_id]
+        until = self._turn + turns
+        self._cooldown_until[position] = until
+        heapq.heappush(self._cooling, (until, position))
+
+    def _pop_cooling(self) -> int | None:
+        while self._cooling:
+            until, position = heapq.heappop(self._cooling)
+            # skip entries of cooldowns that were cancelled or replaced
+            if self._cooldown_until.get(position) == until:
+                del self._cooldown_until[position]
+                return position
+        return None
+
+    def advance(self) -> None:
+        """Count one turn and restore the ids whose cooldown is over."""
+        self._turn += 1
+        while self._cooling and self._cooling[0][0] <= self._turn:
+            until, position = heapq.heappop(self._cooling)
+            if self._cooldown_until.get(position) == until:
+                del self._cooldown_until[position]
+                self._set_active(position, True)
+
+    def release_next(self) -> bool:
+        """End the cooldown of the id that would come back first. Returns False if no id is cooling down."""
+        position = self._pop_cooling()
+        if position is None:
+            return False
+        self._set_active(position, True)
+        return True
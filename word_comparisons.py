@@ -1,5 +1,142 @@
-from llm_utils.ollama_utils import Llama_params, respond_to_prompt
-from llm_utils.llm_api_utils import respond_with_gemini_fast
+import re
+import unicodedata
+from llm_utils.ollama_utils import Llama_params, respond_to_prompt_async
+from llm_utils.llm_api_utils import respond_with_gemini_fast_async
+from llm_utils.embeddings import EmbeddingModel, cosine_similarity, embedding_model_from_env
+from async_utils import run_sync
+
+# leading words that may be left out of an answer, e.g. "to" before English verbs
+ARTICLES = {
+    "english": {"to", "the", "a", "an"},
+    "german": {"der", "die", "das", "den", "dem", "des", "ein", "eine", "einen", "einem", "einer", "sich"},
+    "spanish": {"el", "la", "los", "las", "un", "una", "unos", "unas", "se"},
+    "french": {"le", "la", "les", "l", "un", "une", "des", "se", "s"},
+    "italian": {"il", "lo", "la", "i", "gli", "le", "l", "un", "uno", "una", "si"},
+    "portuguese": {"o", "a", "os", "as", "um", "uma", "se"},
+}
+_ALL_ARTICLES = set().union(*ARTICLES.values())
+# answers are split into alternatives only if every part is this short, sentences keep their commas
+MAX_WORDS_PER_ALTERNATIVE = 3
+_ALTERNATIVE_SEPARATORS = re.compile(r"[,;/]")
+
+
+class _FoldTable(dict):
+    # str.translate table that drops combining accents and turns punctuation and symbols into spaces,
+    # filled lazily per character
+    def __missing__(self, codepoint: int) -> str | None:
+        char = chr(codepoint)
+        if unicodedata.combining(char):
+            value = None
+        elif unicodedata.category(char)[0] in "PS":
+            value = " "
+        else:
+            value = char
+        self[codepoint] = value
+        return value
+
+
+_FOLD_TABLE = _FoldTable()
+
+
+def fold_answer(text: str) -> str:
+    """Normalize an answer for comparison: case, accents, punctuation and whitespace are ignored."""
+    return " ".join(unicodedata.normalize("NFKD", str(text).casefold()).translate(_FOLD_TABLE).split())
+
+
+def damerau_levenshtein(a: str, b: str, max_distance: int) -> int:
+    """Return the optimal string alignment distance of a and b, or max_distance + 1 if it is larger."""
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    if a == b:
+        return 0
+    previous_previous: list[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (a[i - 1] != b[j - 1]))
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, previous_previous[j - 2] + 1)
+            current[j] = value
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous_previous, previous = previous, current
+    return min(previous[-1], max_distance + 1)
+
+
+def _allowed_typos(length: int, be_stringent: bool) -> int:
+    allowed = 0 if length <= 4 else 1 if length <= 8 else 2
+    return min(allowed, 1) if be_stringent else allowed
+
+
+def _split_article(text: str, articles: set[str]) -> tuple[str, str]:
+    tokens = text.split()
+    i = 0
+    while i < len(tokens) - 1 and tokens[i] in articles:
+        i += 1
+    return " ".join(tokens[:i]), " ".join(tokens[i:])
+
+
+def _alternatives(text: str) -> list[str]:
+    if str(text).strip().endswith((".", "!", "?")):
+        return []
+    parts = [fold_answer(part) for part in _ALTERNATIVE_SEPARATORS.split(str(text))]
+    parts = [part for part in parts if part]
+    if len(parts) > 1 and all(len(part.split()) <= MAX_WORDS_PER_ALTERNATIVE for part in parts):
+        return parts
+    return []
+
+
+def _matches(answer: str, correct: str, articles: set[str], be_stringent: bool, allow_typos: bool) -> bool:
+    if answer == correct:
+        return True
+    answer_article, answer_rest = _split_article(answer, articles)
+    correct_article, correct_rest = _split_article(correct, articles)
+    if answer_article and correct_article and answer_article != correct_article:
+        # a wrong article may or may not matter, e.g. "der See" and "die See"
+        return False
+    allowed = _allowed_typos(len(correct_rest), be_stringent) if allow_typos else 0
+    return damerau_levenshtein(answer_rest, correct_rest, allowed) <= allowed
+
+
+def match_answer_locally(
+    answer: str,
+    correct_answer: str,
+    language: str | None = None,
+    be_stringent: bool = False,
+    allow_typos: bool = False,
+) -> bool | None:
+    """
+    Decide whether an answer is correct without a model, if that is possible.
+
+    The answer is accepted if it matches the correct answer or one of its comma or semicolon
+    separated alternatives, ignoring case, accents and punctuation, a missing leading article
+    or particle (like "to" or "der") and, with `allow_typos`, small typos (see `damerau_levenshtein`).
+    Typos are not allowed by default because a typo often makes another real word, e.g. "horse"
+    for "house" or "Kirche" for "Kirsche"; such answers are left to the model.
+
+    Parameters:
+    - answer: The answer of the learner.
+    - correct_answer: The expected answer.
+    - language: The language of the answers, selects the articles that may be left out. If None, the articles of all languages are used.
+    - be_stringent: Allow at most one typo.
+    - allow_typos: Accept answers with small typos. Only use this if no model can decide.
+
+    Returns:
+    - True if the answer is correct, False if it is too short to be correct, and None if a model has to decide.
+    """
+    articles = ARTICLES.get(language.lower(), _ALL_ARTICLES) if language else _ALL_ARTICLES
+    folded_answer = fold_answer(answer)
+    folded_correct = fold_answer(correct_answer)
+    correct_alternatives = [folded_correct] + _alternatives(correct_answer)
+    answer_alternatives = _alternatives(answer) or [folded_answer]
+    if any(_matches(folded_answer, correct, articles, be_stringent, allow_typos) for correct in correct_alternatives):
+        return True
+    if all(any(_matches(alternative, correct, articles, be_stringent, allow_typos) for correct in correct_alternatives) for alternative in answer_alternatives):
+        return True
+    if len(folded_answer) < 2:
+        return False
+    return None
 
 
 def check_equality(
@@ -9,8 +146,16 @@ def check_equality(
     be_stringent: bool = False,
     word_to_pay_attention_to: str | None = None,
     cloud_models_only: bool = False,
+    language: str | None = None,
+    embedding_model: EmbeddingModel | None = None,
 ) -> bool:
-    """Check if two words are exactly the same.
+    """Check if two words are the same.
+
+    Answers that `match_answer_locally` can decide (exact matches, missing articles, listed
+    alternatives) are decided without a model. Small typos are accepted locally only if no
+    model is given, since they may turn the answer into another word. With an embedding model, answers
+    whose embedding is very similar to the correct one are accepted and very dissimilar ones are
+    rejected. Only the uncertain rest is sent to the generative model.
 
     Args:
         word1 (str): The first word to compare.
@@ -18,55 +163,102 @@ def check_equality(
         llama_params (Llama_params, optional): Parameters for the Llama model. If provided, it will be used to check the equality of the words using a language model. Defaults to None.
         be_stringent (bool, optional): If True, the comparison is more strict. Defaults to False.
         word_to_pay_attention_to (str, optional): If provided, the model will pay special attention to this word when comparing. Defaults to None.
+        language (str, optional): The language of the words, used to ignore missing articles. Defaults to None (articles of all languages).
+        embedding_model (EmbeddingModel, optional): Model for the embedding tier. Defaults to None (the model set in EMBEDDING_MODEL, if any).
 
     Returns:
         bool: True if the words are identical, False otherwise.
     """
-    word1 = word1.strip().lower().replace("!", "").replace(".", "").replace(",", "").replace("?", "").replace("¿", "").replace("í", "i").replace("á", "a").replace("é", "e").replace("ó", "o").replace("ú", "u")
-    word2 = word2.strip().lower().replace("!", "").replace(".", "").replace(",", "").replace("?", "").replace("¿", "").replace("í", "i").replace("á", "a").replace("é", "e").replace("ó", "o").replace("ú", "u")
-    if word1 == word2:
+    return run_sync(check_equality_async(
+        word1,
+        word2,
+        llama_params=llama_params,
+        be_stringent=be_stringent,
+        word_to_pay_attention_to=word_to_pay_attention_to,
+        cloud_models_only=cloud_models_only,
+        language=language,
+        embedding_model=embedding_model,
+    ))
+
+
+async def _decide_by_embedding(word1: str, word2: str, embedding_model: EmbeddingModel, be_stringent: bool) -> bool | None:
+    try:
+        similarity = await cosine_similarity(fold_answer(word1), fold_answer(word2), embedding_model)
+    except Exception as e:
+        print(f"Warning: Embedding the answers failed: {e}")
+        return None
+    if similarity >= embedding_model.accept_similarity and not be_stringent:
         return True
+    if embedding_model.reject_similarity is not None and similarity <= embedding_model.reject_similarity:
+        return False
+    return None
+
+
+async def check_equality_async(
+    word1: str,
+    word2: str,
+    llama_params: Llama_params | None = None,
+    be_stringent: bool = False,
+    word_to_pay_attention_to: str | None = None,
+    cloud_models_only: bool = False,
+    language: str | None = None,
+    embedding_model: EmbeddingModel | None = None,
+) -> bool:
+    """Same as `check_equality`, but does not block the event loop."""
+    decision = match_answer_locally(
+        word1,
+        word2,
+        language=language,
+        be_stringent=be_stringent,
+        allow_typos=not llama_params and not cloud_models_only,
+    )
+    if decision is not None:
+        return decision
+
+    embedding_model = embedding_model or embedding_model_from_env()
+    if embedding_model is not None:
+        decision = await _decide_by_embedding(word1, word2, embedding_model, be_stringent)
+        if decision is not None:
+            return decision
+
+    if not llama_params and not cloud_models_only:
+        return False
     
+    word1 = fold_answer(word1)
+    word2 = fold_answer(word2)
+    prompt = f"""
+        Classify the relationship between the following expressions.
+
+        Expression A: "{word1}"
+        Expression B: "{word2}"
+
+        Label:
+        - SAME → meanings are equivalent in everyday usage
+        - DIFFERENT → meanings are not equivalent in everyday usage
+
+        It is important that they must mean the same thing, not just be similar. But do not consider minor differences such as plural/singular, verb conjugations, or small spelling mistakes. Focus on the core meaning of the words.
+        Answer with ONLY: SAME or DIFFERENT
+        """
+
+    # {f"Pay special attention to whether the word '{word_to_pay_attention_to}' is at least reasonably represented in both expressions." if word_to_pay_attention_to else ""}
+    if be_stringent:
+        prompt += " Be stringent in your classification."
+
+    if cloud_models_only:
+        response = await respond_with_gemini_fast_async(prompt, temperature=0.01, max_tokens=20)
     else:
-        if not llama_params and not cloud_models_only:
-            return False
-        
-        if len(word1) < 2:
-            return False
-        
-        prompt = f"""
-            Classify the relationship between the following expressions.
-
-            Expression A: "{word1}"
-            Expression B: "{word2}"
-
-            Label:
-            - SAME → meanings are equivalent in everyday usage
-            - DIFFERENT → meanings are not equivalent in everyday usage
-
-            It is important that they must mean the same thing, not just be similar. But do not consider minor differences such as plural/singular, verb conjugations, or small spelling mistakes. Focus on the core meaning of the words.
-            Answer with ONLY: SAME or DIFFERENT
-            """
-
-        # {f"Pay special attention to whether the word '{word_to_pay_attention_to}' is at least reasonably represented in both expressions." if word_to_pay_attention_to else ""}
-        if be_stringent:
-            prompt += " Be stringent in your classification."
-
-        if cloud_models_only:
-            response = respond_with_gemini_fast(prompt, temperature=0.01, max_tokens=20)
-        else:
-            response = respond_to_prompt(
-                prompt,
-                llama_params,
-                temperature=0.01,
-                max_tokens=100,
-                #stop_phrases=["SAME", "DIFFERENT", "same", "different"]
-            )
-        response = response.strip().lower()
-        if "different" in response:
-            return False
-        elif "same" in response:
-            return True
-        else:
-            print(f"Warning: Unexpected response from model: {response}")
-            return False
+        response = await respond_to_prompt_async(
+            prompt,
+            llama_params,
+            temperature=0.01,
+            max_tokens=100,
+            #stop_phrases=["SAME", "DIFFERENT", "same", "different"]
+        )
+    response = response.strip().lower()
+    if "different" in response:
+        return False
+    elif "same" in response:
+        return True
+    else:
+        print(f"Warning: Unexpected response from model: {response}")
+        return False
@@ -0,0 +1,515 @@
+import json
+import os
+import sqlite3
+import threading
+import numpy as np
+import pandas as pd
+from word_list_journal import read_metadata, row_matches, with_row_id_column, write_metadata
+from word_pair_index import normalize_word
+from word_list_lock import atomic_write_csv
+
+# word list columns with their own database column; the first two columns of a list are its words
+_STORED_COLUMNS = ("date_added", "tags")
+
+
+def _to_text(value) -> str | None:
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    return str(value)
+
+
+def _to_timestamps(values: list[str | None]) -> list[float | None]:
+    # parsed in one go like `word_list_sidecar.parse_dates_added`, which is much faster than row by row
+    dates = pd.to_datetime(pd.Series(values, dtype=object), errors="coerce")
+    return [None if pd.isna(date) else date.timestamp() for date in dates]
+
+
+def _tag_keys(tags: str | None) -> list[str]:
+    if tags is None:
+        return []
+    return list(dict.fromkeys(tag.strip().lower() for tag in tags.split(";") if tag.strip()))
+
+
+class WordListDatabase:
+    """Word lists stored in one SQLite database instead of CSV files.
+
+    All lists share the `words` table; the first two columns of a list (the words) and
+    `date_added` and `tags` have their own database columns, other columns are kept as JSON.
+    Every row keeps the row id it has in `word_list_store` (unique per list, and never given
+    out again after the row was deleted); the rows are ordered by the order in which they were inserted.
+    `date_added` is also stored as a timestamp with an index, tags are normalized into a join
+    table (matched like `tag_index`: exactly, ignoring case), and an FTS5 trigram index over both
+    words answers substring searches. The database runs in WAL mode, so readers in other
+    processes do not wait for writers.
+
+    Every change bumps the version of its list, which `word_list_store` compares to notice
+    changes made by other processes.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.RLock()
+        self._connection: sqlite3.Connection | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA foreign_keys=ON")
+            connection.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS word_lists (
+                    id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE, columns TEXT NOT NULL, version INTEGER NOT NULL DEFAULT 0,
+                    next_row_id INTEGER NOT NULL DEFAULT 0
+                );
+                CREATE TABLE IF NOT EXISTS words (
+                    id INTEGER PRIMARY KEY,
+                    list_id INTEGER NOT NULL REFERENCES word_lists (id) ON DELETE CASCADE,
+                    row_id INTEGER,
+                    word_1 TEXT, word_2 TEXT, date_added TEXT, date_added_ts REAL, tags TEXT, extra TEXT
+                );
+                CREATE INDEX IF NOT EXISTS words_by_list ON words (list_id);
+                CREATE INDEX IF NOT EXISTS words_by_date ON words (list_id, date_added_ts);
+                CREATE INDEX IF NOT EXISTS words_by_pair ON words (list_id, word_1, word_2);
+                CREATE TABLE IF NOT EXISTS tags (id INTEGER PRIMARY KEY, key TEXT NOT NULL UNIQUE);
+                CREATE TABLE IF NOT EXISTS word_tags (
+                    tag_id INTEGER NOT NULL, word_id INTEGER NOT NULL, PRIMARY KEY (tag_id, word_id)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS word_tags_by_word ON word_tags (word_id);
+                CREATE VIRTUAL TABLE IF NOT EXISTS words_fts USING fts5 (
+                    word_1, word_2, content = 'words', content_rowid = 'id', tokenize = 'trigram'
+                );
+                CREATE TRIGGER IF NOT EXISTS words_after_insert AFTER INSERT ON words BEGIN
+                    INSERT INTO words_fts (rowid, word_1, word_2) VALUES (new.id, new.word_1, new.word_2);
+                END;
+                CREATE TRIGGER IF NOT EXISTS words_after_delete AFTER DELETE ON words BEGIN
+                    INSERT INTO words_fts (words_fts, rowid, word_1, word_2) VALUES ('delete', old.id, old.word_1, old.word_2);
+                    DELETE FROM word_tags WHERE word_id = old.id;
+                END;
+                CREATE TRIGGER IF NOT EXISTS words_after_update AFTER UPDATE OF word_1, word_2 ON words BEGIN
+                    INSERT INTO words_fts (words_fts, rowid, word_1, word_2) VALUES ('delete', old.id, old.word_1, old.word_2);
+                    INSERT INTO words_fts (rowid, word_1, word_2) VALUES (new.id, new.word_1, new.word_2);
+                END;
+                """
+            )
+            if "row_id" not in [column[1] for column in connection.execute("PRAGMA table_info(words)")]:
+                # databases created before the row ids were stored
+                connection.execute("ALTER TABLE words ADD COLUMN row_id INTEGER")
+                connection.execute("UPDATE words SET row_id = id")
+            connection.execute("CREATE UNIQUE INDEX IF NOT EXISTS words_by_row_id ON words (list_id, row_id)")
+            if "next_row_id" not in [column[1] for column in connection.execute("PRAGMA table_info(word_lists)")]:
+                # databases created before the next row id was stored
+                connection.execute("ALTER TABLE word_lists ADD COLUMN next_row_id INTEGER NOT NULL DEFAULT 0")
+                connection.execute(
+                    "UPDATE word_lists SET next_row_id = COALESCE((SELECT MAX(row_id) + 1 FROM words WHERE words.list_id = word_lists.id), 0)"
+                )
+            self._connection = connection
+        return self._connection
+
+    @staticmethod
+    def _column_sql(columns: list[str], column: str) -> tuple[str, tuple]:
+        """Return the SQL expression that reads a word list column and its parameters."""
+        if column == columns[0]:
+            return "word_1", ()
+        if column == columns[1]:
+            return "word_2", ()
+        if column in _STORED_COLUMNS:
+            return column, ()
+        return "json_extract(extra, ?)", (f'$."{column}"',)
+
+    def _list(self, connection: sqlite3.Connection, name: str) -> tuple[int, list[str]] | None:
+        row = connection.execute("SELECT id, columns FROM word_lists WHERE name = ?", (name,)).fetchone()
+        return None if row is None else (row[0], json.loads(row[1]))
+
+    def _require_list(self, connection: sqlite3.Connection, name: str) -> tuple[int, list[str]]:
+        word_list = self._list(connection, name)
+        if word_list is None:
+            raise FileNotFoundError(f"No word list named {name} in {self.path}.")
+        return word_list
+
+    def _insert_rows(self, connection: sqlite3.Connection, list_id: int, columns: list[str], rows: list[tuple[int, dict]]) -> None:
+        """Insert rows, given as (row id, values)."""
+        records = []
+        timestamps = _to_timestamps([_to_text(values.get("date_added")) for _, values in rows])
+        for (row_id, values), timestamp in zip(rows, timestamps):
+            extra = {column: _to_text(value) for column, value in values.items() if column not in columns[:2] and column not in _STORED_COLUMNS}
+            extra = {column: value for column, value in extra.items() if value is not None}
+            records.append((
+                list_id,
+                int(row_id),
+                _to_text(values.get(columns[0])),
+                _to_text(values.get(columns[1])) if len(columns) > 1 else None,
+                _to_text(values.get("date_added")),
+                timestamp,
+                _to_text(values.get("tags")),
+                json.dumps(extra, ensure_ascii=False) if extra else None,
+            ))
+        first_id = (connection.execute("SELECT COALESCE(MAX(id), 0) FROM words").fetchone()[0]) + 1
+        connection.executemany(
+            "INSERT INTO words (list_id, row_id, word_1, word_2, date_added, date_added_ts, tags, extra) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            records,
+        )
+        self._index_tags(connection, [(first_id + i, record[6]) for i, record in enumerate(records)])
+        if records:
+            self._raise_next_row_id(connection, list_id, max(record[1] for record in records) + 1)
+
+    @staticmethod
+    def _raise_next_row_id(connection: sqlite3.Connection, list_id: int, next_row_id: int) -> None:
+        connection.execute("UPDATE word_lists SET next_row_id = MAX(next_row_id, ?) WHERE id = ?", (int(next_row_id), list_id))
+
+    @staticmethod
+    def _index_tags(connection: sqlite3.Connection, word_tags: list[tuple[int, str | None]]) -> None:
+        connection.executemany("DELETE FROM word_tags WHERE word_id = ?", [(word_id,) for word_id, _ in word_tags])
+        pairs = [(key, word_id) for word_id, tags in word_tags for key in _tag_keys(tags)]
+        connection.executemany("INSERT OR IGNORE INTO tags (key) VALUES (?)", [(key,) for key in {key for key, _ in pairs}])
+        connection.executemany("INSERT OR IGNORE INTO word_tags (tag_id, word_id) SELECT id, ? FROM tags WHERE key = ?", [(word_id, key) for key, word_id in pairs])
+
+    def _add_columns(self, connection: sqlite3.Connection, list_id: int, columns: list[str], new_columns: list[str], fill: str | None) -> list[str]:
+        new_columns = [column for column in new_columns if column not in columns]
+        if not new_columns:
+            return columns
+        columns = columns + new_columns
+        connection.execute("UPDATE word_lists SET columns = ? WHERE id = ?", (json.dumps(columns, ensure_ascii=False), list_id))
+        if fill is not None:
+            for column in new_columns:
+                if column in _STORED_COLUMNS:
+                    connection.execute(f"UPDATE words SET {column} = ? WHERE list_id = ?", (fill, list_id))
+                else:
+                    connection.execute("UPDATE words SET extra = json_set(COALESCE(extra, '{}'), ?, ?) WHERE list_id = ?", (f'$."{column}"', fill, list_id))
+        return columns
+
+    @staticmethod
+    def _bump_version(connection: sqlite3.Connection, list_id: int) -> int:
+        return connection.execute("UPDATE word_lists SET version = version + 1 WHERE id = ? RETURNING version", (list_id,)).fetchone()[0]
+
+    def _add_row(self, connection: sqlite3.Connection, list_id: int, columns: list[str], values: dict, row_id: int | None) -> list[str]:
+        # like `word_list_journal.apply_record`, but the word pair is compared exactly; `word_list_store` already
+        # looks for it ignoring case before it records an add
+        exists = connection.execute(
+            "SELECT 1 FROM words WHERE list_id = ? AND word_1 = ? AND word_2 = ? LIMIT 1",
+            (list_id, _to_text(values.get(columns[0])), _to_text(values.get(columns[1]))),
+        ).fetchone()
+        if exists:
+            return columns
+        if row_id is None or connection.execute("SELECT 1 FROM words WHERE list_id = ? AND row_id = ?", (list_id, row_id)).fetchone():
+            row_id = connection.execute("SELECT next_row_id FROM word_lists WHERE id = ?", (list_id,)).fetchone()[0]
+        columns = self._add_columns(connection, list_id, columns, list(values), fill=None)
+        self._insert_rows(connection, list_id, columns, [(row_id, values)])
+        return columns
+
+    def _edit_rows(self, connection: sqlite3.Connection, list_id: int, columns: list[str], ids: list[int], values: dict) -> list[str]:
+        columns = self._add_columns(connection, list_id, columns, list(values), fill="")
+        for column, value in values.items():
+            expression, _ = self._column_sql(columns, column)
+            if expression.startswith("json_extract"):
+                connection.executemany(
+                    "UPDATE words SET extra = json_set(COALESCE(extra, '{}'), ?, ?) WHERE id = ?",
+                    [(f'$."{column}"', _to_text(value), word_id) for word_id in ids],
+                )
+                continue
+            connection.executemany(f"UPDATE words SET {expression} = ? WHERE id = ?", [(_to_text(value), word_id) for word_id in ids])
+            if column == "date_added":
+                connection.executemany("UPDATE words SET date_added_ts = ? WHERE id = ?", [(timestamp, word_id) for timestamp in _to_timestamps([_to_text(value)]) for word_id in ids])
+            elif column == "tags":
+                self._index_tags(connection, [(word_id, _to_text(value)) for word_id in ids])
+        return columns
+
+    def _apply_patch(self, connection: sqlite3.Connection, list_id: int, columns: list[str], record: dict) -> None:
+        """Apply a "patch" record (see `word_list_journal.apply_record`)."""
+        rows = sorted({change["row"] for change in record.get("update", []) + record.get("delete", [])})
+        selected = connection.execute(
+            f"SELECT id, row_id, word_1, word_2, date_added, tags, extra FROM words WHERE list_id = ? AND row_id IN ({', '.join('?' * len(rows))})",
+            (list_id, *rows),
+        ).fetchall()
+        current = self._frame(columns, [row[2:] for row in selected], [row[1] for row in selected])
+
+        for change in record.get("update", []):
+            word_id = self._patched_word_id(connection, list_id, columns, current, selected, change)
+            if word_id is not None:
+                columns = self._edit_rows(connection, list_id, columns, [word_id], change.get("values", {}))
+        deleted = {self._patched_word_id(connection, list_id, columns, current, selected, change) for change in record.get("delete", [])}
+        connection.executemany("DELETE FROM words WHERE id = ?", [(word_id,) for word_id in deleted if word_id is not None])
+        for insert in record.get("insert", []):
+            columns = self._add_row(connection, list_id, columns, insert["values"], insert["row"])
+
+    def _patched_word_id(self, connection: sqlite3.Connection, list_id: int, columns: list[str], current: pd.DataFrame, selected: list[tuple], change: dict) -> int | None:
+        before = change.get("before", {})
+        if row_matches(current, change["row"], before):
+            return next(row[0] for row in selected if row[1] == change["row"])
+        # like `word_list_journal.apply_record`, a row with the same word pair that holds the values
+        if any(before.get(column) is None for column in columns[:2]):
+            return None
+        candidates = connection.execute(
+            "SELECT id, row_id, word_1, word_2, date_added, tags, extra FROM words WHERE list_id = ? AND word_1 = ? AND word_2 = ? ORDER BY id",
+            (list_id, before[columns[0]], before[columns[1]]),
+        ).fetchall()
+        frame = self._frame(columns, [row[2:] for row in candidates], [row[1] for row in candidates])
+        return next((row[0] for row in candidates if row_matches(frame, row[1], before)), None)
+
+    def _pair_rows(self, connection: sqlite3.Connection, list_id: int, matching: list[tuple], pair: list) -> list[tuple]:
+        """Keep the rows (id, tags, word_1, word_2) that hold a word pair, or find the rows that do (see `word_list_journal.apply_record`)."""
+        key = (normalize_word(pair[0]), normalize_word(pair[1]))
+        held = [row for row in matching if (normalize_word(row[2]), normalize_word(row[3])) == key]
+        if held:
+            return held
+        rows = connection.execute("SELECT id, tags, word_1, word_2 FROM words WHERE list_id = ? ORDER BY id", (list_id,))
+        return [row for row in rows if (normalize_word(row[2]), normalize_word(row[3])) == key]
+
+    def names(self) -> list[str]:
+        """Return the names of all word lists (e.g. "german_english"), sorted."""
+        with self._lock:
+            return [row[0] for row in self._connect().execute("SELECT name FROM word_lists ORDER BY name")]
+
+    def version(self, name: str) -> int | None:
+        """Return the version of a word list, or None if there is no list with that name."""
+        with self._lock:
+            row = self._connect().execute("SELECT version FROM word_lists WHERE name = ?", (name,)).fetchone()
+            return None if row is None else row[0]
+
+    def next_row_id(self, name: str) -> int | None:
+        """Return the row id for the next new row of a word list (larger than every id it ever had), or None if there is no list with that name."""
+        with self._lock:
+            row = self._connect().execute("SELECT next_row_id FROM word_lists WHERE name = ?", (name,)).fetchone()
+            return None if row is None else row[0]
+
+    def _frame(self, columns: list[str], rows: list[tuple], row_ids: list[int]) -> pd.DataFrame:
+        data = {column: [] for column in columns}
+        for word_1, word_2, date_added, tags, extra in rows:
+            extra = json.loads(extra) if extra else {}
+            for column in columns:
+                if column == columns[0]:
+                    value = word_1
+                elif column == columns[1]:
+                    value = word_2
+                elif column == "date_added":
+                    value = date_added
+                elif column == "tags":
+                    value = tags
+                else:
+                    value = extra.get(column)
+                data[column].append(np.nan if value is None else value)
+        return pd.DataFrame(data, columns=columns, index=pd.Index(row_ids, dtype="int64"))
+
+    def read(self, name: str) -> pd.DataFrame:
+        """
+        Get a word list with its rows in the order in which they were added.
+
+        Raises:
+        - FileNotFoundError: If there is no word list with that name.
+        """
+        with self._lock:
+            connection = self._connect()
+            list_id, columns = self._require_list(connection, name)
+            rows = connection.execute("SELECT row_id, word_1, word_2, date_added, tags, extra FROM words WHERE list_id = ? ORDER BY id", (list_id,)).fetchall()
+            return self._frame(columns, [row[1:] for row in rows], [row[0] for row in rows])
+
+    def write(self, name: str, words: pd.DataFrame, next_row_id: int = 0) -> int:
+        """
+        Replace the content of a word list, creating the list if it does not exist.
+
+        The ids of the removed rows are not given out again.
+
+        Parameters:
+        - name: The name of the word list (e.g. "german_english").
+        - words: The new content, labeled with its row ids. Its first two columns are the words.
+        - next_row_id: The smallest id new rows may get, e.g. the next row id of the list in another store.
+
+        Returns:
+        - The new version of the list.
+        """
+        columns = [str(column) for column in words.columns]
+        if len(columns) < 2:
+            raise ValueError(f"A word list needs at least two columns, got {columns}.")
+        with self._lock:
+            connection = self._connect()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                list_id = connection.execute(
+                    "INSERT INTO word_lists (name, columns) VALUES (?, ?) ON CONFLICT (name) DO UPDATE SET columns = excluded.columns RETURNING id",
+                    (name, json.dumps(columns, ensure_ascii=False)),
+                ).fetchone()[0]
+                connection.execute("DELETE FROM words WHERE list_id = ?", (list_id,))
+                self._insert_rows(connection, list_id, columns, list(zip(words.index.tolist(), words.to_dict("records"))))
+                self._raise_next_row_id(connection, list_id, next_row_id)
+                version = self._bump_version(connection, list_id)
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            return version
+
+    def _where(self, columns: list[str], match: dict) -> tuple[str, tuple] | None:
+        clauses, parameters = [], []
+        for column, value in match.items():
+            if column not in columns:
+                return None
+            expression, expression_parameters = self._column_sql(columns, column)
+            clauses.append(f"{expression} = ?")
+            parameters.extend([*expression_parameters, _to_text(value)])
+        return " AND ".join(clauses) or "1", tuple(parameters)
+
+    def apply_record(self, name: str, record: dict) -> int:
+        """
+        Apply one change record (see `word_list_journal.apply_record`) to a word list.
+
+        The operations behave exactly like on a CSV word list, so the cached copy in
+        `word_list_store` can apply the same record in memory.
+
+        Returns:
+        - The new version of the list.
+        """
+        op = record.get("op")
+        with self._lock:
+            connection = self._connect()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                list_id, columns = self._require_list(connection, name)
+                if op == "add":
+                    self._add_row(connection, list_id, columns, record["values"], record.get("row_id"))
+                elif op in ("tag", "delete", "edit"):
+                    if "rows" in record:
+                        where = f"row_id IN ({', '.join('?' * len(record['rows']))})", tuple(record["rows"])
+                    else:
+                        where = self._where(columns, record.get("match", {}))
+                    matching = [] if where is None else [
+                        row for row in connection.execute(f"SELECT id, tags, word_1, word_2 FROM words WHERE list_id = ? AND {where[0]} ORDER BY id", (list_id, *where[1]))
+                    ]
+                    if "rows" in record and "pair" in record:
+                        matching = self._pair_rows(connection, list_id, matching, record["pair"])
+                    ids = [(row[0],) for row in matching]
+                    if matching and op == "tag":
+                        existing = [tag.strip() for tag in (matching[0][1] or "").split(";") if tag.strip()]
+                        for tag in record.get("tags", []):
+                            if tag.strip() and tag.strip() not in existing:
+                                existing.append(tag.strip())
+                        tags = ";".join(existing)
+                        self._add_columns(connection, list_id, columns, ["tags"], fill="")
+                        connection.executemany("UPDATE words SET tags = ? WHERE id = ?", [(tags, word_id) for (word_id,) in ids])
+                        self._index_tags(connection, [(word_id, tags) for (word_id,) in ids])
+                    elif matching and op == "delete":
+                        connection.executemany("DELETE FROM words WHERE id = ?", ids)
+                    elif matching and op == "edit":
+                        self._edit_rows(connection, list_id, columns, [word_id for (word_id,) in ids], record.get("values", {}))
+                elif op == "patch":
+                    self._apply_patch(connection, list_id, columns, record)
+                else:
+                    print(f"Warning: Unknown journal operation: {op}")
+                version = self._bump_version(connection, list_id)
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            return version
+
+    def find(
+        self,
+        name: str,
+        start_date_added: str | pd.Timestamp | None = None,
+        end_date_added: str | pd.Timestamp | None = None,
+        tags: list[str] | None = None,
+        match_all_tags: bool = False,
+        search: str | None = None,
+    ) -> pd.DataFrame:
+        """
+        Get the rows of a word list that match all given filters, answered from the indexes.
+
+        Parameters:
+        - name: The name of the word list.
+        - start_date_added, end_date_added: Inclusive bounds of `date_added`.
+        - tags: Keep the rows with any (or, with `match_all_tags`, all) of these tags.
+        - search: Keep the rows where one of the two words contains this text (ignoring case).
+
+        Returns:
+        - The matching rows in list order, labeled with their row ids.
+        """
+        clauses, parameters = [], []
+        if start_date_added is not None:
+            clauses.append("date_added_ts >= ?")
+            parameters.append(pd.to_datetime(start_date_added).timestamp())
+        if end_date_added is not None:
+            clauses.append("date_added_ts <= ?")
+            parameters.append(pd.to_datetime(end_date_added).timestamp())
+        tag_keys = list(dict.fromkeys(tag.strip().lower() for tag in tags or [] if tag.strip()))
+        if tag_keys:
+            clauses.append(
+                f"id IN (SELECT word_id FROM word_tags JOIN tags ON tags.id = word_tags.tag_id "
+                f"WHERE tags.key IN ({', '.join('?' * len(tag_keys))}) GROUP BY word_id HAVING COUNT(*) >= ?)"
+            )
+            parameters.extend([*tag_keys, len(tag_keys) if match_all_tags else 1])
+        if search:
+            if len(search) >= 3:
+                # the trigram tokenizer matches any substring of at least three characters
+                clauses.append("id IN (SELECT rowid FROM words_fts WHERE words_fts MATCH ?)")
+                parameters.append('"' + search.replace('"', '""') + '"')
+            else:
+                pattern = "%" + search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+                clauses.append("(word_1 LIKE ? ESCAPE '\\' OR word_2 LIKE ? ESCAPE '\\')")
+                parameters.extend([pattern, pattern])
+        with self._lock:
+            connection = self._connect()
+            list_id, columns = self._require_list(connection, name)
+            where = " AND ".join(["list_id = ?", *clauses])
+            rows = connection.execute(f"SELECT row_id, word_1, word_2, date_added, tags, extra FROM words WHERE {where} ORDER BY id", (list_id, *parameters)).fetchall()
+            return self._frame(columns, [row[1:] for row in rows], [row[0] for row in rows])
+
+
+def get_list_name(word_list_path: str) -> str:
+    """Return the name under which a word list (e.g. `word_lists/german_english.csv`) is stored in the database."""
+    file_name = os.path.basename(word_list_path)
+    return file_name[:-4] if file_name.endswith(".csv") else file_name
+
+
+def import_csv_files(database: WordListDatabase, directory: str = "word_lists") -> list[str]:
+    """
+    Copy all CSV word lists of a directory into the database, replacing lists of the same name.
+
+    Pending journal changes are included, so run it while no server is writing to the CSV files.
+
+    Returns:
+    - The names of the imported lists.
+    """
+    from word_list_store import WordListStore
+
+    csv_store = WordListStore()
+    names = []
+    for entry in sorted(os.scandir(directory), key=lambda entry: entry.name):
+        if entry.name.endswith(".csv") and not entry.name.startswith(".") and entry.is_file():
+            database.write(get_list_name(entry.path), csv_store.read(entry.path), next_row_id=csv_store.next_row_id(entry.path))
+            names.append(get_list_name(entry.path))
+    return names
+
+
+def export_csv_files(database: WordListDatabase, directory: str = "word_lists") -> list[str]:
+    """
+    Write every word list of the database to a CSV file in a directory, replacing files of the same name.
+
+    Returns:
+    - The paths of the written files.
+    """
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for name in database.names():
+        path = os.path.join(directory, f"{name}.csv")
+        write_metadata(path, {**read_metadata(path), "next_row_id": database.next_row_id(name)})
+        atomic_write_csv(with_row_id_column(database.read(name)), path)
+        paths.append(path)
+    return paths
+
+
+WORD_LIST_ENGINES = ("csv", "sqlite")
+
+
+def database_from_env() -> WordListDatabase | None:
+    """Return the word list database if `WORD_LIST_ENGINE` is "sqlite", None for the default CSV files."""
+    engine = os.getenv("WORD_LIST_ENGINE", "csv").strip().lower() or "csv"
+    if engine not in WORD_LIST_ENGINES:
+        raise ValueError(f"Unknown WORD_LIST_ENGINE {engine!r}, expected one of {', '.join(WORD_LIST_ENGINES)}.")
+    if engine == "csv":
+        return None
+    return WordListDatabase(os.getenv("WORD_LIST_DB_PATH", os.path.join("word_lists", "word_lists.sqlite")))
+
+
+word_list_database = database_from_env()
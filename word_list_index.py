@@ -0,0 +1,88 @@
+import os
+import threading
+from word_list_db import WordListDatabase, word_list_database
+
+
+class WordListIndex:
+    """In-memory index of the word list files in a directory.
+
+    Maps each language pair to its CSV file, independent of the order of the languages.
+    The directory is only scanned again when its mtime changes (files added, removed or
+    replaced), so resolving a pair is a dictionary lookup in the common case.
+
+    With a `database`, the word lists are the lists stored there, named like the CSV files
+    they replace (e.g. `word_lists/german_english.csv`).
+    """
+
+    def __init__(self, directory: str = "word_lists", database: WordListDatabase | None = None):
+        self.directory = directory
+        self.database = database
+        self._paths_by_name: dict[str, str] = {}
+        self._directory_mtime_ns: int | None = None
+        self._lock = threading.Lock()
+
+    def _refresh(self) -> None:
+        if self.database is not None:
+            self._paths_by_name = {name.lower(): os.path.join(self.directory, f"{name}.csv") for name in self.database.names()}
+            return
+        try:
+            mtime_ns = os.stat(self.directory).st_mtime_ns
+        except FileNotFoundError:
+            mtime_ns = None
+        if mtime_ns is not None and mtime_ns == self._directory_mtime_ns:
+            return
+        paths_by_name = {}
+        if mtime_ns is not None:
+            for entry in os.scandir(self.directory):
+                # hidden files are journals, locks and temporary files of the word list store
+                if entry.name.endswith(".csv") and not entry.name.startswith(".") and entry.is_file():
+                    paths_by_name[entry.name[:-4].lower()] = os.path.join(self.directory, entry.name)
+        self._paths_by_name = paths_by_name
+        self._directory_mtime_ns = mtime_ns
+
+    def resolve(self, language_1: str, language_2: str) -> str | None:
+        """
+        Get the path to the word list file for the given language pair.
+
+        Parameters:
+        - language_1: The first language (e.g., "german").
+        - language_2: The second language (e.g., "english").
+
+        Returns:
+        - The path to the word list file, or None if there is no word list for the pair.
+        """
+        with self._lock:
+            self._refresh()
+            language_1, language_2 = language_1.lower(), language_2.lower()
+            return self._paths_by_name.get(f"{language_1}_{language_2}") or self._paths_by_name.get(f"{language_2}_{language_1}")
+
+    def add(self, path: str) -> None:
+        """Register a newly created word list file without waiting for the next directory scan."""
+        with self._lock:
+            self._refresh()
+            file_name = os.path.basename(path)
+            self._paths_by_name[file_name[:-4].lower()] = path
+
+    def paths(self) -> list[str]:
+        """Return the paths of all word list files, sorted by file name."""
+        with self._lock:
+            self._refresh()
+            return [self._paths_by_name[name] for name in sorted(self._paths_by_name)]
+
+    def language_pairs(self) -> list[dict]:
+        """Return all language pairs derived from the word list file names."""
+        pairs = []
+        for path in self.paths():
+            name = os.path.basename(path)[:-4]
+            parts = name.split("_")
+            if len(parts) == 2:
+                pairs.append({
+                    "key": name,
+                    "language_1": parts[0],
+                    "language_2": parts[1],
+                    "label": f"{parts[0].capitalize()} \u2194 {parts[1].capitalize()}"
+                })
+        return pairs
+
+
+word_list_index = WordListIndex("word_lists", word_list_database)
@@ -0,0 +1,359 @@
+import json
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+from word_pair_index import WordPairIndex, normalize_word
+
+# column of the CSV files that stores the row ids; in memory they are the index of a word list
+ROW_ID_COLUMN = "row_id"
+
+
+def get_journal_path(word_list_path: str) -> str:
+    """
+    Get the path of the change journal that belongs to a word list file.
+
+    The journal is a hidden file next to the CSV (e.g. `word_lists/.german_english.csv.journal`),
+    so it is not picked up as a word list itself.
+    """
+    directory, file_name = os.path.split(word_list_path)
+    return os.path.join(directory, f".{file_name}.journal")
+
+
+def get_journal_size(word_list_path: str) -> int:
+    try:
+        return os.path.getsize(get_journal_path(word_list_path))
+    except FileNotFoundError:
+        return 0
+
+
+def append_record(word_list_path: str, record: dict) -> None:
+    """
+    Append one change record to the journal of a word list.
+
+    Each record is a single JSON line. The line is flushed and fsynced before returning,
+    so a record that was appended survives a crash.
+
+    Parameters:
+    - word_list_path: The path to the word list file.
+    - record: The change record (see `apply_record` for the supported operations).
+    """
+    line = json.dumps(record, ensure_ascii=False) + "\n"
+    with open(get_journal_path(word_list_path), "a", encoding="utf-8") as f:
+        f.write(line)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def read_records(word_list_path: str, offset: int = 0) -> tuple[list[dict], int]:
+    """
+    Read the journal records of a word list, starting at a byte offset.
+
+    A trailing line without newline (a write that was interrupted by a crash) is ignored
+    and will be read again once it is complete.
+
+    Parameters:
+    - word_list_path: The path to the word list file.
+    - offset: The byte offset to start reading from.
+
+    Returns:
+    - The list of records and the byte offset up to which the journal was consumed.
+    """
+    try:
+        with open(get_journal_path(word_list_path), "rb") as f:
+            f.seek(offset)
+            data = f.read()
+    except FileNotFoundError:
+        return [], 0
+
+    records = []
+    consumed = 0
+    for line in data.splitlines(keepends=True):
+        if not line.endswith(b"\n"):
+            break
+        consumed += len(line)
+        try:
+            records.append(json.loads(line))
+        except json.JSONDecodeError:
+            # skip garbage left by a torn write
+            continue
+    return records, offset + consumed
+
+
+def get_metadata_path(word_list_path: str) -> str:
+    directory, file_name = os.path.split(word_list_path)
+    return os.path.join(directory, f".{file_name}.meta")
+
+
+def read_metadata(word_list_path: str) -> dict:
+    """
+    Read the metadata of a word list, e.g. `{"next_row_id": 12}`.
+
+    The metadata is a small JSON file next to the CSV (e.g. `word_lists/.german_english.csv.meta`)
+    with what cannot be derived from the rows themselves, like the next row id after rows were deleted.
+
+    Returns:
+    - The metadata, or an empty dict if the word list has none (yet).
+    """
+    try:
+        with open(get_metadata_path(word_list_path), encoding="utf-8") as f:
+            metadata = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    return metadata if isinstance(metadata, dict) else {}
+
+
+def write_metadata(word_list_path: str, metadata: dict) -> None:
+    """Replace the metadata of a word list (see `read_metadata`), atomically like `word_list_lock.atomic_write_csv`."""
+    metadata_path = get_metadata_path(word_list_path)
+    directory, file_name = os.path.split(metadata_path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory or ".", prefix=f"{file_name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(metadata, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, metadata_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def truncate_journal(word_list_path: str) -> None:
+    journal_path = get_journal_path(word_list_path)
+    if os.path.exists(journal_path):
+        with open(journal_path, "w", encoding="utf-8") as f:
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def _match_mask(words: pd.DataFrame, match: dict) -> pd.Series:
+    mask = pd.Series(True, index=words.index)
+    for column, value in match.items():
+        if column not in words.columns:
+            return pd.Series(False, index=words.index)
+        mask &= words[column] == value
+    return mask
+
+
+def _prepare_text_column(words: pd.DataFrame, column: str) -> None:
+    # empty columns are parsed as float (all NaN) and would reject string values
+    if column not in words.columns:
+        words[column] = ""
+    elif words[column].dtype.kind == "f":
+        words[column] = words[column].astype(object)
+
+
+def _cell_matches(cell, value) -> bool:
+    if value is None:
+        return pd.isna(cell) or cell == ""
+    return not pd.isna(cell) and str(cell) == str(value)
+
+
+def set_row_ids(words: pd.DataFrame, first_new_id: int = 0) -> pd.DataFrame:
+    """
+    Move the stored row ids of a word list (its `row_id` column) into the index.
+
+    Rows without a valid id, or with the id of an earlier row (e.g. copied by hand), get new ids
+    after the largest one, so a list that was never written with row ids is numbered 0, 1, 2, ...
+
+    Parameters:
+    - words: The word list as read from the CSV file.
+    - first_new_id: The smallest id a row without id may get, e.g. to stay clear of the ids of journaled rows.
+
+    Returns:
+    - The word list without the `row_id` column, labeled with its row ids.
+    """
+    if ROW_ID_COLUMN in words.columns:
+        row_ids = pd.to_numeric(words.pop(ROW_ID_COLUMN), errors="coerce").reset_index(drop=True)
+    else:
+        row_ids = pd.Series(np.nan, index=range(len(words)))
+    row_ids = row_ids.where(~row_ids.duplicated())
+    missing = row_ids.isna().to_numpy()
+    if missing.any():
+        first_id = max(int(row_ids.max()) + 1 if not missing.all() else 0, first_new_id)
+        row_ids[missing] = np.arange(first_id, first_id + missing.sum())
+    words.index = pd.Index(row_ids.to_numpy(dtype=np.int64))
+    return words
+
+
+def with_row_id_column(words: pd.DataFrame) -> pd.DataFrame:
+    """Return a word list with its row ids as the last column, as it is written to a CSV file."""
+    return words.assign(**{ROW_ID_COLUMN: words.index.to_numpy(dtype=np.int64)})
+
+
+def next_row_id(words: pd.DataFrame) -> int:
+    return int(words.index.max()) + 1 if len(words) else 0
+
+
+def get_added_row_ids(record: dict) -> list[int]:
+    """Return the row ids that an add or patch record gives to new rows."""
+    if record.get("op") == "add":
+        return [] if record.get("row_id") is None else [int(record["row_id"])]
+    if record.get("op") == "patch":
+        return [int(insert["row"]) for insert in record.get("insert", [])]
+    return []
+
+
+def row_matches(words: pd.DataFrame, row: int, before: dict) -> bool:
+    """Check whether the row with a row id still holds the given values (see `get_row_image`)."""
+    if row not in words.index:
+        return False
+    values = words.loc[row]
+    return all(_cell_matches(values[column] if column in words.columns else None, value) for column, value in before.items())
+
+
+def get_row_image(words: pd.DataFrame, row: int) -> dict:
+    """Return the values of a row as stored in a patch record (None for empty cells)."""
+    return {column: None if pd.isna(value) else str(value) for column, value in words.loc[row].items()}
+
+
+def _pair_rows(words: pd.DataFrame, word_1, word_2, pair_index: WordPairIndex | None) -> list[int]:
+    if pair_index is not None:
+        return pair_index.get(word_1, word_2)
+    if words.shape[1] < 2:
+        return []
+    mask = (words.iloc[:, 0].map(normalize_word) == normalize_word(word_1)) & (words.iloc[:, 1].map(normalize_word) == normalize_word(word_2))
+    return words.index[mask.to_numpy(dtype=bool)].tolist()
+
+
+def _holds_pair(words: pd.DataFrame, row: int, word_1, word_2) -> bool:
+    values = words.loc[row]
+    return (normalize_word(values.iloc[0]), normalize_word(values.iloc[1])) == (normalize_word(word_1), normalize_word(word_2))
+
+
+def _patched_row(words: pd.DataFrame, change: dict, pair_index: WordPairIndex | None) -> int | None:
+    row, before = change["row"], change.get("before", {})
+    if row_matches(words, row, before):
+        return row
+    # the row may have another id after the CSV was changed by hand
+    word_columns = list(words.columns[:2])
+    if len(word_columns) < 2 or any(before.get(column) is None for column in word_columns):
+        return None
+    return next((other for other in _pair_rows(words, before[word_columns[0]], before[word_columns[1]], pair_index) if row_matches(words, other, before)), None)
+
+
+def _patched_rows(words: pd.DataFrame, changes: list[dict], pair_index: WordPairIndex | None) -> list[int]:
+    rows = (_patched_row(words, change, pair_index) for change in changes)
+    return list(dict.fromkeys(row for row in rows if row is not None))
+
+
+def _selected_rows(words: pd.DataFrame, record: dict, pair_index: WordPairIndex | None = None) -> pd.Index:
+    if "rows" not in record:
+        return words.index[_match_mask(words, record.get("match", {})).to_numpy()]
+    rows = words.index[words.index.isin(record["rows"])]
+    if "pair" not in record or words.shape[1] < 2:
+        return rows
+    word_1, word_2 = record["pair"]
+    held = [row for row in rows if _holds_pair(words, row, word_1, word_2)]
+    if not held:
+        # the rows may have other ids after the CSV was changed by hand
+        held = _pair_rows(words, word_1, word_2, pair_index)
+    return pd.Index(held, dtype="int64")
+
+
+def get_affected_rows(words: pd.DataFrame, record: dict, pair_index: WordPairIndex | None = None) -> pd.DataFrame:
+    """Return the rows of the word list that a tag, delete, edit or patch record changes, as they are before the change."""
+    if record.get("op") == "patch":
+        return words.loc[sorted(_patched_rows(words, record.get("update", []) + record.get("delete", []), pair_index))]
+    if "match" not in record and "rows" not in record:
+        return words.iloc[0:0]
+    return words.loc[_selected_rows(words, record, pair_index)]
+
+
+def apply_record(words: pd.DataFrame, record: dict, pair_index: WordPairIndex | None = None, next_id: int = 0) -> pd.DataFrame:
+    """
+    Apply one journal record to a word list.
+
+    Rows are addressed by their row id (the index of the word list, see `set_row_ids`), which
+    stays the same while other rows are added, changed or removed. Supported operations:
+    - {"op": "add", "values": {column: value}, "row_id": id}: append a row with that id unless a row with the
+      same word pair exists (ignoring case, see `word_pair_index.normalize_word`). If another row has the id
+      (e.g. a row added to the CSV by hand) or the record has no "row_id", the row gets the next free id.
+    - {"op": "tag", "rows": [id], "tags": [...]}: add tags to the rows (the tags of the first row are kept).
+    - {"op": "delete", "rows": [id]}: remove the rows.
+    - {"op": "edit", "rows": [id], "values": {column: value}}: overwrite cells of the rows.
+    - {"op": "patch", "update": [{"row": id, "before": {...}, "values": {...}}], "delete": [{"row": id, "before": {...}}],
+      "insert": [{"row": id, "values": {...}}]}: change several rows at once. A row is only
+      updated or deleted while it still holds its `before` values; if the row with the id does not, the
+      change applies to a row with the same word pair that does. Inserts are applied like "add".
+    Tag, delete and edit records can also hold the word pair of their rows, "pair": [word_1, word_2]. Rows that
+    no longer hold that pair are left alone; if none of them does, the records apply to the rows with the pair.
+    Instead of "rows", tag, delete and edit records can select rows with "match": {column: value}.
+
+    All operations are idempotent, so replaying a journal on top of a CSV that already
+    contains some of its changes gives the same result.
+
+    Parameters:
+    - words: The word list.
+    - record: The change record.
+    - pair_index: The word pair index of `words`, which is updated with the change; without one, word pairs are compared row by row.
+    - next_id: The smallest id a new row may get if it cannot keep the id of its record.
+
+    Returns:
+    - The updated word list.
+    """
+    op = record.get("op")
+    if op == "add":
+        values = record["values"]
+        word_columns = list(words.columns[:2]) if words.shape[1] >= 2 else list(values)[:2]
+        if _pair_rows(words, values.get(word_columns[0]), values.get(word_columns[1]), pair_index):
+            return words
+        row_id = record.get("row_id")
+        if row_id is None or row_id in words.index:
+            row_id = max(next_row_id(words), next_id)
+        words = pd.concat([words, pd.DataFrame({c: [v] for c, v in values.items()}, index=[int(row_id)])])
+        if pair_index is not None:
+            pair_index.update(words, [int(row_id)])
+        return words
+
+    if op == "patch":
+        updated = []
+        for change in record.get("update", []):
+            row = _patched_row(words, change, pair_index)
+            if row is None:
+                continue
+            for column, value in change.get("values", {}).items():
+                _prepare_text_column(words, column)
+                words.loc[row, column] = value
+            updated.append(row)
+        deleted = _patched_rows(words, record.get("delete", []), pair_index)
+        if deleted:
+            words = words.drop(index=deleted)
+        if pair_index is not None:
+            pair_index.update(words, [*updated, *deleted])
+        for insert in record.get("insert", []):
+            num_rows = len(words)
+            words = apply_record(words, {"op": "add", "values": insert["values"], "row_id": insert["row"]}, pair_index, next_id)
+            if len(words) > num_rows:
+                next_id = max(next_id, int(words.index[-1]) + 1)
+        return words
+
+    rows = _selected_rows(words, record, pair_index)
+    if len(rows) == 0:
+        return words
+
+    if op == "tag":
+        _prepare_text_column(words, "tags")
+        raw = words.loc[rows[0], "tags"]
+        # raw may be NaN (float) if the cell is empty
+        if pd.isna(raw) or not str(raw).strip():
+            existing_tag_list = []
+        else:
+            existing_tag_list = [t.strip() for t in str(raw).split(";") if t.strip()]
+        for tag in record.get("tags", []):
+            if tag.strip() and tag.strip() not in existing_tag_list:
+                existing_tag_list.append(tag.strip())
+        words.loc[rows, "tags"] = ";".join(existing_tag_list)
+    elif op == "delete":
+        words = words.drop(index=rows)
+    elif op == "edit":
+        for column, value in record.get("values", {}).items():
+            _prepare_text_column(words, column)
+            words.loc[rows, column] = value
+    else:
+        print(f"Warning: Unknown journal operation: {op}")
+    if pair_index is not None:
+        pair_index.update(words, rows)
+    return words
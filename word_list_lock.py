@@ -0,0 +1,101 @@
+import os
+import stat
+import tempfile
+import threading
+from contextlib import contextmanager
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows; only the in-process lock is used there
+    fcntl = None
+
+
+_registry_lock = threading.Lock()
+_thread_locks: dict[str, threading.RLock] = {}
+_local = threading.local()
+
+
+def get_lock_path(word_list_path: str) -> str:
+    directory, file_name = os.path.split(word_list_path)
+    return os.path.join(directory, f".{file_name}.lock")
+
+
+def get_thread_lock(word_list_path: str) -> threading.RLock:
+    """Get the in-process lock of a word list file (one lock per file, shared by all threads)."""
+    key = os.path.abspath(word_list_path)
+    with _registry_lock:
+        lock = _thread_locks.get(key)
+        if lock is None:
+            lock = threading.RLock()
+            _thread_locks[key] = lock
+        return lock
+
+
+@contextmanager
+def lock_word_list(word_list_path: str):
+    """
+    Lock a word list file for writing.
+
+    Takes the in-process lock of the file and an advisory `fcntl` lock on a hidden
+    sidecar file (e.g. `word_lists/.german_english.csv.lock`), so writers in other
+    threads and in other processes (several uvicorn workers, the CLI scripts) are
+    serialized. The lock is reentrant within a thread.
+
+    Parameters:
+    - word_list_path: The path to the word list file.
+    """
+    key = os.path.abspath(word_list_path)
+    with get_thread_lock(word_list_path):
+        held = getattr(_local, "held", None)
+        if held is None:
+            held = _local.held = {}
+        if key in held or fcntl is None:
+            held[key] = held.get(key, 0) + 1
+            try:
+                yield
+            finally:
+                held[key] -= 1
+                if held[key] == 0:
+                    del held[key]
+            return
+
+        with open(get_lock_path(word_list_path), "a") as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            held[key] = 1
+            try:
+                yield
+            finally:
+                del held[key]
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def atomic_write_csv(words: pd.DataFrame, path: str) -> None:
+    """
+    Write a word list to CSV so that readers see either the old or the new file, never a partial one.
+
+    The content is written to a temporary file in the same directory, fsynced and then moved
+    over the target with `os.replace`.
+
+    Parameters:
+    - words: The word list to write.
+    - path: The path to the word list file.
+    """
+    directory, file_name = os.path.split(path)
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        mode = 0o644
+    fd, tmp_path = tempfile.mkstemp(dir=directory or ".", prefix=f".{file_name}.", suffix=".tmp")
+    try:
+        # mkstemp creates the file readable for the owner only
+        os.fchmod(fd, mode)
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            words.to_csv(f, index=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
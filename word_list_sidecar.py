@@ -0,0 +1,104 @@
+import json
+import os
+import tempfile
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # optional; without it the word lists are always parsed from CSV
+    pa = None
+
+# column of the sidecar that holds the parsed `date_added` values
+_DATES_COLUMN = "__date_added_parsed__"
+# text columns with few distinct values, stored dictionary-encoded
+_DICTIONARY_COLUMNS = ("tags",)
+
+
+def get_sidecar_path(word_list_path: str) -> str:
+    directory, file_name = os.path.split(word_list_path)
+    return os.path.join(directory, f".{file_name}.arrow")
+
+
+def _csv_signature(word_list_path: str) -> str:
+    stat = os.stat(word_list_path)
+    return json.dumps([stat.st_ino, stat.st_mtime_ns, stat.st_size])
+
+
+def parse_dates_added(words: pd.DataFrame) -> pd.Series:
+    """Return the `date_added` column of a word list as datetimes (NaT where it is missing or invalid)."""
+    if "date_added" not in words.columns:
+        return pd.Series(pd.NaT, index=words.index, dtype="datetime64[ns]")
+    return pd.to_datetime(words["date_added"], errors="coerce")
+
+
+def _read_sidecar(word_list_path: str, signature: str) -> tuple[pd.DataFrame, pd.Series] | None:
+    try:
+        with pa.memory_map(get_sidecar_path(word_list_path)) as source:
+            table = pa.ipc.open_file(source).read_all()
+    except (FileNotFoundError, pa.ArrowInvalid, OSError):
+        return None
+    metadata = table.schema.metadata or {}
+    if metadata.get(b"csv_signature") != signature.encode("utf-8"):
+        return None
+    dates = table.column(_DATES_COLUMN).to_pandas()
+    table = table.drop_columns([_DATES_COLUMN])
+    for name in _DICTIONARY_COLUMNS:
+        if name in table.column_names and pa.types.is_dictionary(table.schema.field(name).type):
+            position = table.column_names.index(name)
+            table = table.set_column(position, name, pc.cast(table.column(name), pa.large_string()))
+    return table.to_pandas(), dates
+
+
+def _write_sidecar(word_list_path: str, words: pd.DataFrame, dates: pd.Series, signature: str) -> None:
+    table = pa.Table.from_pandas(words, preserve_index=False)
+    for name in _DICTIONARY_COLUMNS:
+        if name in table.column_names and pa.types.is_large_string(table.schema.field(name).type):
+            position = table.column_names.index(name)
+            table = table.set_column(position, name, pc.dictionary_encode(table.column(name)))
+    table = table.append_column(_DATES_COLUMN, pa.Array.from_pandas(dates))
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), b"csv_signature": signature.encode("utf-8")})
+
+    sidecar_path = get_sidecar_path(word_list_path)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(sidecar_path) or ".", prefix=os.path.basename(sidecar_path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            with pa.ipc.new_file(f, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, sidecar_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def read_word_list_file(word_list_path: str) -> tuple[pd.DataFrame, pd.Series]:
+    """
+    Read a word list CSV file, using its binary sidecar when it is up to date.
+
+    The sidecar (e.g. `word_lists/.german_english.csv.arrow`) is an Arrow IPC file with the
+    typed columns of the CSV, the tags dictionary-encoded and `date_added` already parsed. It
+    is memory-mapped instead of parsed and rewritten whenever the CSV changed, so the CSV stays
+    the file to edit by hand. Without pyarrow the CSV is parsed every time.
+
+    Parameters:
+    - word_list_path: The path to the word list file.
+
+    Returns:
+    - The word list as `pd.read_csv` returns it and its `date_added` column parsed to datetimes.
+    """
+    if pa is None:
+        words = pd.read_csv(word_list_path)
+        return words, parse_dates_added(words)
+
+    signature = _csv_signature(word_list_path)
+    cached = _read_sidecar(word_list_path, signature)
+    if cached is not None:
+        return cached
+    words = pd.read_csv(word_list_path)
+    dates = parse_dates_added(words)
+    try:
+        _write_sidecar(word_list_path, words, dates, signature)
+    except (OSError, pa.ArrowException) as e:
+        print(f"Warning: Writing the sidecar of {word_list_path} failed: {e}")
+    return words, dates
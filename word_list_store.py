@@ -0,0 +1,596 @@
+import glob
+import os
+import threading
+import time
+from typing import Callable
+import pandas as pd
+from word_list_journal import (
+    append_record,
+    apply_record,
+    get_added_row_ids,
+    get_affected_rows,
+    get_journal_size,
+    get_row_image,
+    next_row_id,
+    read_metadata,
+    read_records,
+    set_row_ids,
+    truncate_journal,
+    with_row_id_column,
+    write_metadata,
+)
+from word_list_lock import atomic_write_csv, get_thread_lock, lock_word_list
+from word_list_db import WordListDatabase, get_list_name, word_list_database
+from word_list_sidecar import parse_dates_added, read_word_list_file
+from word_pair_index import WordPairIndex, normalize_word
+
+
+class _Entry:
+    def __init__(self, words: pd.DataFrame, signature: tuple[int, int, int] | int, journal_offset: int, next_row_id: int, metadata: dict | None = None):
+        self.words = words
+        self.signature = signature
+        self.journal_offset = journal_offset
+        # see `WordListStore.version`
+        self.generation = int((metadata or {}).get("generation", 0))
+        self.journal_base = int((metadata or {}).get("journal_base", 0))
+        # larger than every row id the list ever had, so ids of deleted rows are not given out again
+        self.next_row_id = next_row_id
+        # structures built from `words` (e.g. the tag index), dropped whenever `words` changes
+        self.derived: dict[str, object] = {}
+        # kept up to date with every applied record, built on first use
+        self.pair_index: WordPairIndex | None = None
+
+
+def _file_signature(path: str) -> tuple[int, int, int]:
+    stat = os.stat(path)
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+def _changed_rows(old_words: pd.DataFrame, new_words: pd.DataFrame) -> pd.DataFrame:
+    """Return the rows of `old_words` that do not appear unchanged in `new_words`."""
+    new_words = new_words.reindex(columns=old_words.columns)
+    old_hashes = pd.util.hash_pandas_object(old_words.astype(str), index=False)
+    new_hashes = pd.util.hash_pandas_object(new_words.astype(str), index=False)
+    return old_words[~old_hashes.isin(new_hashes)]
+
+
+def _next_generation(metadata: dict) -> int:
+    # also larger than any earlier generation if the metadata file was lost
+    return max(int(metadata.get("generation", 0)) + 1, time.time_ns() // 1000)
+
+
+class VersionConflictError(ValueError):
+    """Raised when a word list changed since the version a change was based on."""
+
+    def __init__(self, message: str, version: str):
+        super().__init__(message)
+        self.version = version
+
+
+class WordListStore:
+    """In-memory cache of the word list CSV files.
+
+    Every word list is parsed once (or loaded from its binary sidecar, see `word_list_sidecar`)
+    and then served from memory. Small changes (new word pairs,
+    tags, single edits) are appended to a per-list journal (see `word_list_journal`) and applied
+    to the cached copy, while full replacements write the CSV directly. A background task folds
+    the journals back into the CSV files. Edits made outside the process (e.g. by the CLI scripts
+    or by hand) are noticed by comparing the file's mtime and size and the journal size on each read.
+
+    Reads only take the in-process lock of the file; CSV files are always replaced atomically and
+    journal records are appended as whole lines, so readers never see a partial write. Writes also
+    take the cross-process lock (see `word_list_lock`), so several processes can share one directory.
+
+    Rows are labeled with row ids (see `word_list_journal.set_row_ids`) that are stored with the
+    list and stay the same while other rows change. An id is never given out twice, also not after
+    its row was deleted: the next free id is kept in the metadata of the list (see
+    `word_list_journal.read_metadata`) or in the database. A hash index on the normalized word pair of
+    every list (see `word_pair_index`) finds rows by their words in constant time.
+
+    Caches of per-row results (e.g. `description_filter_cache`) can register a listener with
+    `add_listener` to learn which rows were edited or removed.
+
+    With a `database` (see `word_list_db`), the word lists are stored there instead of in CSV
+    files. Paths keep naming the lists (`word_lists/german_english.csv` is the list
+    "german_english"), changes are written to the database directly instead of to a journal, and
+    the version of a list replaces the file signature.
+    """
+
+    def __init__(self, database: WordListDatabase | None = None):
+        self.database = database
+        self._entries: dict[str, _Entry] = {}
+        self._compaction_stop: threading.Event | None = None
+        self._listeners: list[Callable[[str, pd.DataFrame], None]] = []
+
+    def add_listener(self, listener: Callable[[str, pd.DataFrame], None]) -> None:
+        """
+        Register a function that is called whenever rows of a word list are edited or removed.
+
+        The listener receives the path of the word list and the affected rows as they were
+        before the change. New rows are not reported.
+        """
+        self._listeners.append(listener)
+
+    def _notify(self, path: str, rows: pd.DataFrame) -> None:
+        if rows.shape[0] == 0 or not self._listeners:
+            return
+        for listener in self._listeners:
+            try:
+                listener(path, rows)
+            except Exception as e:
+                print(f"Warning: Word list change listener failed: {e}")
+
+    @staticmethod
+    def _key(path: str) -> str:
+        return os.path.abspath(path)
+
+    def _load_from_database(self, path: str) -> _Entry:
+        key = self._key(path)
+        version = self.database.version(get_list_name(path))
+        if version is None:
+            self._entries.pop(key, None)
+            raise FileNotFoundError(f"No word list named {get_list_name(path)} in {self.database.path}.")
+        entry = self._entries.get(key)
+        if entry is None or entry.signature != version:
+            words = self.database.read(get_list_name(path))
+            if entry is not None and self._listeners:
+                self._notify(path, _changed_rows(entry.words, words))
+            entry = _Entry(words, version, 0, self.database.next_row_id(get_list_name(path)))
+            self._entries[key] = entry
+        return entry
+
+    def _load(self, path: str) -> _Entry:
+        if self.database is not None:
+            return self._load_from_database(path)
+        key = self._key(path)
+        signature = _file_signature(path)
+        entry = self._entries.get(key)
+        if entry is None or entry.signature != signature or get_journal_size(path) < entry.journal_offset:
+            metadata = read_metadata(path)
+            if tuple(metadata.get("csv_signature", ())) != signature:
+                # the CSV is being replaced by another process (wait until it is done) or was changed by hand
+                with lock_word_list(path):
+                    signature = _file_signature(path)
+                    metadata = read_metadata(path)
+                    if tuple(metadata.get("csv_signature", ())) != signature:
+                        metadata = self._adopt_csv(path, metadata, signature)
+            words, dates_added = read_word_list_file(path)
+            words = set_row_ids(words, int(metadata.get("new_row_ids_from", 0)))
+            dates_added.index = words.index
+            old_entry = entry
+            entry = _Entry(words, signature, 0, max(int(metadata.get("next_row_id", 0)), next_row_id(words)), metadata)
+            records, entry.journal_offset = read_records(path)
+            for record in records:
+                self._apply(path, entry, record, notify=False)
+            if old_entry is not None and self._listeners:
+                # changed outside of this process, e.g. by hand
+                self._notify(path, _changed_rows(old_entry.words, entry.words))
+            if not records:
+                entry.derived["date_added"] = dates_added
+            self._entries[key] = entry
+        elif get_journal_size(path) > entry.journal_offset:
+            records, entry.journal_offset = read_records(path, entry.journal_offset)
+            for record in records:
+                self._apply(path, entry, record)
+        return entry
+
+    @staticmethod
+    def _adopt_csv(path: str, metadata: dict, signature: tuple[int, int, int]) -> dict:
+        """
+        Update the metadata of a word list for a CSV file it does not describe yet, holding the lock.
+
+        That is a CSV written by hand or by an older version, or one left by a write that stopped
+        half-way (see `_write_csv`). The journal is only replayed on top of the CSV it was written for:
+        if the CSV already contains it, it is emptied. A CSV that was changed by hand keeps the journal,
+        and its rows without ids get ids after those of the journaled rows, so they cannot take them.
+
+        Returns:
+        - The new metadata.
+        """
+        metadata = dict(metadata)
+        pending = metadata.pop("pending_write", None)
+        if pending is not None and tuple(pending.get("csv_signature") or ()) != signature and get_journal_size(path) == pending.get("journal_size"):
+            # stopped after the CSV was replaced: the journal is already part of it
+            truncate_journal(path)
+        elif metadata and (pending is None or tuple(pending.get("csv_signature") or ()) != signature):
+            records, _ = read_records(path)
+            added = [row_id + 1 for record in records for row_id in get_added_row_ids(record)]
+            metadata["new_row_ids_from"] = max([int(metadata.get("next_row_id", 0)), *added])
+        metadata.update(generation=_next_generation(metadata), journal_base=0, csv_signature=list(signature))
+        write_metadata(path, metadata)
+        return metadata
+
+    def _apply(self, path: str, entry: _Entry, record: dict, notify: bool = True) -> None:
+        pair_index = self._pair_index(entry)
+        if notify:
+            self._notify(path, get_affected_rows(entry.words, record, pair_index))
+        num_rows = len(entry.words)
+        entry.words = apply_record(entry.words, record, pair_index, entry.next_row_id)
+        entry.derived.clear()
+        added = [*entry.words.index[num_rows:], *get_added_row_ids(record)]
+        entry.next_row_id = max([entry.next_row_id, *(int(row_id) + 1 for row_id in added)])
+
+    def _pair_index(self, entry: _Entry) -> WordPairIndex:
+        if entry.pair_index is None:
+            entry.pair_index = WordPairIndex(entry.words)
+        return entry.pair_index
+
+    def read(self, path: str) -> pd.DataFrame:
+        """
+        Get the word list stored at the given path.
+
+        Parameters:
+        - path: The path to the word list file.
+
+        Returns:
+        - A copy of the cached word list, so callers are free to modify it.
+        """
+        with get_thread_lock(path):
+            return self._load(path).words.copy()
+
+    def derived(self, path: str, name: str, build: Callable[[pd.DataFrame], object]) -> object:
+        """
+        Get a structure computed from a word list, building it only when the word list changed.
+
+        Parameters:
+        - path: The path to the word list file.
+        - name: The name under which the structure is cached.
+        - build: Function that computes the structure from the word list. It must not modify the word list.
+
+        Returns:
+        - The cached or newly built structure.
+        """
+        with get_thread_lock(path):
+            entry = self._load(path)
+            if name not in entry.derived:
+                entry.derived[name] = build(entry.words)
+            return entry.derived[name]
+
+    def version(self, path: str) -> str:
+        """
+        Get a token that changes whenever the word list changes, e.g. to build an HTTP ETag.
+
+        The token is a counter kept in the metadata of the list: a generation that is raised whenever
+        the list is replaced (or changed by hand), and the number of journal bytes written since, which
+        compaction carries over. With a database it is the list version. So the token costs nothing
+        to compute, all processes that share the word lists return the same token for the same state,
+        it stays the same across compaction, and it is never used for two different contents.
+        """
+        with get_thread_lock(path):
+            entry = self._load(path)
+            if self.database is not None:
+                return str(entry.signature)
+            return f"{entry.generation}.{entry.journal_base + entry.journal_offset}"
+
+    def dates_added(self, path: str) -> pd.Series:
+        """
+        Get the `date_added` column of a word list parsed to datetimes.
+
+        Returns:
+        - The dates by row id, NaT where the date is missing or invalid. The series is shared, do not modify it.
+        """
+        return self.derived(path, "date_added", parse_dates_added)
+
+    def next_row_id(self, path: str) -> int:
+        """Return the row id that the next new row of a word list gets; no row of the list ever had it or a larger one."""
+        with get_thread_lock(path):
+            return self._load(path).next_row_id
+
+    def _reuse_row_ids(self, old_words: pd.DataFrame | None, words: pd.DataFrame, next_id: int) -> pd.Index:
+        """Give every row of a new content the id of an old row with the same word pair, or a new id starting at `next_id`."""
+        if old_words is None or words.shape[1] < 2:
+            return pd.Index(range(next_id, next_id + len(words)), dtype="int64")
+        old_pairs = WordPairIndex(old_words)
+        used = set()
+        row_ids = []
+        for word_1, word_2 in zip(words.iloc[:, 0].tolist(), words.iloc[:, 1].tolist()):
+            row_id = next((row for row in old_pairs.get(word_1, word_2) if row not in used), None)
+            if row_id is None:
+                row_id, next_id = next_id, next_id + 1
+            used.add(row_id)
+            row_ids.append(row_id)
+        return pd.Index(row_ids, dtype="int64")
+
+    def write(self, path: str, words: pd.DataFrame, keep_row_ids: bool = False) -> None:
+        """
+        Replace the word list stored at the given path.
+
+        Parameters:
+        - path: The path to the word list file.
+        - words: The new content of the word list.
+        - keep_row_ids: If True, the index of `words` are its row ids (e.g. a list returned by `read`).
+          Otherwise every row keeps the row id of the old row with the same word pair and new word pairs get new ids.
+        """
+        with lock_word_list(path):
+            if self.database is not None:
+                exists = self.database.version(get_list_name(path)) is not None
+            else:
+                exists = os.path.exists(path)
+            old_entry = self._load(path) if exists else None
+            old_words = None if old_entry is None else old_entry.words
+            if old_entry is not None:
+                next_id = old_entry.next_row_id
+            elif self.database is not None:
+                next_id = 0
+            else:
+                # the list may have existed before
+                next_id = int(read_metadata(path).get("next_row_id", 0))
+            if keep_row_ids:
+                if not words.index.is_unique:
+                    raise ValueError("The row ids of a word list must be unique.")
+                words = words.set_axis(words.index.astype("int64"))
+            else:
+                words = words.set_axis(self._reuse_row_ids(old_words, words, next_id))
+            next_id = max(next_id, next_row_id(words))
+            if old_words is not None and self._listeners:
+                self._notify(path, _changed_rows(old_words, words))
+            if self.database is not None:
+                version = self.database.write(get_list_name(path), words, next_row_id=next_id)
+                self._entries[self._key(path)] = _Entry(words.copy(), version, 0, self.database.next_row_id(get_list_name(path)))
+                return
+            signature, metadata = self._write_csv(path, words, next_id)
+            self._entries[self._key(path)] = _Entry(words.copy(), signature, 0, next_id, metadata)
+
+    @staticmethod
+    def _write_csv(path: str, words: pd.DataFrame, next_id: int, compacted_bytes: int | None = None) -> tuple[tuple[int, int, int], dict]:
+        """
+        Replace the CSV of a word list and empty its journal.
+
+        Parameters:
+        - compacted_bytes: For a compaction, the size of the journal folded into the CSV; None for a new content.
+
+        Returns:
+        - The signature of the new CSV and the new metadata of the list.
+        """
+        # the next row id is written first: a larger one than the CSV needs is harmless, a smaller one is not;
+        # "pending_write" tells `_adopt_csv` whether a write that stopped half-way replaced the CSV
+        metadata = read_metadata(path)
+        pending = {"csv_signature": list(_file_signature(path)) if os.path.exists(path) else None, "journal_size": get_journal_size(path)}
+        write_metadata(path, {**metadata, "next_row_id": next_id, "pending_write": pending})
+        atomic_write_csv(with_row_id_column(words), path)
+        truncate_journal(path)
+        metadata.pop("new_row_ids_from", None)
+        metadata["next_row_id"] = next_id
+        if compacted_bytes is None:
+            metadata.update(generation=_next_generation(metadata), journal_base=0)
+        else:
+            metadata["journal_base"] = int(metadata.get("journal_base", 0)) + compacted_bytes
+        # until the metadata names the new CSV, readers in other processes wait for the lock (see `_load`)
+        signature = _file_signature(path)
+        metadata["csv_signature"] = list(signature)
+        write_metadata(path, metadata)
+        return signature, metadata
+
+    def update(self, path: str, modify: Callable[[pd.DataFrame], pd.DataFrame | None]) -> bool:
+        """
+        Read, modify and write back a word list as one step.
+
+        Parameters:
+        - path: The path to the word list file.
+        - modify: Function that receives a copy of the word list and returns the new word list,
+          or None if nothing changed.
+
+        Returns:
+        - True if the word list was written, False if `modify` reported no change.
+        """
+        with lock_word_list(path):
+            words = modify(self.read(path))
+            if words is None:
+                return False
+            self.write(path, words, keep_row_ids=True)
+            return True
+
+    def append(self, path: str, record: dict) -> None:
+        """
+        Record a single change in the journal of a word list and apply it to the cached copy.
+
+        Parameters:
+        - path: The path to the word list file.
+        - record: The change record (see `word_list_journal.apply_record`).
+        """
+        with lock_word_list(path):
+            entry = self._load(path)
+            if self.database is not None:
+                version = self.database.apply_record(get_list_name(path), record)
+                self._apply(path, entry, record)
+                entry.signature = version
+                return
+            append_record(path, record)
+            self._load(path)
+
+    def find_rows(self, path: str, values: dict) -> list[int]:
+        """
+        Find the rows of a word list by their word pair, ignoring case and extra whitespace.
+
+        Parameters:
+        - path: The path to the word list file.
+        - values: Mapping from the two word columns to the words, e.g. {"German": "Haus", "English": "house"}.
+          Other columns are ignored.
+
+        Returns:
+        - The row ids of the matching rows (usually none or one).
+        """
+        with get_thread_lock(path):
+            entry = self._load(path)
+            word_columns = list(entry.words.columns[:2])
+            if len(word_columns) < 2 or any(column not in values for column in word_columns):
+                return []
+            return self._pair_index(entry).get(values[word_columns[0]], values[word_columns[1]])
+
+    def append_to_pair(self, path: str, values: dict, record: dict) -> list[int]:
+        """
+        Record a tag, delete or edit change for the rows with a word pair (see `find_rows`).
+
+        The record holds the row ids and the word pair, so it still changes the right rows if their
+        ids change before it is folded into the CSV (e.g. when the CSV is edited by hand).
+
+        Parameters:
+        - path: The path to the word list file.
+        - values: Mapping from the two word columns to the words, e.g. {"German": "Haus", "English": "house"}.
+        - record: The change without its rows, e.g. {"op": "delete"} (see `word_list_journal.apply_record`).
+
+        Returns:
+        - The row ids of the changed rows; none if the word pair does not exist.
+        """
+        with lock_word_list(path):
+            rows = self.find_rows(path, values)
+            if rows:
+                word_columns = list(self._load(path).words.columns[:2])
+                self.append(path, {**record, "rows": rows, "pair": [values[column] for column in word_columns]})
+            return rows
+
+    @staticmethod
+    def _word_pair_first(words: pd.DataFrame, values: dict) -> dict:
+        # the first two values of an "add" are the word pair
+        word_columns = list(words.columns[:2])
+        if len(word_columns) < 2 or any(not str(values.get(column) or "").strip() for column in word_columns):
+            raise ValueError(f"New rows need values for {' and '.join(word_columns) or 'both words'}.")
+        return {**{column: values[column] for column in word_columns}, **values}
+
+    def add(self, path: str, values: dict) -> tuple[int, bool]:
+        """
+        Add a row to a word list unless a row with the same word pair exists (see `find_rows`).
+
+        Parameters:
+        - path: The path to the word list file.
+        - values: The values of the new row; they must contain both words.
+
+        Returns:
+        - The row id of the new or the existing row, and whether the row was added.
+        """
+        with lock_word_list(path):
+            entry = self._load(path)
+            values = self._word_pair_first(entry.words, values)
+            existing = self.find_rows(path, values)
+            if existing:
+                return existing[0], False
+            row_id = entry.next_row_id
+            self.append(path, {"op": "add", "values": values, "row_id": row_id})
+            return row_id, True
+
+    def patch(
+        self,
+        path: str,
+        updates: dict[int, dict] | None = None,
+        deletes: list[int] | None = None,
+        inserts: list[dict] | None = None,
+        expected_version: str | None = None,
+    ) -> tuple[str, list[int]]:
+        """
+        Update, delete and insert rows of a word list as one journaled change.
+
+        Parameters:
+        - path: The path to the word list file.
+        - updates: Mapping from row id to the new values of some of its columns.
+        - deletes: Row ids of the rows to delete.
+        - inserts: Values of new rows; they must contain both words. A row whose word pair already exists
+          (see `find_rows`) is not added again.
+        - expected_version: If given, the change is only applied if the word list is still at this version (see `version`).
+
+        Returns:
+        - The new version of the word list and the row ids of the inserted (or already existing) rows.
+
+        Raises:
+        - VersionConflictError: If the word list is no longer at `expected_version`.
+        - ValueError: If a row id does not exist or is used twice, or an insert lacks a word.
+        """
+        updates, deletes, inserts = updates or {}, deletes or [], inserts or []
+        with lock_word_list(path):
+            entry = self._load(path)
+            words = entry.words
+            version = self.version(path)
+            if expected_version is not None and expected_version != version:
+                raise VersionConflictError(f"The word list was changed in the meantime (version {version}, expected {expected_version}).", version)
+            row_ids = [int(row) for row in updates] + [int(row) for row in deletes]
+            invalid = [row for row in row_ids if row not in words.index]
+            if invalid:
+                raise ValueError(f"Unknown row ids: {', '.join(map(str, invalid))}")
+            if len(set(row_ids)) != len(row_ids):
+                raise ValueError("Every row id can only be updated or deleted once per patch.")
+            inserts = [self._word_pair_first(words, values) for values in inserts]
+
+            pair_index = self._pair_index(entry)
+            word_columns = list(words.columns[:2])
+            next_id = entry.next_row_id
+            new_rows, inserted_row_ids = [], []
+            # new word pairs of this patch, so an insert listed twice is only added once
+            pending: dict[tuple[str, str], int] = {}
+            for values in inserts:
+                word_1, word_2 = values[word_columns[0]], values[word_columns[1]]
+                key = (normalize_word(word_1), normalize_word(word_2))
+                row_id = next(iter(pair_index.get(word_1, word_2)), pending.get(key))
+                if row_id is None:
+                    row_id = pending[key] = next_id
+                    next_id += 1
+                    new_rows.append({"row": row_id, "values": values})
+                inserted_row_ids.append(row_id)
+            if not row_ids and not new_rows:
+                return version, inserted_row_ids
+
+            self.append(path, {
+                "op": "patch",
+                "update": [{"row": int(row), "before": get_row_image(words, int(row)), "values": values} for row, values in updates.items()],
+                "delete": [{"row": int(row), "before": get_row_image(words, int(row))} for row in deletes],
+                "insert": new_rows,
+            })
+            return self.version(path), inserted_row_ids
+
+    def compact(self, path: str) -> bool:
+        """
+        Fold the journal of a word list back into its CSV file.
+
+        The CSV is written before the journal is truncated. If the process stops in between,
+        the next load notices from the metadata that the journal is already part of the CSV (see `_adopt_csv`).
+
+        Returns:
+        - True if there was something to compact.
+        """
+        with lock_word_list(path):
+            if get_journal_size(path) == 0:
+                return False
+            entry = self._load(path)
+            # the next row id also counts the rows that were added and deleted again in the journal
+            entry.signature, metadata = self._write_csv(path, entry.words, entry.next_row_id, compacted_bytes=entry.journal_offset)
+            entry.journal_base = metadata["journal_base"]
+            entry.journal_offset = 0
+            return True
+
+    def recover(self, directory: str = "word_lists") -> None:
+        """Replay and compact all journals left in the directory, e.g. after a crash."""
+        for journal_path in glob.glob(os.path.join(directory, ".*.csv.journal")):
+            word_list_path = os.path.join(directory, os.path.basename(journal_path)[1:-len(".journal")])
+            if os.path.exists(word_list_path):
+                self.compact(word_list_path)
+
+    def start_compaction(self, directory: str = "word_lists", interval_seconds: float = 30.0) -> None:
+        """Start a background thread that compacts the journals in the directory periodically."""
+        if self._compaction_stop is not None:
+            return
+        stop = threading.Event()
+
+        def _run():
+            while not stop.wait(interval_seconds):
+                try:
+                    self.recover(directory)
+                except Exception as e:
+                    print(f"Warning: Word list compaction failed: {e}")
+
+        self._compaction_stop = stop
+        threading.Thread(target=_run, name="word-list-compaction", daemon=True).start()
+
+    def stop_compaction(self, directory: str = "word_lists") -> None:
+        """Stop the background compaction and compact one last time."""
+        if self._compaction_stop is not None:
+            self._compaction_stop.set()
+            self._compaction_stop = None
+        self.recover(directory)
+
+    def invalidate(self, path: str | None = None) -> None:
+        """Drop the cached copy of one word list, or of all word lists if no path is given."""
+        if path is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(self._key(path), None)
+
+
+word_list_store = WordListStore(word_list_database)
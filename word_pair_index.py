@@ -0,0 +1,87 @@
+import pandas as pd
+
+
+def normalize_word(word) -> str:
+    """Normalize a word for comparing word pairs: ignore case, surrounding and repeated whitespace."""
+    if word is None or (not isinstance(word, str) and pd.isna(word)):
+        return ""
+    return " ".join(str(word).casefold().split())
+
+
+class WordPairIndex:
+    """Hash index from the normalized word pair of a word list to the ids of its rows.
+
+    The word pair of a row are its first two columns (see `normalize_word`). Looking up, adding
+    and removing rows takes constant time, so `word_list_store` keeps one index per word list and
+    updates it with every change instead of rebuilding it.
+    """
+
+    def __init__(self, words: pd.DataFrame):
+        if words.shape[1] < 2:
+            keys, row_ids = [], []
+        else:
+            keys = list(zip(*([normalize_word(word) for word in words.iloc[:, i].tolist()] for i in range(2))))
+            row_ids = words.index.tolist()
+        self._keys: dict[int, tuple[str, str]] = dict(zip(row_ids, keys))
+        # the first row of every word pair; further rows with the same pair are rare and kept in `_more`
+        self._first: dict[tuple[str, str], int] = dict(zip(reversed(keys), reversed(row_ids)))
+        self._more: dict[tuple[str, str], list[int]] = {}
+        if len(self._first) < len(keys):
+            for row_id, key in zip(row_ids, keys):
+                if self._first[key] != row_id:
+                    self._more.setdefault(key, []).append(row_id)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _add(self, row_id: int, key: tuple[str, str]) -> None:
+        self._keys[row_id] = key
+        if key in self._first:
+            self._more.setdefault(key, []).append(row_id)
+        else:
+            self._first[key] = row_id
+
+    def _remove(self, row_id: int) -> None:
+        key = self._keys.pop(row_id, None)
+        if key is None:
+            return
+        more = self._more.get(key, [])
+        if self._first[key] == row_id:
+            if more:
+                self._first[key] = more.pop(0)
+            else:
+                del self._first[key]
+        else:
+            more.remove(row_id)
+        if key in self._more and not more:
+            del self._more[key]
+
+    def get(self, word_1: str, word_2: str) -> list[int]:
+        """
+        Get the rows with a word pair.
+
+        Parameters:
+        - word_1: The word of the first column.
+        - word_2: The word of the second column.
+
+        Returns:
+        - The row ids of the matching rows in the order in which they were indexed.
+        """
+        key = (normalize_word(word_1), normalize_word(word_2))
+        if key not in self._first:
+            return []
+        return [self._first[key], *self._more.get(key, [])]
+
+    def update(self, words: pd.DataFrame, row_ids) -> None:
+        """
+        Re-index some rows after they changed.
+
+        Parameters:
+        - words: The word list after the change.
+        - row_ids: The ids of the changed, added or removed rows.
+        """
+        for row_id in row_ids:
+            self._remove(row_id)
+            if row_id in words.index and words.shape[1] >= 2:
+                word_1, word_2 = words.loc[row_id].iloc[:2]
+                self._add(row_id, (normalize_word(word_1), normalize_word(word_2)))
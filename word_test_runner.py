@@ -1,14 +1,22 @@
+import asyncio
 import os
 import pandas as pd
 import numpy as np
 import json
-from file_utils import get_word_list_file_name
+from file_utils import resolve_word_list_file_name
+from word_list_store import word_list_store
+from tag_index import TagIndex, get_tag_index
+from description_filter_cache import description_filter_cache
+from sentence_pool import SentencePool
+from review_scheduler import ReviewScheduler, review_scheduler
 from word_comparisons import check_equality
-from create_text_and_voice import create_sentence_from_word, create_voice_from_text
+from create_text_and_voice import create_sentence_from_word_async, create_voice_from_text
 import datetime
-from llm_utils.ollama_utils import Llama_params, respond_to_prompt
-from llm_utils.llm_api_utils import respond_with_gemini, respond_with_gemini_fast
+from llm_utils.ollama_utils import Llama_params, get_context_window_tokens, get_ollama_num_parallel, respond_to_prompt_async
+from llm_utils.llm_api_utils import respond_with_gemini_async, respond_with_gemini_fast_async
 from llm_utils.start_ollama import start_ollama
+from llm_utils.embeddings import EmbeddingModel, embed_texts, embedding_model_from_env
+from async_utils import run_sync
 
 def run_test(
         language_1: str,
@@ -26,10 +34,11 @@ def run_test(
         max_num_words_in_created_sentence: int = 10,
         language_level_for_created_sentence: str = "C1",
         be_stringent: bool = False,
-        word_batch_size: int = 20,
+        word_batch_size: int | None = None,
         start_date_added: datetime.datetime | None = None,
         end_date_added: datetime.datetime | None = None,
-        cloud_models_only: bool = False
+        cloud_models_only: bool = False,
+        sampling_mode: str = "random",
 ):
     """Run a vocabulary test between two languages. 
     Parameters:
@@ -48,28 +57,38 @@ def run_test(
     - max_num_words_in_created_sentence: Maximum number of words in the created sentence.
     - language_level_for_created_sentence: Language level for the created sentence (e.g., "C1").
     - be_stringent: Whether to be stringent in checking the user's translation (e.g., by using a Llama model to check for correctness).
-    - word_batch_size: The number of words to include in each batch when filtering words by description.
+    - word_batch_size: The maximum number of words in each request when filtering words by description. If None, it follows the context window of the model.
     - start_date_added: The start date to filter words by their addition date.
     - end_date_added: The end date to filter words by their addition date.
+    - sampling_mode: "random" to sample words uniformly, "due" to practice the words that are due for review first.
+      The answers are stored in the review history in both modes.
     """
     
     if llama_params is not None and len(llama_params.url) > 0:
         # check if a server under url is running
         start_ollama(llama_params.url)
     # load correct word list from folder word_lists
-    selected_word_list = get_word_list_file_name(language_1, language_2)
-    words = pd.read_csv(selected_word_list).squeeze()
-
-    if start_date_added is not None:
-        words = words[pd.to_datetime(words["date_added"]) >= start_date_added]
-    if end_date_added is not None:
-        words = words[pd.to_datetime(words["date_added"]) <= end_date_added]
+    selected_word_list = resolve_word_list_file_name(language_1, language_2)
+    words = word_list_store.read(selected_word_list).squeeze()
+
+    if start_date_added is not None or end_date_added is not None:
+        dates_added = word_list_store.dates_added(selected_word_list).reindex(words.index)
+        if start_date_added is not None:
+            words = words[dates_added >= start_date_added]
+        if end_date_added is not None:
+            words = words[dates_added.reindex(words.index) <= end_date_added]
     if words.shape[0] == 0:
         print("No words found matching the date criteria. Exiting the test.")
         return
 
     if tags_for_word_filtering is not None and len(tags_for_word_filtering) > 0:
-        words_filtered = filter_word_list_by_tags(words, tags_for_word_filtering, exclude_words_with_tag=exclude_words_with_tag, intersection=intersection_of_tags)
+        words_filtered = filter_word_list_by_tags(
+            words,
+            tags_for_word_filtering,
+            exclude_words_with_tag=exclude_words_with_tag,
+            intersection=intersection_of_tags,
+            tag_index=get_tag_index(selected_word_list),
+        )
         if words_filtered.shape[0] == 0:
             print("No words found matching the tags. Using the full word list.")
         else:
@@ -97,27 +116,29 @@ def run_test(
     if no_words is not None:
         words = words[:no_words]
     print(f"Running test between {language_1} and {language_2} with {len(words)} words.")
-    continue_test = True
-    last_used_words_indices = []
-
-    words_to_sample_from = words.copy()
-    while continue_test:
-        word_language_1, word_language_2, word_index, original_word_language_1 = sample_word(
-            words_to_sample_from,
-            language_1,
-            language_2,
-            probability_for_sentence_creation,
-            llama_params,
-            max_num_words_in_created_sentence,
-            language_level_for_created_sentence,
-            cloud_models_only=cloud_models_only,
-        )
-        last_used_words_indices.append(word_index)
-        last_used_words_indices = last_used_words_indices[-hide_used_word_for_n_words:]
-        
-        if word_language_1 is None or word_language_2 is None or word_index is None:
+    # prepares the next words and their sentences while the user is answering
+    from practice_session import PracticeSession
+    session = PracticeSession(
+        words,
+        language_1,
+        language_2,
+        probability_for_sentence_creation,
+        llama_params=llama_params,
+        max_num_words_in_created_sentence=max_num_words_in_created_sentence,
+        language_level_for_created_sentence=language_level_for_created_sentence,
+        cloud_models_only=cloud_models_only,
+        hide_used_word_for_n_words=hide_used_word_for_n_words,
+        sampling_mode=sampling_mode,
+        review_scheduler=review_scheduler,
+    )
+    while True:
+        entry = run_sync(session.next())
+        if entry is None:
             print("No more words available for testing.")
             break
+        word_language_1 = entry["word_language_1"]
+        word_language_2 = entry["word_language_2"]
+        original_word_language_1 = entry["original_word_language_1"]
 
         print(f"\n{language_1}: {word_language_1}")
         if use_voice and language_1 != os.getenv("PRIMARY_LANGUAGE", "german"):
@@ -125,19 +146,39 @@ def run_test(
 
         user_input = input(f"Enter the {language_2} translation: ").strip()
         
-        if check_equality(user_input, word_language_2, llama_params=llama_params, be_stringent=be_stringent, word_to_pay_attention_to=original_word_language_1):
+        is_correct = check_equality(user_input, word_language_2, llama_params=llama_params, be_stringent=be_stringent, word_to_pay_attention_to=original_word_language_1, language=language_2)
+        session.record_answer(entry["index"], is_correct)
+        if is_correct:
             print("✓ Correct!")
             if hide_correctly_translated_words:
-                words = words.loc[words.index.difference([word_index])]
+                run_sync(session.remove_word(entry["index"]))
         else:
             print(f"✗ Incorrect. The correct answer is: {word_language_2}")
 
-        words_to_sample_from = words.loc[words.index.difference(last_used_words_indices)]
-
         if use_voice and language_2 != os.getenv("PRIMARY_LANGUAGE", "german"):
             create_voice_from_text(word_language_2, language=language_2)
 
 
+SAMPLING_MODES = ("random", "due")
+
+
+def _sample_rows(
+    words: pd.DataFrame,
+    n: int,
+    language_1: str,
+    language_2: str,
+    sampling_mode: str,
+    review_scheduler: ReviewScheduler | None,
+) -> pd.DataFrame:
+    if sampling_mode == "random":
+        return words.sample(n=n)
+    if sampling_mode == "due":
+        if review_scheduler is None:
+            raise ValueError('Sampling mode "due" needs a review scheduler.')
+        return words.iloc[review_scheduler.most_due(language_1, language_2, words, n)]
+    raise ValueError(f"Unknown sampling mode: {sampling_mode}. Use one of {', '.join(SAMPLING_MODES)}.")
+
+
 def sample_word(
     words: pd.Series,
     language_1: str,
@@ -148,6 +189,9 @@ def sample_word(
     language_level_for_created_sentence: str = "C1",
     remark: str | None = None,
     cloud_models_only: bool = False,
+    sentence_pool: SentencePool | None = None,
+    sampling_mode: str = "random",
+    review_scheduler: ReviewScheduler | None = None,
 ) -> tuple[str, str, int]:
     """Sample a word from the given word list.
     
@@ -160,14 +204,48 @@ def sample_word(
     - max_num_words_in_created_sentence: Maximum number of words in the created sentence.
     - language_level_for_created_sentence: Language level for the created sentence (e.g., "C1").
     - remark: Additional remark to include in the prompt.
+    - sentence_pool: If given, take a pre-generated sentence from the pool when it has one for the word (only without a remark).
+    - sampling_mode: "random" to sample uniformly, "due" to take the word that is due for review first (see `ReviewScheduler.most_due`).
+    - review_scheduler: The review history to use in "due" mode.
 
     Returns:
     - A tuple containing the word in language 1, the word in language 2, and the index of the word in the original list.
     """
+    return run_sync(sample_word_async(
+        words,
+        language_1,
+        language_2,
+        probability_for_sentence_creation,
+        llama_params,
+        max_num_words_in_created_sentence,
+        language_level_for_created_sentence,
+        remark=remark,
+        cloud_models_only=cloud_models_only,
+        sentence_pool=sentence_pool,
+        sampling_mode=sampling_mode,
+        review_scheduler=review_scheduler,
+    ))
+
+
+async def sample_word_async(
+    words: pd.Series,
+    language_1: str,
+    language_2: str,
+    probability_for_sentence_creation: float,
+    llama_params: Llama_params | None = None,
+    max_num_words_in_created_sentence: int = 10,
+    language_level_for_created_sentence: str = "C1",
+    remark: str | None = None,
+    cloud_models_only: bool = False,
+    sentence_pool: SentencePool | None = None,
+    sampling_mode: str = "random",
+    review_scheduler: ReviewScheduler | None = None,
+) -> tuple[str, str, int]:
+    """Same as `sample_word`, but does not block the event loop."""
     if words.shape[0] == 0:
         return None, None, None, None
     
-    word = words.sample(n=1)
+    word = _sample_rows(words, 1, language_1, language_2, sampling_mode, review_scheduler)
     word_index = word.index[0]
     
     word_language_1 = word[language_1.capitalize()].values[0]
@@ -175,8 +253,15 @@ def sample_word(
     original_word_language_1 = word_language_1
     num_words_in_word_language_1 = len(str(word_language_1).split())
     a = np.random.rand()
-    if num_words_in_word_language_1 < 3 and a < probability_for_sentence_creation and (llama_params is not None or cloud_models_only):
-            word_language_1, word_language_2 = create_sentence_from_word(
+    pooled = None
+    pool_model = sentence_model_name(llama_params, cloud_models_only)
+    if num_words_in_word_language_1 < 3 and a < probability_for_sentence_creation and sentence_pool is not None and not remark and pool_model is not None:
+        pool_key = sentence_pool.make_key(language_1, language_2, word_language_1, language_level_for_created_sentence, max_num_words_in_created_sentence, pool_model)
+        pooled = sentence_pool.take(pool_key)
+    if pooled is not None:
+        word_language_1, word_language_2 = pooled
+    elif num_words_in_word_language_1 < 3 and a < probability_for_sentence_creation and (llama_params is not None or cloud_models_only):
+            word_language_1, word_language_2 = await create_sentence_from_word_async(
                 word_language_1,
                 language_1,
                 language_2,
@@ -214,7 +299,7 @@ def _extract_json_array(text: str) -> list[dict]:
     return []
 
 
-def _create_sentences_cloud_batch(
+async def _create_sentences_cloud_batch(
     rows_for_sentence: list[dict],
     language_1: str,
     language_2: str,
@@ -246,9 +331,9 @@ def _create_sentences_cloud_batch(
     )
 
     try:
-        response = respond_with_gemini_fast(prompt, temperature=0.2, max_tokens=1200)
+        response = await respond_with_gemini_fast_async(prompt, temperature=0.2, max_tokens=1200, use_cache=False)
     except Exception:
-        response = respond_with_gemini(prompt, model="gemini-flash-latest", temperature=0.2, max_tokens=1200)
+        response = await respond_with_gemini_async(prompt, model="gemini-flash-latest", temperature=0.2, max_tokens=1200, use_cache=False)
 
     parsed = _extract_json_array(response)
     result: dict[int, tuple[str, str]] = {}
@@ -275,13 +360,58 @@ def sample_words_with_optional_sentences_batch(
     remark: str | None = None,
     cloud_models_only: bool = False,
     batch_size: int = 20,
+    sentence_timeout_seconds: float = 60.0,
+    sentence_pool: SentencePool | None = None,
+    sampling_mode: str = "random",
+    review_scheduler: ReviewScheduler | None = None,
 ) -> list[dict]:
-    """Sample up to `batch_size` words and optionally convert them into sentence pairs."""
+    """Sample up to `batch_size` words and optionally convert them into sentence pairs.
+
+    With a local model, the sentences are generated concurrently (see `get_ollama_num_parallel`),
+    and a word whose sentence takes longer than `sentence_timeout_seconds` is returned as is.
+    If a `sentence_pool` is given, pre-generated sentences are used first (only without a remark).
+    With `sampling_mode="due"`, the words that are due for review in `review_scheduler` are taken first.
+    """
+    return run_sync(sample_words_with_optional_sentences_batch_async(
+        words,
+        language_1,
+        language_2,
+        probability_for_sentence_creation,
+        llama_params=llama_params,
+        max_num_words_in_created_sentence=max_num_words_in_created_sentence,
+        language_level_for_created_sentence=language_level_for_created_sentence,
+        remark=remark,
+        cloud_models_only=cloud_models_only,
+        batch_size=batch_size,
+        sentence_timeout_seconds=sentence_timeout_seconds,
+        sentence_pool=sentence_pool,
+        sampling_mode=sampling_mode,
+        review_scheduler=review_scheduler,
+    ))
+
+
+async def sample_words_with_optional_sentences_batch_async(
+    words: pd.DataFrame,
+    language_1: str,
+    language_2: str,
+    probability_for_sentence_creation: float,
+    llama_params: Llama_params | None = None,
+    max_num_words_in_created_sentence: int = 10,
+    language_level_for_created_sentence: str = "C1",
+    remark: str | None = None,
+    cloud_models_only: bool = False,
+    batch_size: int = 20,
+    sentence_timeout_seconds: float = 60.0,
+    sentence_pool: SentencePool | None = None,
+    sampling_mode: str = "random",
+    review_scheduler: ReviewScheduler | None = None,
+) -> list[dict]:
+    """Same as `sample_words_with_optional_sentences_batch`, but does not block the event loop."""
     if words is None or words.shape[0] == 0:
         return []
 
     n = min(max(batch_size, 1), len(words))
-    sampled = words.sample(n=n)
+    sampled = _sample_rows(words, n, language_1, language_2, sampling_mode, review_scheduler)
 
     lang1_col = language_1.capitalize()
     lang2_col = language_2.capitalize()
@@ -305,10 +435,17 @@ def sample_words_with_optional_sentences_batch(
         return []
 
     rows_for_sentence: list[dict] = []
+    pool_model = sentence_model_name(llama_params, cloud_models_only)
     for e in entries:
         if len(str(e["word_language_1"]).split()) >= 3:
             continue
         if np.random.rand() < probability_for_sentence_creation:
+            if sentence_pool is not None and not remark and pool_model is not None:
+                pool_key = sentence_pool.make_key(language_1, language_2, e["word_language_1"], language_level_for_created_sentence, max_num_words_in_created_sentence, pool_model)
+                pooled = sentence_pool.take(pool_key)
+                if pooled is not None:
+                    e["word_language_1"], e["word_language_2"] = pooled
+                    continue
             rows_for_sentence.append(
                 {
                     "index": e["index"],
@@ -319,7 +456,7 @@ def sample_words_with_optional_sentences_batch(
 
     if rows_for_sentence:
         if cloud_models_only:
-            generated = _create_sentences_cloud_batch(
+            generated = await _create_sentences_cloud_batch(
                 rows_for_sentence,
                 language_1,
                 language_2,
@@ -332,98 +469,346 @@ def sample_words_with_optional_sentences_batch(
                 if pair is not None:
                     e["word_language_1"], e["word_language_2"] = pair
         else:
-            for e in entries:
-                if not any(r["index"] == e["index"] for r in rows_for_sentence):
-                    continue
-                try:
-                    s1, s2 = create_sentence_from_word(
-                        e["word_language_1"],
-                        language_1,
-                        language_2,
-                        llama_params=llama_params,
-                        max_num_words=max_num_words_in_created_sentence,
-                        language_level=language_level_for_created_sentence,
-                        remark=remark,
-                        cloud_models_only=False,
-                    )
-                    e["word_language_1"], e["word_language_2"] = s1, s2
-                except Exception:
-                    continue
+            # One generation per word, sent concurrently but not more at once than the Ollama server runs in parallel
+            sentence_indices = {r["index"] for r in rows_for_sentence}
+            semaphore = asyncio.Semaphore(get_ollama_num_parallel())
+
+            async def _create_sentence(e: dict) -> None:
+                async with semaphore:
+                    try:
+                        s1, s2 = await asyncio.wait_for(
+                            create_sentence_from_word_async(
+                                e["word_language_1"],
+                                language_1,
+                                language_2,
+                                llama_params=llama_params,
+                                max_num_words=max_num_words_in_created_sentence,
+                                language_level=language_level_for_created_sentence,
+                                remark=remark,
+                                cloud_models_only=False,
+                            ),
+                            timeout=sentence_timeout_seconds,
+                        )
+                    except Exception:
+                        # on errors and timeouts the entry keeps the plain word
+                        return
+                e["word_language_1"], e["word_language_2"] = s1, s2
+
+            await asyncio.gather(*(_create_sentence(e) for e in entries if e["index"] in sentence_indices))
 
     return entries
 
 
 
+# upper bound on the words per filter request, small models lose track of longer lists
+MAX_FILTER_WORDS_PER_CHUNK = 100
+# tokens of the filter prompt without the words
+FILTER_PROMPT_TOKENS = 100
+CLOUD_FILTER_MODEL = "gemini-flash-latest"
+CLOUD_FILTER_CONTEXT_TOKENS = 8192
+CLOUD_FILTER_MAX_IN_FLIGHT = 8
+
+
+def _estimate_tokens(text: str) -> int:
+    # rough estimate for non-English words, plus one token for the separator
+    return len(text) // 3 + 2
+
+
+def _split_into_chunks(words_list: list[str], max_words: int, max_tokens: int) -> list[list[int]]:
+    """Split the positions of the words into chunks of at most `max_words` words and about `max_tokens` tokens."""
+    chunks = []
+    chunk = []
+    chunk_tokens = 0
+    for position, word in enumerate(words_list):
+        word_tokens = _estimate_tokens(word)
+        if chunk and (len(chunk) >= max_words or chunk_tokens + word_tokens > max_tokens):
+            chunks.append(chunk)
+            chunk = []
+            chunk_tokens = 0
+        chunk.append(position)
+        chunk_tokens += word_tokens
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+async def _match_words_to_description(
+    words_batch: list[str],
+    description: str,
+    llama_params: Llama_params | None,
+    cloud_models_only: bool,
+) -> tuple[set[str], bool]:
+    """
+    Ask the model which words of a chunk match the description.
+
+    Returns:
+    - The matching words, and whether the answer parsed cleanly (only words of the chunk, e.g. not
+      cut off by the token limit or mixed with other text). Only clean verdicts should be cached.
+    """
+    words_batch_str = ";".join(words_batch)
+
+    prompt = f"""Return only the words that match the description, separated by semicolons.
+        Do not return any explanations or additional text.
+        Description: {description}
+        Words:
+        {words_batch_str}
+        """
+
+    if cloud_models_only:
+        response_words_batch = await respond_with_gemini_async(
+            prompt,
+            model=CLOUD_FILTER_MODEL,
+            temperature=0.1,
+            max_tokens=200,
+            # the verdicts are cached per word in `description_filter_cache`, but only clean ones
+            use_cache=False,
+        )
+    else:
+        response_words_batch = await respond_to_prompt_async(
+            prompt,
+            llama_params,
+            temperature=0.1,
+            use_cache=False,
+        )
+
+    words_batch_set = set(words_batch)
+    parsed_words = [w.strip() for w in response_words_batch.strip().split(";") if w.strip()]
+    return {w for w in parsed_words if w in words_batch_set}, all(w in words_batch_set for w in parsed_words)
+
+
 def filter_word_list_by_description(
     words: pd.Series,
     language_1: str,
     description: str,
     llama_params: Llama_params | None,
-    word_batch_size: int = 20,
+    word_batch_size: int | None = None,
     cloud_models_only: bool = False,
+    max_in_flight: int | None = None,
+    use_cache: bool = True,
+    embedding_model: EmbeddingModel | None = None,
 ) -> pd.Series:
     """Choose a subset of words from the given word list based on a description.
 
+    The word list is split into chunks that fit the context window of the model, and the chunks
+    are sent to the model concurrently.
+
     Parameters:
     - words: The word list as a pandas Series.
     - language_1: The language of the words in the list (e.g., "german").
     - description: A description of the word to choose.
     - llama_params: Parameters for Llama model usage.
-    - word_batch_size: The number of words to include in each batch when sending to the Llama model.
+    - word_batch_size: The maximum number of words in each request to the model. If None, the chunks are as large as the context window of the model allows (at most MAX_FILTER_WORDS_PER_CHUNK words).
+    - cloud_models_only: If True, use Gemini instead of the local model.
+    - max_in_flight: The maximum number of concurrent requests. If None, `get_ollama_num_parallel()` for the local model and CLOUD_FILTER_MAX_IN_FLIGHT for Gemini.
+    - use_cache: If True, reuse earlier answers of the model for the same words and description (see `description_filter_cache`).
+      If False, ask the model about every word and do not store its answers.
+    - embedding_model: If given (default: the model set in EMBEDDING_MODEL), words whose embedding is far from the description are dropped before the model is asked.
 
     Returns:
-    - A tuple containing the word in language 1, the word in language 2, and the index of the word in the original list.
+    - The rows of the word list whose word in language 1 matches the description.
     """
+    return run_sync(filter_word_list_by_description_async(
+        words,
+        language_1,
+        description,
+        llama_params,
+        word_batch_size=word_batch_size,
+        cloud_models_only=cloud_models_only,
+        max_in_flight=max_in_flight,
+        use_cache=use_cache,
+        embedding_model=embedding_model,
+    ))
+
+
+async def filter_word_list_by_description_async(
+    words: pd.Series,
+    language_1: str,
+    description: str,
+    llama_params: Llama_params | None,
+    word_batch_size: int | None = None,
+    cloud_models_only: bool = False,
+    max_in_flight: int | None = None,
+    use_cache: bool = True,
+    embedding_model: EmbeddingModel | None = None,
+) -> pd.Series:
+    """Same as `filter_word_list_by_description`, but does not block the event loop."""
     if words.shape[0] == 0:
         return None
-    
+
+    response_words = set()
+    async for matched_words in iter_filter_word_list_by_description_async(
+        words,
+        language_1,
+        description,
+        llama_params,
+        word_batch_size=word_batch_size,
+        cloud_models_only=cloud_models_only,
+        max_in_flight=max_in_flight,
+        use_cache=use_cache,
+        embedding_model=embedding_model,
+    ):
+        response_words.update(matched_words[language_1.capitalize()].astype(str))
+
+    words_filtered = words[words[language_1.capitalize()].astype(str).isin(response_words)]
+
+    return words_filtered
+
+
+def _filter_model_name(llama_params: Llama_params | None, cloud_models_only: bool) -> str:
+    if cloud_models_only:
+        return f"gemini:{CLOUD_FILTER_MODEL}"
+    if llama_params.use_cpp:
+        return f"llama_cpp:{getattr(llama_params.llama_llm, 'model_path', None)}"
+    return f"ollama:{llama_params.model_id}"
+
+
+def sentence_model_name(llama_params: Llama_params | None, cloud_models_only: bool) -> str | None:
+    """
+    Name the model that creates example sentences for a request, as used in the keys of the sentence pool.
+
+    Returns:
+    - The model name, or None if the request cannot create sentences (no local model and not cloud models only).
+    """
+    if cloud_models_only:
+        return "gemini:fast"
+    if llama_params is None:
+        return None
+    return _filter_model_name(llama_params, cloud_models_only)
+
+
+async def iter_filter_word_list_by_description_async(
+    words: pd.DataFrame,
+    language_1: str,
+    description: str,
+    llama_params: Llama_params | None,
+    word_batch_size: int | None = None,
+    cloud_models_only: bool = False,
+    max_in_flight: int | None = None,
+    use_cache: bool = True,
+    embedding_model: EmbeddingModel | None = None,
+):
+    """
+    Filter the word list by a description like `filter_word_list_by_description`, yielding the
+    matches of each chunk as soon as the model has answered for it.
+
+    Words the model has already classified for this description are taken from
+    `description_filter_cache` and yielded first, so only new or edited words are sent to the model.
+    With an embedding model, words whose similarity to the description is at most its
+    `description_reject_similarity` are not sent to the model either.
+    Chunks finish in any order, so the matches are not sorted by their position in the word list.
+
+    Yields:
+    - DataFrames with the matching rows of one chunk.
+    """
+    if words.shape[0] == 0 or (llama_params is None and not cloud_models_only):
+        return
+
     words_list_full = words[language_1.capitalize()].astype(str).tolist()
-    response_words_collected = []
+    positions_by_word: dict[str, list[int]] = {}
+    for position, word in enumerate(words_list_full):
+        positions_by_word.setdefault(word, []).append(position)
+
+    model_name = _filter_model_name(llama_params, cloud_models_only)
+    unique_words = list(positions_by_word)
+    cached = description_filter_cache.get_many(model_name, language_1, description, unique_words) if use_cache else {}
+    cached_positions = sorted(p for word, matches in cached.items() if matches for p in positions_by_word[word])
+    if cached_positions:
+        yield words.iloc[cached_positions]
+    uncached_words = [word for word in unique_words if word not in cached]
+    embedding_model = embedding_model or embedding_model_from_env()
+    if uncached_words and embedding_model is not None and embedding_model.description_reject_similarity is not None:
+        try:
+            similarities = await _description_similarities(uncached_words, description, embedding_model)
+            uncached_words = [word for word, similarity in zip(uncached_words, similarities) if similarity > embedding_model.description_reject_similarity]
+        except Exception as e:
+            print(f"Warning: Ranking the words by embedding failed, sending all of them to the model: {e}")
+    if not uncached_words:
+        return
 
-    for i in range(0, len(words_list_full), word_batch_size):
-        words_batch = words_list_full[i:i + word_batch_size]
-        words_batch_str = ";".join(words_batch)
+    if cloud_models_only:
+        context_window_tokens = CLOUD_FILTER_CONTEXT_TOKENS
+        default_max_in_flight = CLOUD_FILTER_MAX_IN_FLIGHT
+    else:
+        context_window_tokens = get_context_window_tokens(llama_params)
+        default_max_in_flight = get_ollama_num_parallel()
+    # the words appear in the prompt and again in the answer
+    max_chunk_tokens = max((context_window_tokens - FILTER_PROMPT_TOKENS) // 2, 1)
+    chunks = _split_into_chunks(uncached_words, word_batch_size or MAX_FILTER_WORDS_PER_CHUNK, max_chunk_tokens)
+    semaphore = asyncio.Semaphore(max_in_flight or default_max_in_flight)
+
+    async def filter_chunk(chunk: list[int]) -> list[int]:
+        words_batch = [uncached_words[i] for i in chunk]
+        async with semaphore:
+            matched, clean = await _match_words_to_description(words_batch, description, llama_params, cloud_models_only)
+        if use_cache and clean:
+            description_filter_cache.set_many(model_name, language_1, description, {w: w in matched for w in words_batch})
+        return sorted(p for word in words_batch if word in matched for p in positions_by_word[word])
+
+    tasks = [asyncio.ensure_future(filter_chunk(chunk)) for chunk in chunks]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            positions = await next_done
+            if positions:
+                yield words.iloc[positions]
+    finally:
+        # stop the remaining requests if the caller stops early or a request fails
+        for task in tasks:
+            task.cancel()
 
-        prompt = f"""Return only the words that match the description, separated by semicolons.
-            Do not return any explanations or additional text.
-            Description: {description}
-            Words:
-            {words_batch_str}
-            """
 
-        if cloud_models_only:
-            response_words_batch = respond_with_gemini(
-                prompt,
-                model="gemini-flash-latest",
-                temperature=0.1,
-                max_tokens=200,
-            )
-        else:
-            if llama_params is None:
-                continue
-            response_words_batch = respond_to_prompt(
-                prompt,
-                llama_params,
-                temperature=0.1,
-            )
+async def _description_similarities(words_list: list[str], description: str, embedding_model: EmbeddingModel) -> np.ndarray:
+    word_vectors = await embed_texts(words_list, embedding_model)
+    # descriptions are rarely repeated, so their vectors are not cached
+    description_vector = (await embed_texts([description], embedding_model, use_cache=False))[0]
+    return word_vectors @ description_vector
 
-        parsed_words = [w.strip() for w in response_words_batch.strip().split(";") if w.strip()]
-        parsed_words = [w for w in parsed_words if w in words_batch]
-        response_words_collected.extend(parsed_words)
 
-    # remove duplicates while preserving order
-    response_words = list(dict.fromkeys(response_words_collected))
+def rank_word_list_by_description(
+    words: pd.DataFrame,
+    language_1: str,
+    description: str,
+    embedding_model: EmbeddingModel,
+    top_k: int | None = None,
+) -> pd.DataFrame:
+    """Sort a word list by how similar its words are to a description, using embeddings.
 
-    words_filtered = words[words[language_1.capitalize()].isin(response_words)]
+    The vectors of the words are cached on disk (see `embedding_cache`), so ranking a list again
+    only embeds the description and takes one matrix-vector product.
 
-    return words_filtered
+    Parameters:
+    - words: The word list.
+    - language_1: The language of the words to rank (e.g., "german").
+    - description: A description of the words to find.
+    - embedding_model: The embedding model.
+    - top_k: If given, return only the `top_k` most similar words.
+
+    Returns:
+    - The rows of the word list with an additional "similarity" column, most similar first.
+    """
+    return run_sync(rank_word_list_by_description_async(words, language_1, description, embedding_model, top_k=top_k))
+
+
+async def rank_word_list_by_description_async(
+    words: pd.DataFrame,
+    language_1: str,
+    description: str,
+    embedding_model: EmbeddingModel,
+    top_k: int | None = None,
+) -> pd.DataFrame:
+    """Same as `rank_word_list_by_description`, but does not block the event loop."""
+    if words.shape[0] == 0:
+        return words.assign(similarity=pd.Series(dtype=float))
+    similarities = await _description_similarities(words[language_1.capitalize()].astype(str).tolist(), description, embedding_model)
+    ranked = words.assign(similarity=similarities).sort_values("similarity", ascending=False, kind="stable")
+    return ranked if top_k is None else ranked.head(top_k)
 
 
 def filter_word_list_by_tags(
     words: pd.Series,
     tags: list[str],
     exclude_words_with_tag: bool = False,
-    intersection: bool = False
+    intersection: bool = False,
+    tag_index: TagIndex | None = None,
 ) -> pd.Series:
     """Choose a subset of words from the given word list based on tags.
 
@@ -432,6 +817,7 @@ def filter_word_list_by_tags(
     - tags: A list of tags to filter the words by.
     - exclude_words_with_tag: If True, exclude words that have any of the specified tags. If False, include only words that have at least one of the specified tags.
     - intersection: If True, include only words that have all of the specified tags. If False, include words that have at least one of the specified tags.
+    - tag_index: The tag index of the full word list (see `tag_index.get_tag_index`), if `words` is a subset of a stored word list. If None, an index is built from `words`.
 
     Returns:
     - A pandas Series containing only the words with the given tags.
@@ -443,18 +829,10 @@ def filter_word_list_by_tags(
         print("No tags column found in the word list.")
         return words
 
-    if exclude_words_with_tag:
-        if intersection:
-            mask = words["tags"].apply(lambda x: not all(tag.strip().lower() in str(x).lower() for tag in tags))
-        else:
-            mask = words["tags"].apply(lambda x: not any(tag.strip().lower() in str(x).lower() for tag in tags))
-
-    else:
-        if intersection:
-            mask = words["tags"].apply(lambda x: all(tag.strip().lower() in str(x).lower() for tag in tags))
-        else:
-            mask = words["tags"].apply(lambda x: any(tag.strip().lower() in str(x).lower() for tag in tags))
-
-    words_filtered = words[mask]
+    if tag_index is None:
+        tag_index = TagIndex(words["tags"])
+    mask = tag_index.mask(tags, exclude_words_with_tag=exclude_words_with_tag, intersection=intersection)
+    positions = tag_index.index.get_indexer(words.index)
+    words_filtered = words[mask[positions] & (positions >= 0)]
 
     return words_filtered